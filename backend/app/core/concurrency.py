@@ -0,0 +1,100 @@
+from sqlalchemy.orm.exc import StaleDataError
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import logging
+import random
+import threading
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class VersionConflict(Exception):
+    """
+    A conditional update found the row at a different version than expected
+    """
+
+    def __init__(self, entity: str, key: Any, expected: int, current: int):
+        self.entity = entity
+        self.key = key
+        self.expected = expected
+        self.current = current
+        super().__init__(f"{entity} {key} was modified concurrently (expected version {expected}, found {current})")
+
+class ContentionMetrics:
+    """
+    Optimistic concurrency counters per write operation
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, int]] = {}
+
+    def _counters(self, operation: str) -> Dict[str, int]:
+        if operation not in self._operations:
+            self._operations[operation] = {"attempts": 0, "conflicts": 0, "retries": 0, "exhausted": 0}
+        return self._operations[operation]
+
+    def record(self, operation: str, counter: str):
+        """
+        Increment one counter (attempts, conflicts, retries or exhausted)
+        """
+        with self._lock:
+            self._counters(operation)[counter] += 1
+
+    def reset(self):
+        """
+        Clear all recorded counters
+        """
+        with self._lock:
+            self._operations = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get counters and conflict rate (conflicts per attempt) per operation
+        """
+        with self._lock:
+            return {
+                operation: {
+                    **counters,
+                    "conflict_rate": round(counters["conflicts"] / counters["attempts"], 4) if counters["attempts"] else 0.0
+                }
+                for operation, counters in self._operations.items()
+            }
+
+contention_metrics = ContentionMetrics()
+
+async def retry_on_conflict(
+    operation: str,
+    attempt: Callable[[], Awaitable[T]],
+    on_conflict: Optional[Callable[[], Awaitable[Any]]] = None,
+    max_attempts: Optional[int] = None
+) -> T:
+    """
+    Run a write that uses conditional (version-checked) updates, retrying it
+    when another writer got there first. `attempt` must re-read whatever it
+    depends on; `on_conflict` runs before each retry (roll back, reload state).
+    Backoff is exponential with jitter so competing workers spread out.
+
+    Raises:
+        VersionConflict / StaleDataError: If every attempt conflicted
+    """
+    max_attempts = max_attempts or settings.OCC_MAX_ATTEMPTS
+    for attempt_number in range(1, max_attempts + 1):
+        contention_metrics.record(operation, "attempts")
+        try:
+            return await attempt()
+        except (VersionConflict, StaleDataError) as e:
+            contention_metrics.record(operation, "conflicts")
+            if attempt_number == max_attempts:
+                contention_metrics.record(operation, "exhausted")
+                logger.warning(f"{operation}: giving up after {max_attempts} conflicting attempts: {e}")
+                raise
+
+            contention_metrics.record(operation, "retries")
+            if on_conflict is not None:
+                await on_conflict()
+            delay_ms = settings.OCC_RETRY_BACKOFF_MS * (2 ** (attempt_number - 1))
+            await asyncio.sleep(random.uniform(0.5, 1.0) * delay_ms / 1000.0)
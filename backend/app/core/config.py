@@ -27,6 +27,66 @@ class Settings(BaseSettings):
     DATABASE_PORT: str = os.getenv("DATABASE_PORT", "5432")
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
 
+    # Read replica for GET endpoints (falls back to the primary when unset)
+    DATABASE_READ_URL: Optional[str] = os.getenv("DATABASE_READ_URL") or None
+    # Maximum replica lag in seconds before reads go back to the primary (0 disables the check)
+    DB_READ_MAX_LAG_SECONDS: float = float(os.getenv("DB_READ_MAX_LAG_SECONDS", "0"))
+    # How often the replica lag is re-measured
+    DB_READ_LAG_CHECK_INTERVAL: float = float(os.getenv("DB_READ_LAG_CHECK_INTERVAL", "5"))
+
+    # Connection pool settings
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Seconds before a pooled connection is replaced (-1 disables); kept below
+    # the idle timeout of serverless endpoints so stale connections are rare
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "300"))
+    # Liveness check on every checkout (one extra round-trip each time)
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "False").lower() == "true"
+    # Set when connecting through a transaction-mode pooler (PgBouncer, Neon
+    # "-pooler" endpoints): disables app-side pooling and prepared statements
+    DB_USE_SERVER_POOLER: bool = os.getenv("DB_USE_SERVER_POOLER", "False").lower() == "true"
+
+    # Apply pending migrations on startup instead of failing the version check.
+    # Defaults to on for the local SQLite database only; deployments run
+    # "alembic upgrade head" once before starting workers.
+    DB_AUTO_MIGRATE: Optional[bool] = None
+
+    # Largest batch accepted by the bulk order endpoints
+    ORDER_BULK_MAX_ROWS: int = int(os.getenv("ORDER_BULK_MAX_ROWS", "10000"))
+    # Largest batch accepted by the bulk rake status endpoint
+    RAKE_BULK_MAX_ROWS: int = int(os.getenv("RAKE_BULK_MAX_ROWS", "5000"))
+
+    # Rows per /static-data/{file} JSON page when no limit is given, and the
+    # largest limit accepted (full exports use the cursor or ndjson/csv)
+    STATIC_DATA_PAGE_SIZE: int = int(os.getenv("STATIC_DATA_PAGE_SIZE", "1000"))
+    STATIC_DATA_MAX_PAGE_SIZE: int = int(os.getenv("STATIC_DATA_MAX_PAGE_SIZE", "10000"))
+
+    # Optimistic concurrency: attempts per version-checked write and the
+    # base backoff between them (doubled per retry, with jitter)
+    OCC_MAX_ATTEMPTS: int = int(os.getenv("OCC_MAX_ATTEMPTS", "3"))
+    OCC_RETRY_BACKOFF_MS: float = float(os.getenv("OCC_RETRY_BACKOFF_MS", "20"))
+
+    # Seconds between change checks of the cost parameter / route reference caches
+    REFERENCE_CACHE_POLL_SECONDS: float = float(os.getenv("REFERENCE_CACHE_POLL_SECONDS", "30"))
+
+    # Memoized shortest-path searches kept by the rail network (sources x metrics)
+    RAIL_PATH_CACHE_SIZE: int = int(os.getenv("RAIL_PATH_CACHE_SIZE", "256"))
+
+    # Solved optimization plans kept in memory by request fingerprint
+    OPTIMIZATION_CACHE_SIZE: int = int(os.getenv("OPTIMIZATION_CACHE_SIZE", "128"))
+
+    # Plan history retention: details (allocations) of plans older than
+    # COMPACT_AFTER_DAYS are dropped, keeping the summary row; rows older than
+    # RETENTION_DAYS are deleted (0 keeps them)
+    OPTIMIZATION_COMPACT_AFTER_DAYS: int = int(os.getenv("OPTIMIZATION_COMPACT_AFTER_DAYS", "30"))
+    OPTIMIZATION_RETENTION_DAYS: int = int(os.getenv("OPTIMIZATION_RETENTION_DAYS", "365"))
+
+    # Scenario batches (/rake/optimize/scenarios): worker processes (started
+    # once, shared by all batches) and the most scenarios accepted in one batch
+    SCENARIO_WORKERS: int = int(os.getenv("SCENARIO_WORKERS", str(min(4, os.cpu_count() or 1))))
+    SCENARIO_BATCH_MAX: int = int(os.getenv("SCENARIO_BATCH_MAX", "32"))
+
     # ML settings
     MODEL_PATH: str = os.getenv("MODEL_PATH", "app/ml/models/")
 
@@ -41,4 +101,7 @@ class Settings(BaseSettings):
             sqlite_db_path = os.path.join(ROOT_DIR, "database.db")
             self.SQLALCHEMY_DATABASE_URI = f"sqlite:///{sqlite_db_path}"
 
+        if self.DB_AUTO_MIGRATE is None:
+            self.DB_AUTO_MIGRATE = self.SQLALCHEMY_DATABASE_URI.startswith("sqlite")
+
 settings = Settings()
@@ -1,9 +1,16 @@
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 import logging
+import time
 
 from app.core.config import settings
+from app.core.pool_metrics import TimedQueuePool, TimedAsyncQueuePool, attach_pool_metrics
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -13,47 +20,177 @@ connect_args = {}
 if settings.SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
     connect_args = {"check_same_thread": False}
     
+def pool_options(is_async: bool = False) -> Dict[str, Any]:
+    """
+    Engine pool arguments from settings. Behind a server-side pooler the
+    app keeps no connections of its own (NullPool).
+    """
+    if settings.DB_USE_SERVER_POOLER:
+        return {"poolclass": NullPool}
+
+    return {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,
     connect_args=connect_args,
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    **pool_options()
 )
+attach_pool_metrics(engine.pool, "sync")
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def async_database_config(uri: str) -> Tuple[URL, Dict[str, Any]]:
+    """
+    Map a sync database URI to its async driver (asyncpg / aiosqlite).
+    libpq-only query options (sslmode, channel_binding) are not understood
+    by asyncpg, so sslmode is translated to asyncpg's ssl argument.
+    Behind a transaction-mode pooler asyncpg's statement caches are turned
+    off, since prepared statements don't survive across server connections.
+    """
+    url = make_url(uri)
+    async_connect_args: Dict[str, Any] = {}
+
+    if url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif url.get_backend_name() == "postgresql":
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode and sslmode != "disable":
+            async_connect_args["ssl"] = sslmode
+        if settings.DB_USE_SERVER_POOLER:
+            async_connect_args["statement_cache_size"] = 0
+            query["prepared_statement_cache_size"] = "0"
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+
+    return url, async_connect_args
+
+# Create async engine used by the API routes
+async_url, async_connect_args = async_database_config(settings.SQLALCHEMY_DATABASE_URI)
+async_engine = create_async_engine(
+    async_url,
+    connect_args=async_connect_args,
+    echo=settings.DEBUG,
+    **pool_options(is_async=True)
+)
+attach_pool_metrics(async_engine.sync_engine.pool, "async")
+
+# Create async engine for the read replica, if one is configured
+read_async_engine = None
+if settings.DATABASE_READ_URL:
+    read_async_url, read_async_connect_args = async_database_config(settings.DATABASE_READ_URL)
+    read_async_engine = create_async_engine(
+        read_async_url,
+        connect_args=read_async_connect_args,
+        echo=settings.DEBUG,
+        **pool_options(is_async=True)
+    )
+    attach_pool_metrics(read_async_engine.sync_engine.pool, "async_read")
+
+class RoutingSession(Session):
+    """
+    Session that sends statements to the read replica when it was opened
+    read-only (info["read_only"]). Flushes always go to the primary, so an
+    accidental write from a read session still lands on the right database.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if read_async_engine is not None and self.info.get("read_only") and not self._flushing:
+            return read_async_engine.sync_engine
+        return async_engine.sync_engine
+
+# Create async session factory. Objects stay loaded after commit so they
+# can be serialized without lazy-loading outside the session.
+AsyncSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
+# Last replica lag measurement, shared across requests
+replica_state: Dict[str, Any] = {"checked_at": None, "lag_seconds": None, "fresh": True, "error": None}
+
+async def replica_lag_seconds() -> Optional[float]:
+    """
+    Measure how far the replica is behind the primary, in seconds.
+    Returns 0 when the replica has replayed everything it received and
+    None when the replica isn't a streaming Postgres standby.
+    """
+    if read_async_engine.dialect.name != "postgresql":
+        return None
+
+    async with read_async_engine.connect() as connection:
+        return await connection.scalar(text(
+            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+        ))
+
+async def use_replica() -> bool:
+    """
+    Decide whether reads may go to the replica. With a staleness bound
+    configured, the lag is re-measured at most every DB_READ_LAG_CHECK_INTERVAL
+    seconds and reads fall back to the primary while it is exceeded or the
+    replica is unreachable.
+    """
+    if read_async_engine is None:
+        return False
+    if not settings.DB_READ_MAX_LAG_SECONDS:
+        return True
+
+    now = time.monotonic()
+    checked_at = replica_state["checked_at"]
+    if checked_at is None or now - checked_at >= settings.DB_READ_LAG_CHECK_INTERVAL:
+        try:
+            lag = await replica_lag_seconds()
+            replica_state.update({
+                "lag_seconds": float(lag) if lag is not None else None,
+                "fresh": lag is None or float(lag) <= settings.DB_READ_MAX_LAG_SECONDS,
+                "error": None
+            })
+        except Exception as e:
+            logger.warning(f"Replica lag check failed, reading from primary: {e}")
+            replica_state.update({"lag_seconds": None, "fresh": False, "error": str(e)})
+        replica_state["checked_at"] = now
+
+    if not replica_state["fresh"]:
+        logger.debug("Replica is stale, routing reads to primary")
+    return replica_state["fresh"]
+
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """
+    Open a session whose reads are served by the replica when it is fresh enough
+    """
+    async with AsyncSessionLocal(info={"read_only": await use_replica()}) as db:
+        yield db
+
 # Create base class for ORM models
 Base = declarative_base()
 
-# Function to create all tables
-def init_db():
-    try:
-        # Import all models to ensure they're registered with Base
-        # This must be imported here to avoid circular imports
-        # Import in dependency order to avoid relationship issues
-        from app.models import cost_parameters, route_transport
-        from app.models import rake
-        from app.models import order, inventory, optimization
-
-        # Check if tables exist before creating them
-        inspector = inspect(engine)
-
-        existing_tables = inspector.get_table_names()
-        logger.info(f"Existing tables: {existing_tables}")
-
-        # Create tables if they don't exist
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
-    except Exception as e:
-        logger.error(f"Error initializing database: {e}")
-        raise
-
-# Dependency to get DB session
+# Dependency to get DB session (sync, for scripts and background jobs)
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+# Dependency to get async DB session (API routes)
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependency to get async read-only DB session (GET endpoints)
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    async with read_session() as db:
+        yield db
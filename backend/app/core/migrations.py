@@ -0,0 +1,117 @@
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text, inspect
+from sqlalchemy.exc import DBAPIError
+from typing import Optional
+import logging
+import os
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# alembic.ini lives in the backend folder, next to the 'app' package
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+# Revision the database was stamped at before migrations existed (see 0001_initial_schema)
+BASELINE_REVISION = "0001"
+
+_head_revision: Optional[str] = None
+
+def alembic_config() -> Config:
+    """
+    Alembic configuration bound to the application's database URL
+    """
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("sqlalchemy.url", settings.SQLALCHEMY_DATABASE_URI.replace("%", "%%"))
+    return config
+
+def get_head_revision() -> str:
+    """
+    Latest migration revision, read from the migration scripts on disk
+    (no database access). Cached for the life of the process.
+    """
+    global _head_revision
+    if _head_revision is None:
+        _head_revision = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    return _head_revision
+
+def get_current_revision() -> Optional[str]:
+    """
+    Revision the database is at, or None when it has never been migrated
+    """
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        # Only look at the catalog when the fast path fails, to tell a missing
+        # version table apart from a connection problem
+        if inspect(engine).has_table("alembic_version"):
+            raise
+        return None
+
+def upgrade_to_head(current: Optional[str]):
+    """
+    Apply pending migrations one revision at a time, so a failure names the
+    revision that failed and the ones before it stay applied. A database
+    created by the old create_all startup has tables but no version, so it
+    is stamped at the baseline first.
+
+    Raises:
+        RuntimeError: If a migration fails
+    """
+    config = alembic_config()
+    if current is None and inspect(engine).has_table("orders"):
+        logger.info(f"Unversioned database with existing tables, stamping at {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+        current = BASELINE_REVISION
+
+    script = ScriptDirectory.from_config(config)
+    pending = list(reversed(list(script.iterate_revisions("head", current or "base"))))
+    for revision in pending:
+        try:
+            command.upgrade(config, revision.revision)
+        except Exception as e:
+            cause = getattr(e, "orig", None) or e  # the driver's message, without the statement
+            raise RuntimeError(
+                f"Migration {revision.revision} ({revision.doc}) failed, the database is left at revision "
+                f"{current or 'none'}: {cause.__class__.__name__}: {cause}. Fix or remove the rows it reports, then restart "
+                f"or run 'alembic upgrade head' from the backend folder"
+            ) from e
+        current = revision.revision
+
+def check_schema_version():
+    """
+    Verify on startup that the database schema matches the migration head.
+    This is one query against alembic_version; migrations themselves are
+    applied at deploy time (alembic upgrade head). With DB_AUTO_MIGRATE
+    enabled (the default for the local SQLite database) pending migrations
+    are applied instead.
+
+    Raises:
+        RuntimeError: If the schema is behind and auto-migration is disabled,
+            or an automatic migration fails
+    """
+    head = get_head_revision()
+    current = get_current_revision()
+
+    if current == head:
+        logger.info(f"Database schema is at revision {current}")
+        return
+
+    if settings.DB_AUTO_MIGRATE:
+        logger.info(f"Migrating database schema from {current or 'empty'} to {head}")
+        try:
+            upgrade_to_head(current)
+        except RuntimeError as e:
+            logger.error(str(e))
+            raise
+        return
+
+    raise RuntimeError(
+        f"Database schema is at revision {current or 'none'}, expected {head}. "
+        f"Run 'alembic upgrade head' from the backend folder"
+        + (f" (stamp existing databases first with 'alembic stamp {BASELINE_REVISION}')" if current is None else "")
+    )
@@ -0,0 +1,141 @@
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool, AsyncAdaptedQueuePool
+from typing import Any, Dict, List, Optional
+import threading
+import time
+
+# Upper bounds (milliseconds) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class PoolMetrics:
+    """
+    Connection checkout wait-time histogram for one engine's pool
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all recorded observations
+        """
+        with self._lock:
+            self._bucket_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self._count = 0
+            self._total_ms = 0.0
+            self._max_ms = 0.0
+            self._timeouts = 0
+
+    def observe(self, wait_seconds: float, timed_out: bool = False):
+        """
+        Record the time a caller waited to obtain a connection
+        """
+        wait_ms = wait_seconds * 1000.0
+        index = len(WAIT_BUCKETS_MS)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                index = i
+                break
+
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._count += 1
+            self._total_ms += wait_ms
+            self._max_ms = max(self._max_ms, wait_ms)
+            if timed_out:
+                self._timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the histogram as cumulative bucket counts ("le" = less than or equal)
+        """
+        with self._lock:
+            buckets: List[Dict[str, Any]] = []
+            cumulative = 0
+            for bound, count in zip(list(WAIT_BUCKETS_MS) + ["+Inf"], self._bucket_counts):
+                cumulative += count
+                buckets.append({"le_ms": bound, "count": cumulative})
+
+            return {
+                "count": self._count,
+                "timeouts": self._timeouts,
+                "sum_ms": round(self._total_ms, 3),
+                "avg_ms": round(self._total_ms / self._count, 3) if self._count else 0.0,
+                "max_ms": round(self._max_ms, 3),
+                "buckets": buckets
+            }
+
+# Metrics keyed by engine name ("sync", "async", ...)
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    """
+    Get (or create) the metrics collector for an engine
+    """
+    if name not in pool_metrics:
+        pool_metrics[name] = PoolMetrics(name)
+    return pool_metrics[name]
+
+class _TimedPoolMixin:
+    """
+    Times each connection checkout. The pool is tagged with its metrics
+    collector after the engine is created (see attach_pool_metrics).
+    """
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe(time.perf_counter() - start, timed_out=timed_out)
+
+    def recreate(self):
+        # Keep reporting into the same collector after engine.dispose()
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def attach_pool_metrics(pool: Pool, name: str) -> Optional[PoolMetrics]:
+    """
+    Tag a timed pool with the metrics collector for the given engine name
+    """
+    if not isinstance(pool, _TimedPoolMixin):
+        return None
+    metrics = get_pool_metrics(name)
+    pool.metrics = metrics
+    return metrics
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """
+    Get current pool occupancy. Pools without a queue (NullPool when a
+    server-side pooler is used) only report their type.
+    """
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout()
+        })
+
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status["checkout_wait"] = metrics.snapshot()
+    return status
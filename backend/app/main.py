@@ -10,11 +10,15 @@ from fastapi.websockets import WebSocket
 import asyncio
 import json
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 
 # Import database modules
-from app.core.database import init_db, get_db
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import async_engine, read_async_engine
+from app.core.migrations import check_schema_version
 from app.core.config import settings
+from app.ml.scenario_runner import shutdown_pool
 
 # Import routes
 from app.routes import (
@@ -25,7 +29,9 @@ from app.routes import (
     ai_recommendations,
     live_simulation,
     reports,
-    static_data
+    static_data,
+    system,
+    network
 )
 
 # Setup logging
@@ -48,16 +54,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Event handler to initialize the database on startup
+# Event handler to verify the database schema on startup
 @app.on_event("startup")
 async def startup_event():
-    logging.info("Initializing database...")
-    init_db()
+    logging.info("Checking database schema version...")
+    await run_in_threadpool(check_schema_version)
     logging.info(f"Running in {settings.ENVIRONMENT} mode")
     logging.info(f"Database URI: {settings.SQLALCHEMY_DATABASE_URI}")
 
+# Release pooled async connections and scenario worker processes on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_pool()
+    await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
+
 # Include all routers
 app.include_router(dashboard.router, prefix="/api", tags=["Dashboard"])
 app.include_router(rake_allocation.router, prefix="/api", tags=["Rake Allocation"])
@@ -67,6 +82,8 @@ app.include_router(ai_recommendations.router, prefix="/api", tags=["AI Recommend
 app.include_router(live_simulation.router, prefix="/api", tags=["Live Simulation"])
 app.include_router(reports.router, prefix="/api", tags=["Reports"])
 app.include_router(static_data.router, prefix="/api", tags=["Static Data"])
+app.include_router(system.router, prefix="/api", tags=["System"])
+app.include_router(network.router, prefix="/api", tags=["Rail Network"])
 
 # Root endpoint
 @app.get("/", tags=["Root"])
@@ -86,26 +103,25 @@ class SimulationConnectionManager:
     async def load_rakes_from_db(self):
         """Load active rakes from database"""
         try:
-            # Get database session using next(get_db()) instead of using it as a dependency
+            # Open a session directly instead of using it as a dependency
             # This is needed because we're outside of a request context
             from app.services.simulation_service import get_active_rakes
             from app.models.rake import Rake
             from app.models.order import Order
             
             # Create a new session specifically for this method
-            from app.core.database import SessionLocal
-            db = SessionLocal()
+            from app.core.database import read_session
             
-            try:
+            async with read_session() as db:
                 # Try to get real data from database
                 active_rakes = []
-                db_rakes = db.query(Rake).filter(Rake.status != "Idle").all()
+                db_rakes = (await db.execute(select(Rake).where(Rake.status != "Idle"))).scalars().all()
                 
                 if db_rakes:
                     # Use real data
                     for rake in db_rakes:
                         # Get associated order for destination
-                        order = db.query(Order).filter(Order.rake_id == rake.id).first()
+                        order = (await db.execute(select(Order).where(Order.rake_id == rake.id).limit(1))).scalars().first()
                         destination = order.destination if order else "Unknown"
                         
                         active_rakes.append({
@@ -114,6 +130,7 @@ class SimulationConnectionManager:
                             "to": destination,
                             "progress": rake.transit_progress or 0,
                             "status": rake.status,
+                            "version": rake.version,
                             "departureTime": rake.departure_time.strftime("%H:%M %p") if rake.departure_time else "N/A",
                             "eta": rake.eta.strftime("%H:%M %p") if rake.eta else "N/A",
                             "freight": rake.freight_type or "N/A",
@@ -130,9 +147,6 @@ class SimulationConnectionManager:
                         {"id": "R9012", "from": "Bokaro", "to": "CMO Mumbai", "progress": 92, "status": "Arriving", "departureTime": "06:00 AM", "eta": "15:10 PM", "freight": "Steel Tubes", "weight": "1080 Tons"},
                         {"id": "R3456", "from": "Bokaro", "to": "Customer B456", "progress": 15, "status": "Departed", "departureTime": "09:45 AM", "eta": "18:20 PM", "freight": "Steel Beams", "weight": "1320 Tons"},
                     ]
-            finally:
-                # Always close the session
-                db.close()
         except Exception as e:
             logging.error(f"Error loading rakes from database: {e}")
             # Use fallback data if error
@@ -214,49 +228,29 @@ class SimulationConnectionManager:
     async def simulation_loop(self):
         """Main simulation loop that updates rake progress"""
         try:
-            from app.models.rake import Rake
+            from app.services.simulation_service import advance_simulated_rake, save_simulated_rake
             
             while self.simulation_running:
                 # Create a new session for database operations
-                from app.core.database import SessionLocal
-                db = SessionLocal()
+                from app.core.database import AsyncSessionLocal
+                db = AsyncSessionLocal()
                 
                 try:
                     # Update rake positions based on speed
-                    for i, rake in enumerate(self.rakes):
-                        if rake["progress"] < 100:
-                            # Advance progress based on speed
-                            rake["progress"] += 1 * self.simulation_speed
-                            
-                            # Cap at 100%
-                            if rake["progress"] >= 100:
-                                rake["progress"] = 100
-                                rake["status"] = "Arrived"
-                        
-                        # Update status based on progress
-                        if 90 <= rake["progress"] < 100:
-                            rake["status"] = "Arriving"
-                        elif 10 <= rake["progress"] < 90:
-                            rake["status"] = "In Transit"
-                        elif rake["progress"] < 10:
-                            rake["status"] = "Departed"
-                            
-                        # Update database if we have real rakes
+                    for rake in self.rakes:
+                        # Fallback rakes use string IDs and only live in memory
+                        if not isinstance(rake["id"], int):
+                            advance_simulated_rake(rake, self.simulation_speed)
+                            continue
+
+                        # Database rakes are written with a version check (see save_simulated_rake)
                         try:
-                            # Find and update the rake in the database
-                            db_rake = db.query(Rake).filter(Rake.id == rake["id"]).first()
-                            if db_rake:
-                                db_rake.transit_progress = rake["progress"]
-                                db_rake.status = rake["status"]
-                                # Update ETA based on progress
-                                if rake["progress"] >= 100:
-                                    from datetime import datetime
-                                    db_rake.arrival_time = datetime.now()
+                            await save_simulated_rake(db, rake, self.simulation_speed)
                         except Exception as db_err:
                             logging.error(f"Error updating rake in database: {db_err}")
                     
                     # Commit changes to the database
-                    db.commit()
+                    await db.commit()
                     
                     # Send updates to all clients
                     await self.send_update_to_all({
@@ -275,7 +269,7 @@ class SimulationConnectionManager:
                             rake["status"] = "Departed"
                 finally:
                     # Always close the session
-                    db.close()
+                    await db.close()
                 
         except asyncio.CancelledError:
             # Simulation was paused
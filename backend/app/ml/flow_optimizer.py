@@ -0,0 +1,247 @@
+from ortools.linear_solver import pywraplp
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Set, Iterable
+import time
+
+from app.ml.rail_network import RailNetwork
+
+# Payload of one wagon, used to turn track capacity (wagons/day) into tonnes
+DEFAULT_TONNES_PER_WAGON = 60.0
+
+# Freight rate when the request doesn't give one (matches the seeded cost parameters)
+DEFAULT_COST_PER_TONNE_KM = 1.2
+
+# Cost of leaving a tonne of an order undelivered. Far above any freight cost,
+# so orders are only cut short when stock or track capacity runs out.
+DEFAULT_SHORTFALL_PENALTY = 100000.0
+
+# Solution values below this are solver noise
+EPSILON = 1e-6
+
+def _reachable(adjacency: Dict[str, Iterable[str]], start: Iterable[str]) -> Set[str]:
+    """
+    Stations reachable from any of the start stations
+    """
+    seen = set(station for station in start if station in adjacency)
+    stack = list(seen)
+    while stack:
+        station = stack.pop()
+        for target in adjacency[station]:
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+def optimize_flow(
+    materials: List[Dict[str, Any]],
+    orders: List[Dict[str, Any]],
+    network: RailNetwork,
+    constraints: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Capacity-aware allocation: ship orders from stockyards over the rail
+    network as a min-cost multi-commodity flow, so no corridor carries more
+    than its track capacity.
+
+    Takes optimize_rakes' inputs; stockyards additionally need the station
+    they load at ('station', or constraints['origin_station'] for all) and
+    orders their material and destination station. Tonnes leaving the same
+    station (or heading to the same one) are one commodity, which keeps the
+    model to one flow variable per corridor and loading station, and only
+    corridors lying between a commodity's stations get variables.
+
+    Args:
+        materials: Stockyards with stockyard_id, material, capacity, cost (per ton), station
+        orders: Orders with order_id, quantity, material, destination
+        network: Rail network the corridors come from
+        constraints: Optional settings:
+            tonnes_per_wagon, planning_days (capacity is per day),
+            cost_per_tonne_km, shortfall_penalty_per_ton,
+            min_fulfillment_percentage, origin_station
+
+    Returns:
+        Dictionary with the allocation plan, total cost (stock plus freight),
+        corridor utilization and any unfulfilled quantities
+    """
+    started = time.perf_counter()
+    constraints = constraints or {}
+    tonnes_per_wagon = float(constraints.get("tonnes_per_wagon") or DEFAULT_TONNES_PER_WAGON)
+    planning_days = float(constraints.get("planning_days") or 1)
+    cost_per_tonne_km = float(constraints.get("cost_per_tonne_km") or DEFAULT_COST_PER_TONNE_KM)
+    shortfall_penalty = float(constraints.get("shortfall_penalty_per_ton") or DEFAULT_SHORTFALL_PENALTY)
+    min_fulfillment = constraints.get("min_fulfillment_percentage")
+    default_station = constraints.get("origin_station")
+
+    # The model is a pure LP, so GLOP (simplex) rather than SCIP
+    solver = pywraplp.Solver.CreateSolver('GLOP')
+    if not solver:
+        return {
+            "optimized_plan": [],
+            "total_cost": 0,
+            "error": "Could not create solver"
+        }
+    infinity = solver.infinity()
+    objective = solver.Objective()
+
+    # Usable corridors in both directions (a corridor without capacity carries nothing)
+    forward: Dict[str, List[str]] = {station: [] for station in network.adjacency}
+    backward: Dict[str, List[str]] = {station: [] for station in network.adjacency}
+    for edge in network.edges():
+        if edge.capacity_wagons_per_day > 0:
+            forward[edge.source].append(edge.target)
+            backward[edge.target].append(edge.source)
+
+    stations = [stock.get("station") or default_station for stock in materials]
+    stockyards_by_material: Dict[Any, List[int]] = defaultdict(list)
+    for j, stock in enumerate(materials):
+        stockyards_by_material[stock.get("material")].append(j)
+
+    # x[i, j] = tonnes of order i from stockyard j, only for stockyards with the
+    # order's material that are connected to the order's destination
+    x = {}
+    x_by_stockyard: Dict[int, List[Any]] = defaultdict(list)
+    x_by_order: Dict[int, List[Any]] = defaultdict(list)
+    shipments = []
+    can_reach: Dict[str, Set[str]] = {}
+    for i, order in enumerate(orders):
+        destination = order.get("destination")
+        if destination not in forward:
+            continue
+        if destination not in can_reach:
+            can_reach[destination] = _reachable(backward, [destination])
+        for j in stockyards_by_material.get(order.get("material"), []):
+            if stations[j] not in can_reach[destination]:
+                continue
+            x[i, j] = solver.NumVar(0, order['quantity'], f"x_{i}_{j}")
+            objective.SetCoefficient(x[i, j], float(materials[j].get('cost') or 0))
+            x_by_stockyard[j].append(x[i, j])
+            x_by_order[i].append(x[i, j])
+            if stations[j] != destination:
+                shipments.append((stations[j], destination, x[i, j]))
+
+    # Freight cost doesn't depend on the material, so tonnes sharing an origin
+    # (or a destination) station are one commodity. Group by whichever side
+    # has fewer stations: usually a few loading points serve many destinations.
+    origins = set(origin for origin, _, _ in shipments)
+    destinations = set(destination for _, destination, _ in shipments)
+    by_origin = len(origins) <= len(destinations)
+    commodities: Dict[str, List[tuple]] = defaultdict(list)
+    for shipment in shipments:
+        commodities[shipment[0] if by_origin else shipment[1]].append(shipment)
+
+    # Flow conservation per commodity: at each station, tonnes out minus tonnes
+    # in equals tonnes loaded there minus tonnes delivered there. Only stations
+    # between the commodity's origins and destinations get flow variables.
+    flows_by_corridor: Dict[tuple, List[Any]] = defaultdict(list)
+    for key, group in commodities.items():
+        nodes = (_reachable(forward, set(origin for origin, _, _ in group))
+                 & _reachable(backward, set(destination for _, destination, _ in group)))
+        balance = {station: solver.Constraint(0, 0, f"flow_{key}_{station}") for station in nodes}
+        for origin, destination, var in group:
+            balance[origin].SetCoefficient(var, -1)
+            balance[destination].SetCoefficient(var, 1)
+        for source in nodes:
+            for target in forward[source]:
+                if target not in nodes:
+                    continue
+                flow = solver.NumVar(0, infinity, f"f_{key}_{source}_{target}")
+                balance[source].SetCoefficient(flow, 1)
+                balance[target].SetCoefficient(flow, -1)
+                objective.SetCoefficient(flow, cost_per_tonne_km * network.adjacency[source][target].distance_km)
+                flows_by_corridor[source, target].append(flow)
+
+    # 1. Track capacity, shared by all commodities using the corridor
+    capacity_tons = {}
+    for (source, target), flows in flows_by_corridor.items():
+        edge = network.adjacency[source][target]
+        capacity_tons[source, target] = edge.capacity_wagons_per_day * tonnes_per_wagon * planning_days
+        corridor = solver.Constraint(0, capacity_tons[source, target], f"cap_{source}_{target}")
+        for flow in flows:
+            corridor.SetCoefficient(flow, 1)
+
+    # 2. Stockyard capacity constraints
+    for j, variables in x_by_stockyard.items():
+        stockyard = solver.Constraint(-infinity, materials[j]['capacity'], f"stock_{j}")
+        for var in variables:
+            stockyard.SetCoefficient(var, 1)
+
+    # 3. Each order is delivered or its shortfall is paid for
+    shortfall = {}
+    for i, order in enumerate(orders):
+        max_shortfall = order['quantity']
+        if min_fulfillment:
+            max_shortfall = order['quantity'] * (1 - min_fulfillment / 100)
+        shortfall[i] = solver.NumVar(0, max_shortfall, f"short_{i}")
+        objective.SetCoefficient(shortfall[i], shortfall_penalty)
+        fulfillment = solver.Constraint(order['quantity'], order['quantity'], f"order_{i}")
+        fulfillment.SetCoefficient(shortfall[i], 1)
+        for var in x_by_order.get(i, []):
+            fulfillment.SetCoefficient(var, 1)
+
+    objective.SetMinimization()
+    build_seconds = time.perf_counter() - started
+    status = solver.Solve()
+    timings = {"build_seconds": build_seconds, "solve_seconds": time.perf_counter() - started - build_seconds}
+
+    if status != pywraplp.Solver.OPTIMAL and status != pywraplp.Solver.FEASIBLE:
+        return {
+            "optimized_plan": [],
+            "total_cost": 0,
+            "status": "failed",
+            "error": "No feasible flow: orders can't meet the minimum fulfillment within stock and track capacity",
+            "timings": timings
+        }
+
+    allocations = []
+    stock_cost = 0.0
+    for (i, j), var in x.items():
+        quantity = var.solution_value()
+        if quantity > EPSILON:
+            stock_cost += quantity * float(materials[j].get('cost') or 0)
+            allocations.append({
+                "order_id": orders[i]["order_id"],
+                "from": materials[j]["stockyard_id"],
+                "origin_station": stations[j],
+                "destination": orders[i]["destination"],
+                "quantity": quantity
+            })
+
+    corridor_utilization = []
+    freight_cost = 0.0
+    for (source, target), flows in flows_by_corridor.items():
+        tons = sum(flow.solution_value() for flow in flows)
+        if tons <= EPSILON:
+            continue
+        edge = network.adjacency[source][target]
+        freight_cost += tons * cost_per_tonne_km * edge.distance_km
+        corridor_utilization.append({
+            "from_station": source,
+            "to_station": target,
+            "flow_tons": round(tons, 3),
+            "capacity_tons": capacity_tons[source, target],
+            "wagons": round(tons / tonnes_per_wagon, 2),
+            "utilization": round(tons / capacity_tons[source, target], 4) if capacity_tons[source, target] else None,
+            "via": list(edge.via)
+        })
+    corridor_utilization.sort(key=lambda corridor: corridor["utilization"] or 0, reverse=True)
+
+    unfulfilled = []
+    for i, order in enumerate(orders):
+        missing = shortfall[i].solution_value()
+        if missing > EPSILON:
+            unfulfilled.append({
+                "order_id": order["order_id"],
+                "quantity": missing,
+                "reason": "no route or stock" if not x_by_order.get(i) else "stock or track capacity"
+            })
+
+    return {
+        "optimized_plan": allocations,
+        "total_cost": stock_cost + freight_cost,
+        "freight_cost": freight_cost,
+        "corridor_utilization": corridor_utilization,
+        "unfulfilled": unfulfilled,
+        "model_size": {"variables": solver.NumVariables(), "constraints": solver.NumConstraints()},
+        "status": "success",
+        "timings": timings
+    }
@@ -0,0 +1,229 @@
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple, Callable
+import heapq
+import time
+
+# Orders are served in this order when stock runs short
+PRIORITY_RANK = {"urgent": 0, "high": 1, "normal": 2, "medium": 2, "low": 3}
+
+# Local search stops after this long (constraints['time_limit_ms'] overrides)
+DEFAULT_TIME_LIMIT_MS = 500
+
+# Quantities below this are rounding noise
+EPSILON = 1e-6
+
+def build_unit_costs(
+    materials: List[Dict[str, Any]],
+    orders: List[Dict[str, Any]],
+    distance: Callable[[str, str], Optional[float]],
+    cost_per_tonne_km: float
+) -> Dict[Tuple[int, int], float]:
+    """
+    Cost per ton of serving order i from stockyard j: the stockyard's cost plus
+    freight over the rail distance from its station to the order's destination.
+    Pairs without a known distance are left out (they cost the stockyard's cost).
+    """
+    unit_costs = {}
+    distances: Dict[Tuple[str, str], Optional[float]] = {}
+    by_material: Dict[Any, List[int]] = defaultdict(list)
+    for j, stock in enumerate(materials):
+        by_material[stock.get("material")].append(j)
+    for i, order in enumerate(orders):
+        destination = order.get("destination")
+        for j in by_material.get(order.get("material"), []):
+            station = materials[j].get("station")
+            if not station or not destination:
+                continue
+            if (station, destination) not in distances:
+                distances[station, destination] = distance(station, destination)
+            km = distances[station, destination]
+            if km is not None:
+                unit_costs[i, j] = float(materials[j].get("cost") or 0) + cost_per_tonne_km * km
+    return unit_costs
+
+class HeuristicAllocator:
+    """
+    Fast allocation for large instances, on optimize_rakes' model: each order
+    gets at least min_fulfillment_percentage of its quantity (and no more,
+    since every ton costs), from stockyards with its material and capacity.
+
+    1. Greedy: orders in priority order (most to lose from a bad choice
+       first within a priority) take the cheapest stockyard with capacity
+       left, from a heap per (material, destination) keyed on unit cost.
+    2. Local search: move tonnes to a cheaper stockyard with spare capacity,
+       or swap tonnes between two orders on different stockyards when that
+       is cheaper, until no move improves or the time limit is reached.
+    """
+
+    def __init__(
+        self,
+        materials: List[Dict[str, Any]],
+        orders: List[Dict[str, Any]],
+        constraints: Optional[Dict[str, Any]] = None,
+        unit_costs: Optional[Dict[Tuple[int, int], float]] = None
+    ):
+        constraints = constraints or {}
+        self.materials = materials
+        self.orders = orders
+        self.unit_costs = unit_costs or {}
+        self.time_limit = float(constraints.get("time_limit_ms") or DEFAULT_TIME_LIMIT_MS) / 1000
+        fraction = float(constraints.get("min_fulfillment_percentage") or 0) / 100
+        self.required = [order["quantity"] * fraction for order in orders]
+
+        self.capacity = [float(stock["capacity"]) for stock in materials]
+        self.allocation: Dict[Tuple[int, int], float] = defaultdict(float)
+        self.by_stockyard: Dict[int, set] = defaultdict(set)
+
+        # Compatible stockyards, cheapest first, per (material, destination):
+        # orders sharing both have the same unit costs
+        by_material: Dict[Any, List[int]] = defaultdict(list)
+        for j, stock in enumerate(materials):
+            by_material[stock.get("material")].append(j)
+        self.group_of: List[Tuple[Any, Any]] = []
+        self.candidates: Dict[Tuple[Any, Any], List[Tuple[float, int]]] = {}
+        for i, order in enumerate(orders):
+            group = (order.get("material"), order.get("destination"))
+            self.group_of.append(group)
+            if group not in self.candidates:
+                self.candidates[group] = sorted((self.cost(i, j), j) for j in by_material.get(group[0], []))
+
+    def cost(self, i: int, j: int) -> float:
+        unit_cost = self.unit_costs.get((i, j))
+        return float(self.materials[j].get("cost") or 0) if unit_cost is None else unit_cost
+
+    def _assign(self, i: int, j: int, quantity: float):
+        self.allocation[i, j] += quantity
+        self.capacity[j] -= quantity
+        if self.allocation[i, j] > EPSILON:
+            self.by_stockyard[j].add(i)
+        else:
+            del self.allocation[i, j]
+            self.by_stockyard[j].discard(i)
+
+    def _order_sequence(self) -> List[int]:
+        def regret(i: int) -> float:
+            candidates = self.candidates[self.group_of[i]]
+            return candidates[1][0] - candidates[0][0] if len(candidates) > 1 else float("inf")
+        return sorted(
+            (i for i in range(len(self.orders)) if self.required[i] > EPSILON),
+            key=lambda i: (PRIORITY_RANK.get(str(self.orders[i].get("priority") or "normal").lower(), 2), -regret(i))
+        )
+
+    def greedy(self):
+        heaps = {group: list(candidates) for group, candidates in self.candidates.items()}
+        for i in self._order_sequence():
+            heap = heaps[self.group_of[i]]
+            needed = self.required[i]
+            while needed > EPSILON and heap:
+                _, j = heap[0]
+                if self.capacity[j] <= EPSILON:
+                    heapq.heappop(heap)
+                    continue
+                quantity = min(needed, self.capacity[j])
+                self._assign(i, j, quantity)
+                needed -= quantity
+
+    def improve(self, deadline: float) -> int:
+        """
+        Apply improving moves until none is left or the deadline passes.
+        Returns the number of moves made.
+        """
+        moves = 0
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            for (i, j), quantity in list(self.allocation.items()):
+                if time.perf_counter() >= deadline:
+                    break
+                if (i, j) not in self.allocation:
+                    continue
+                current = self.cost(i, j)
+                for candidate_cost, k in self.candidates[self.group_of[i]]:
+                    if candidate_cost >= current - EPSILON or (i, j) not in self.allocation:
+                        break
+                    quantity = self.allocation[i, j]
+                    # Move to a cheaper stockyard with spare capacity
+                    if self.capacity[k] > EPSILON:
+                        moved = min(quantity, self.capacity[k])
+                        self._assign(i, j, -moved)
+                        self._assign(i, k, moved)
+                        moves += 1
+                        improved = True
+                        continue
+                    # Or swap with an order on that stockyard that loses less by moving to j
+                    for other in list(self.by_stockyard[k]):
+                        if other == i or self.group_of[other][0] != self.group_of[i][0]:
+                            continue
+                        delta = candidate_cost + self.cost(other, j) - current - self.cost(other, k)
+                        if delta < -EPSILON:
+                            swapped = min(self.allocation[i, j], self.allocation[other, k])
+                            self._assign(i, j, -swapped)
+                            self._assign(other, k, -swapped)
+                            self._assign(i, k, swapped)
+                            self._assign(other, j, swapped)
+                            moves += 1
+                            improved = True
+                            if (i, j) not in self.allocation:
+                                break
+        return moves
+
+    def total_cost(self) -> float:
+        return sum(quantity * self.cost(i, j) for (i, j), quantity in self.allocation.items())
+
+    def solve(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self.greedy()
+        greedy_cost = self.total_cost()
+        greedy_seconds = time.perf_counter() - started
+        moves = self.improve(started + self.time_limit)
+
+        allocations = []
+        for (i, j), quantity in sorted(self.allocation.items()):
+            allocations.append({
+                "order_id": self.orders[i]["order_id"],
+                "from": self.materials[j]["stockyard_id"],
+                "origin_station": self.materials[j].get("station"),
+                "destination": self.orders[i].get("destination"),
+                "quantity": quantity
+            })
+
+        delivered: Dict[int, float] = defaultdict(float)
+        for (i, _), quantity in self.allocation.items():
+            delivered[i] += quantity
+        unfulfilled = [
+            {"order_id": order["order_id"], "quantity": self.required[i] - delivered[i], "reason": "stock"}
+            for i, order in enumerate(self.orders)
+            if self.required[i] - delivered[i] > EPSILON
+        ]
+
+        return {
+            "optimized_plan": allocations,
+            "total_cost": self.total_cost(),
+            "unfulfilled": unfulfilled,
+            "heuristic": {
+                "greedy_cost": greedy_cost,
+                "greedy_seconds": round(greedy_seconds, 4),
+                "local_search_moves": moves,
+                "seconds": round(time.perf_counter() - started, 4)
+            },
+            "status": "success"
+        }
+
+def allocate_heuristic(
+    materials: List[Dict[str, Any]],
+    orders: List[Dict[str, Any]],
+    constraints: Optional[Dict[str, Any]] = None,
+    unit_costs: Optional[Dict[Tuple[int, int], float]] = None
+) -> Dict[str, Any]:
+    """
+    Heuristic counterpart of optimize_rakes: same inputs and result format,
+    sub-second on tens of thousands of orders but not guaranteed optimal.
+    Orders that can't get their minimum from the stock are reported in
+    'unfulfilled' rather than failing the whole plan.
+    """
+    started = time.perf_counter()
+    allocator = HeuristicAllocator(materials, orders, constraints, unit_costs)
+    build_seconds = time.perf_counter() - started
+    result = allocator.solve()
+    result["timings"] = {"build_seconds": build_seconds, "solve_seconds": time.perf_counter() - started - build_seconds}
+    return result
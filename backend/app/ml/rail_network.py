@@ -0,0 +1,254 @@
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import heapq
+import threading
+
+# Path metrics: edge weight used by the shortest path search
+#   distance: kilometres (cheapest, freight cost scales with distance)
+#   time:     transit days plus expected delay days (fastest)
+METRICS = ("distance", "time")
+
+# Cached single-source searches kept per network (source x metric x capacity filter)
+DEFAULT_PATH_CACHE_SIZE = 256
+
+@dataclass(frozen=True)
+class Edge:
+    """A corridor between two stations, with its route_transport_info figures"""
+    source: str
+    target: str
+    distance_km: float
+    transit_days: float
+    delay_days: float
+    capacity_wagons_per_day: float
+    # Intermediate stations of the row's preferred and alternate routes
+    via: Tuple[str, ...] = ()
+    alternate_via: Tuple[str, ...] = ()
+    # True when taken from the row for the opposite direction
+    reverse: bool = False
+
+    def weight(self, metric: str) -> float:
+        if metric == "distance":
+            return self.distance_km
+        return self.transit_days + self.delay_days
+
+def _field(route: Any, name: str, default: Any = None) -> Any:
+    """Read a column from an ORM object, result row or dict"""
+    if isinstance(route, dict):
+        value = route.get(name, default)
+    else:
+        value = getattr(route, name, default)
+    return default if value is None else value
+
+def parse_route_string(route: Optional[str]) -> List[str]:
+    """
+    Split a route string such as 'Bokaro-Asansol-Kolkata' into stations
+    """
+    if not route:
+        return []
+    return [station.strip() for station in str(route).split("-") if station.strip()]
+
+def _via(route: Optional[str], origin: str, destination: str) -> Tuple[str, ...]:
+    """
+    Intermediate stations of a route string, if it runs from origin to destination
+    """
+    stations = parse_route_string(route)
+    if len(stations) < 2 or stations[0] != origin or stations[-1] != destination:
+        return ()
+    return tuple(stations[1:-1])
+
+class RailNetwork:
+    """
+    Station graph built from route_transport_info.
+
+    Each row is one corridor between its origin and destination carrying the
+    row's own end-to-end distance, transit time, expected delay and track
+    capacity; the stations named in its preferred and alternate routes are
+    kept for display only (the table has no per-hop figures). Tracks are
+    usable in both directions: a row also gives the reverse corridor unless
+    that direction has a row of its own. Longer paths chain corridors, but
+    a pair with its own row is always served by that row.
+
+    Shortest paths use Dijkstra; each single-source result is memoized in an
+    LRU cache so warm lookups are a dict read plus path reconstruction.
+    """
+
+    def __init__(self, edges: Iterable[Edge] = (), path_cache_size: int = DEFAULT_PATH_CACHE_SIZE):
+        self.adjacency: Dict[str, Dict[str, Edge]] = {}
+        self.path_cache_size = path_cache_size
+        self._path_cache: "OrderedDict[Tuple[str, str, float], Tuple[Dict[str, float], Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        for edge in edges:
+            self.add_edge(edge)
+
+    @classmethod
+    def from_routes(cls, routes: Iterable[Any], path_cache_size: int = DEFAULT_PATH_CACHE_SIZE) -> "RailNetwork":
+        """
+        Build the network from route_transport_info rows (ORM objects, result rows or dicts)
+        """
+        network = cls(path_cache_size=path_cache_size)
+        forward = []
+        for route in routes:
+            origin = _field(route, "origin")
+            destination = _field(route, "destination")
+            if not origin or not destination or origin == destination:
+                continue
+            forward.append(Edge(
+                origin,
+                destination,
+                distance_km=float(_field(route, "distance_km", 0)),
+                transit_days=float(_field(route, "transit_time_days", 0)),
+                delay_days=float(_field(route, "expected_delays_days", 0)),
+                capacity_wagons_per_day=float(_field(route, "track_capacity_wagons_per_day", 0)),
+                via=_via(_field(route, "preferred_route"), origin, destination),
+                alternate_via=_via(_field(route, "alternate_route"), origin, destination)
+            ))
+
+        for edge in forward:
+            network.add_edge(edge)
+        for edge in forward:
+            if edge.source not in network.adjacency.get(edge.target, {}):
+                network.add_edge(replace(
+                    edge,
+                    source=edge.target,
+                    target=edge.source,
+                    via=edge.via[::-1],
+                    alternate_via=edge.alternate_via[::-1],
+                    reverse=True
+                ))
+        return network
+
+    def add_edge(self, edge: Edge):
+        """
+        Add a directed corridor, replacing any existing one between the same stations
+        """
+        self.adjacency.setdefault(edge.source, {})[edge.target] = edge
+        self.adjacency.setdefault(edge.target, {})
+        self.clear_path_cache()
+
+    @property
+    def stations(self) -> List[str]:
+        return sorted(self.adjacency)
+
+    def edges(self) -> List[Edge]:
+        return [edge for neighbours in self.adjacency.values() for edge in neighbours.values()]
+
+    def _search(self, source: str, metric: str, min_capacity: float) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """
+        Single-source Dijkstra: (cost to each reachable station, predecessor map)
+        """
+        costs = {source: 0.0}
+        previous: Dict[str, str] = {}
+        heap = [(0.0, source)]
+        while heap:
+            cost, station = heapq.heappop(heap)
+            if cost > costs.get(station, float("inf")):
+                continue
+            for target, edge in self.adjacency.get(station, {}).items():
+                if edge.capacity_wagons_per_day < min_capacity:
+                    continue
+                candidate = cost + edge.weight(metric)
+                if candidate < costs.get(target, float("inf")):
+                    costs[target] = candidate
+                    previous[target] = station
+                    heapq.heappush(heap, (candidate, target))
+        return costs, previous
+
+    def _shortest_paths_from(self, source: str, metric: str, min_capacity: float):
+        key = (source, metric, min_capacity)
+        with self._lock:
+            cached = self._path_cache.get(key)
+            if cached is not None:
+                self._path_cache.move_to_end(key)
+                self._stats["hits"] += 1
+                return cached
+            self._stats["misses"] += 1
+
+        result = self._search(source, metric, min_capacity)
+
+        with self._lock:
+            self._path_cache[key] = result
+            if len(self._path_cache) > self.path_cache_size:
+                self._path_cache.popitem(last=False)
+                self._stats["evictions"] += 1
+        return result
+
+    def shortest_path(
+        self,
+        origin: str,
+        destination: str,
+        metric: str = "distance",
+        min_capacity: float = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Best path between two stations by the given metric, skipping corridors
+        whose capacity is below min_capacity wagons/day.
+        Returns None when the stations are not connected.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {', '.join(METRICS)}")
+        if origin not in self.adjacency or destination not in self.adjacency:
+            return None
+
+        # A pair with its own corridor uses that row's figures
+        direct = self.adjacency[origin].get(destination)
+        if direct is not None and direct.capacity_wagons_per_day >= min_capacity:
+            return self.describe_path([origin, destination])
+
+        costs, previous = self._shortest_paths_from(origin, metric, float(min_capacity))
+        if destination not in costs:
+            return None
+
+        stations = [destination]
+        while stations[-1] != origin:
+            stations.append(previous[stations[-1]])
+        stations.reverse()
+        return self.describe_path(stations)
+
+    def describe_path(self, stations: List[str]) -> Dict[str, Any]:
+        """
+        Totals for a path given as a list of adjacent stations
+        """
+        hops = [self.adjacency[a][b] for a, b in zip(stations, stations[1:])]
+        route = stations[:1]
+        for edge in hops:
+            route.extend(edge.via)
+            route.append(edge.target)
+        return {
+            "stations": stations,
+            "route_stations": route,
+            "hops": len(hops),
+            "distance_km": round(sum(edge.distance_km for edge in hops), 3),
+            "transit_days": round(sum(edge.transit_days for edge in hops), 3),
+            "expected_delay_days": round(sum(edge.delay_days for edge in hops), 3),
+            "bottleneck_capacity_wagons_per_day": min((edge.capacity_wagons_per_day for edge in hops), default=None),
+        }
+
+    def precompute(self, metrics: Iterable[str] = METRICS):
+        """
+        Warm the path cache with every station as a source (all-pairs),
+        growing the cache to hold them
+        """
+        metrics = list(metrics)
+        self.path_cache_size = max(self.path_cache_size, len(self.adjacency) * len(metrics))
+        for metric in metrics:
+            for station in self.adjacency:
+                self._shortest_paths_from(station, metric, 0.0)
+
+    def clear_path_cache(self):
+        with self._lock:
+            self._path_cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Graph size and path cache counters
+        """
+        with self._lock:
+            return {
+                "stations": len(self.adjacency),
+                "edges": sum(len(neighbours) for neighbours in self.adjacency.values()),
+                "cached_sources": len(self._path_cache),
+                "path_cache_size": self.path_cache_size,
+                **self._stats
+            }
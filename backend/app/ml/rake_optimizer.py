@@ -1,7 +1,94 @@
 from ortools.linear_solver import pywraplp
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+import time
 
-def optimize_rakes(materials: List[Dict[str, Any]], orders: List[Dict[str, Any]], constraints: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+# Duals and reduced costs smaller than this are solver noise
+EPSILON = 1e-9
+
+@dataclass
+class AllocationModel:
+    """
+    The allocation model over (order, stockyard) pairs, with handles on its
+    constraints so callers can read duals after an LP solve
+    """
+    solver: Any
+    x: Dict[Tuple[int, int], Any] = field(default_factory=dict)
+    capacity: Dict[int, Any] = field(default_factory=dict)  # j -> sum_i x[i, j] <= capacity
+    order_max: Dict[int, Any] = field(default_factory=dict)  # i -> sum_j x[i, j] <= quantity
+    order_min: Dict[int, Any] = field(default_factory=dict)  # i -> sum_j x[i, j] >= quantity * min fulfillment
+    unit_cost: Dict[Tuple[int, int], float] = field(default_factory=dict)
+
+def build_allocation_model(
+    materials: List[Dict[str, Any]],
+    orders: List[Dict[str, Any]],
+    constraints: Optional[Dict[str, Any]] = None,
+    unit_costs: Optional[Dict[Tuple[int, int], float]] = None,
+    solver_id: str = 'SCIP'
+) -> Optional[AllocationModel]:
+    """
+    Build optimize_rakes' model on the given solver backend (None if it
+    can't be created). Use an LP backend such as GLOP to read duals.
+    """
+    solver = pywraplp.Solver.CreateSolver(solver_id)
+    if not solver:
+        return None
+    model = AllocationModel(solver=solver)
+    infinity = solver.infinity()
+    
+    # Decision variables
+    # x[i, j] = amount of order i fulfilled from stockyard j. Unbounded above:
+    # the order's own constraint caps it, so that is where its dual shows up
+    by_material: Dict[Any, List[int]] = {}
+    for j, stock in enumerate(materials):
+        by_material.setdefault(stock.get('material'), []).append(j)
+    for i, order in enumerate(orders):
+        # Only create variables for compatible materials
+        for j in by_material.get(order.get('material'), []):
+            model.x[i, j] = solver.NumVar(0, infinity, f"x_{i}_{j}")
+            model.unit_cost[i, j] = unit_costs.get((i, j), materials[j]['cost']) if unit_costs else materials[j]['cost']
+    
+    # Constraints
+    # 1. Stockyard capacity constraints
+    for j, stock in enumerate(materials):
+        model.capacity[j] = solver.Constraint(-infinity, stock['capacity'], f"capacity_{j}")
+    
+    # 2. Order fulfillment constraints, with an optional minimum fulfillment percentage per order
+    min_fulfillment = (constraints or {}).get('min_fulfillment_percentage')
+    for i, order in enumerate(orders):
+        model.order_max[i] = solver.Constraint(-infinity, order['quantity'], f"order_max_{i}")
+        if min_fulfillment:
+            model.order_min[i] = solver.Constraint(order['quantity'] * (min_fulfillment / 100), infinity, f"order_min_{i}")
+    
+    # Objective function: Minimize total cost
+    objective = solver.Objective()
+    for (i, j), var in model.x.items():
+        model.capacity[j].SetCoefficient(var, 1)
+        model.order_max[i].SetCoefficient(var, 1)
+        if i in model.order_min:
+            model.order_min[i].SetCoefficient(var, 1)
+        objective.SetCoefficient(var, model.unit_cost[i, j])
+    objective.SetMinimization()
+    return model
+
+def _allocations(model: AllocationModel, materials: List[Dict[str, Any]], orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    allocations = []
+    for (i, j), var in sorted(model.x.items()):
+        if var.solution_value() > 0:
+            allocations.append({
+                "order_id": orders[i]["order_id"],
+                "from": materials[j]["stockyard_id"],
+                "destination": orders[i].get("destination"),
+                "quantity": var.solution_value()
+            })
+    return allocations
+
+def optimize_rakes(
+    materials: List[Dict[str, Any]],
+    orders: List[Dict[str, Any]],
+    constraints: Optional[Dict[str, Any]] = None,
+    unit_costs: Optional[Dict[Tuple[int, int], float]] = None
+) -> Dict[str, Any]:
     """
     Optimize rake allocation using Google OR-Tools.
     
@@ -9,89 +96,225 @@ def optimize_rakes(materials: List[Dict[str, Any]], orders: List[Dict[str, Any]]
         materials: List of stockyard materials available
         orders: List of customer orders to fulfill
         constraints: Optional constraints for optimization
+        unit_costs: Optional cost per ton for (order index, stockyard index)
+            pairs, e.g. including freight; defaults to the stockyard's cost
     
     Returns:
         Dictionary with optimized allocation plan and total cost
     """
-    # Create the solver
-    solver = pywraplp.Solver.CreateSolver('SCIP')
+    started = time.perf_counter()
+
+    # Create the solver and model
+    model = build_allocation_model(materials, orders, constraints, unit_costs)
     
     # If solver could not be created, return an error
-    if not solver:
+    if model is None:
         return {
             "optimized_plan": [],
             "total_cost": 0,
             "error": "Could not create solver"
         }
-    
-    # Decision variables
-    # x[i, j] = amount of order i fulfilled from stockyard j
-    x = {}
-    for i, order in enumerate(orders):
-        for j, stock in enumerate(materials):
-            # Only create variables for compatible materials
-            if order.get('material') == stock.get('material'):
-                x[i, j] = solver.NumVar(0, order['quantity'], f"x_{i}_{j}")
-    
-    # Constraints
-    # 1. Stockyard capacity constraints
-    for j, stock in enumerate(materials):
-        solver.Add(
-            sum(x[i, j] for i in range(len(orders)) if (i, j) in x) <= stock['capacity']
-        )
-    
-    # 2. Order fulfillment constraints
-    for i, order in enumerate(orders):
-        solver.Add(
-            sum(x[i, j] for j in range(len(materials)) if (i, j) in x) <= order['quantity']
-        )
-    
-    # Apply additional constraints if provided
-    if constraints:
-        # Example: minimum fulfillment percentage per order
-        min_fulfillment = constraints.get('min_fulfillment_percentage')
-        if min_fulfillment:
-            for i, order in enumerate(orders):
-                solver.Add(
-                    sum(x[i, j] for j in range(len(materials)) if (i, j) in x) >= 
-                    order['quantity'] * (min_fulfillment / 100)
-                )
-    
-    # Objective function: Minimize total cost
-    objective = solver.Objective()
-    for i, order in enumerate(orders):
-        for j, stock in enumerate(materials):
-            if (i, j) in x:
-                # Cost is a function of distance and quantity
-                cost_per_unit = stock['cost']
-                objective.SetCoefficient(x[i, j], cost_per_unit)
-    objective.SetMinimization()
+    solver = model.solver
     
     # Solve the problem
+    build_seconds = time.perf_counter() - started
     status = solver.Solve()
+    timings = {"build_seconds": build_seconds, "solve_seconds": time.perf_counter() - started - build_seconds}
     
     # Process the solution
-    allocations = []
     if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
-        for i, order in enumerate(orders):
-            for j, stock in enumerate(materials):
-                if (i, j) in x and x[i, j].solution_value() > 0:
-                    allocations.append({
-                        "order_id": order["order_id"],
-                        "from": stock["stockyard_id"],
-                        "destination": order["destination"],
-                        "quantity": x[i, j].solution_value()
-                    })
+        allocations = _allocations(model, materials, orders)
         
         return {
             "optimized_plan": allocations,
-            "total_cost": objective.Value(),
-            "status": "success"
+            "total_cost": solver.Objective().Value(),
+            "status": "success",
+            "timings": timings
+        }
+    else:
+        return {
+            "optimized_plan": [],
+            "total_cost": 0,
+            "status": "failed",
+            "error": "No optimal solution found",
+            "timings": timings
         }
+# What-if changes answered by analyze_sensitivity
+WHAT_IF_KINDS = ("capacity", "demand", "unit_cost")
+
+def _index_by(rows: List[Dict[str, Any]], key: str) -> Dict[Any, int]:
+    index: Dict[Any, int] = {}
+    for position, row in enumerate(rows):
+        index.setdefault(row[key], position)
+    return index
+
+def _solve_lp(materials, orders, constraints, unit_costs) -> Tuple[Optional[AllocationModel], int]:
+    model = build_allocation_model(materials, orders, constraints, unit_costs, solver_id='GLOP')
+    if model is None:
+        return None, pywraplp.Solver.ABNORMAL
+    return model, model.solver.Solve()
+
+def _order_rate(model: AllocationModel, i: int, min_fraction: float) -> float:
+    """Cost change per extra ton ordered: both order constraints move with the quantity"""
+    rate = model.order_max[i].dual_value()
+    if i in model.order_min:
+        rate += model.order_min[i].dual_value() * min_fraction
+    return rate
+
+def _resolve_change(materials, orders, constraints, unit_costs, kind, i, j, delta, total_cost) -> Optional[float]:
+    """Actual cost change of one what-if change, by re-solving (None if infeasible)"""
+    if kind == "capacity":
+        materials = [dict(stock, capacity=stock["capacity"] + delta) if k == j else stock for k, stock in enumerate(materials)]
+    elif kind == "demand":
+        orders = [dict(order, quantity=order["quantity"] + delta) if k == i else order for k, order in enumerate(orders)]
     else:
+        unit_costs = {**unit_costs, (i, j): unit_costs[i, j] + delta}
+    model, status = _solve_lp(materials, orders, constraints, unit_costs)
+    if model is None or status != pywraplp.Solver.OPTIMAL:
+        return None
+    return model.solver.Objective().Value() - total_cost
+
+def analyze_sensitivity(
+    materials: List[Dict[str, Any]],
+    orders: List[Dict[str, Any]],
+    constraints: Optional[Dict[str, Any]] = None,
+    unit_costs: Optional[Dict[Tuple[int, int], float]] = None,
+    what_if: Optional[List[Dict[str, Any]]] = None,
+    max_reduced_costs: int = 50,
+    verify: bool = False
+) -> Dict[str, Any]:
+    """
+    Solve optimize_rakes' model once as an LP (GLOP) and report what its
+    optimal cost is sensitive to.
+    
+    Args:
+        materials, orders, constraints, unit_costs: As for optimize_rakes
+        what_if: Changes to price, each {kind, delta} with stockyard_id
+            (capacity), order_id (demand) or both (unit_cost, per ton)
+        max_reduced_costs: Unused pairs to report, closest to entering first
+        verify: Also re-solve each what-if change to report the actual cost change
+    
+    Returns:
+        Dictionary with the plan and total cost, per stockyard the shadow
+        price of its capacity (cost change per extra ton; negative means
+        more capacity saves money), per order the marginal cost of an extra
+        ton ordered, and for unused pairs the reduced cost (how much cheaper
+        per ton the pair must get before it is used).
+    
+        What-if answers are first-order estimates from these values: exact
+        while the change keeps the same constraints binding. Beyond that,
+        capacity and demand estimates are a lower bound on the new cost and
+        unit cost estimates an upper bound (the optimal cost is convex in
+        capacities and quantities, concave in costs).
+    
+    Raises:
+        ValueError: If a what-if change names an unknown kind, stockyard,
+            order or an incompatible pair
+    """
+    started = time.perf_counter()
+    stockyard_index = _index_by(materials, "stockyard_id")
+    order_index = _index_by(orders, "order_id")
+    questions = []
+    for change in what_if or []:
+        kind = change.get("kind")
+        if kind not in WHAT_IF_KINDS:
+            raise ValueError(f"Unknown what-if kind '{kind}', expected one of {', '.join(WHAT_IF_KINDS)}")
+        i = order_index.get(change.get("order_id")) if kind in ("demand", "unit_cost") else None
+        j = stockyard_index.get(change.get("stockyard_id")) if kind in ("capacity", "unit_cost") else None
+        if kind in ("demand", "unit_cost") and i is None:
+            raise ValueError(f"Unknown order '{change.get('order_id')}' in {kind} what-if")
+        if kind in ("capacity", "unit_cost") and j is None:
+            raise ValueError(f"Unknown stockyard '{change.get('stockyard_id')}' in {kind} what-if")
+        if kind == "unit_cost" and orders[i].get("material") != materials[j].get("material"):
+            raise ValueError(f"Stockyard '{materials[j]['stockyard_id']}' can't serve order '{orders[i]['order_id']}'")
+        questions.append((change, i, j))
+
+    model, status = _solve_lp(materials, orders, constraints, unit_costs)
+    solve_seconds = time.perf_counter() - started
+    if model is None or status != pywraplp.Solver.OPTIMAL:
         return {
             "optimized_plan": [],
             "total_cost": 0,
             "status": "failed",
-            "error": "No optimal solution found"
-        }
\ No newline at end of file
+            "error": "Could not create solver" if model is None else "No optimal solution found"
+        }
+    total_cost = model.solver.Objective().Value()
+    min_fraction = float((constraints or {}).get("min_fulfillment_percentage") or 0) / 100
+
+    used = [0.0] * len(materials)
+    allocated = [0.0] * len(orders)
+    for (i, j), var in model.x.items():
+        used[j] += var.solution_value()
+        allocated[i] += var.solution_value()
+
+    stockyards = [
+        {
+            "stockyard_id": stock["stockyard_id"],
+            "material": stock.get("material"),
+            "capacity": stock["capacity"],
+            "used": used[j],
+            "slack": stock["capacity"] - used[j],
+            "shadow_price": model.capacity[j].dual_value()
+        }
+        for j, stock in enumerate(materials)
+    ]
+    order_rows = [
+        {
+            "order_id": order["order_id"],
+            "quantity": order["quantity"],
+            "allocated": allocated[i],
+            "marginal_cost_per_ton": _order_rate(model, i, min_fraction)
+        }
+        for i, order in enumerate(orders)
+    ]
+    unused = sorted(
+        (var.reduced_cost(), i, j)
+        for (i, j), var in model.x.items()
+        if var.solution_value() <= EPSILON and var.reduced_cost() > EPSILON
+    )
+    reduced_costs = [
+        {
+            "order_id": orders[i]["order_id"],
+            "stockyard_id": materials[j]["stockyard_id"],
+            "unit_cost": model.unit_cost[i, j],
+            "reduced_cost": reduced_cost,
+            "break_even_unit_cost": model.unit_cost[i, j] - reduced_cost
+        }
+        for reduced_cost, i, j in unused[:max_reduced_costs]
+    ]
+
+    answers = []
+    for change, i, j in questions:
+        delta = float(change.get("delta") or 0)
+        kind = change["kind"]
+        if kind == "capacity":
+            rate = model.capacity[j].dual_value()
+        elif kind == "demand":
+            rate = _order_rate(model, i, min_fraction)
+        else:
+            rate = model.x[i, j].solution_value()
+        estimate = rate * delta or 0.0
+        answer = {
+            **{key: change.get(key) for key in ("kind", "stockyard_id", "order_id")},
+            "delta": delta,
+            "rate": rate,
+            "estimated_cost_change": estimate,
+            "estimated_total_cost": total_cost + estimate,
+            "beyond_range": "upper_bound" if kind == "unit_cost" else "lower_bound"
+        }
+        if kind == "unit_cost" and model.x[i, j].solution_value() <= EPSILON:
+            answer["enters_plan"] = delta < -model.x[i, j].reduced_cost()
+        if verify:
+            answer["actual_cost_change"] = _resolve_change(materials, orders, constraints, model.unit_cost, kind, i, j, delta, total_cost)
+        answers.append(answer)
+
+    return {
+        "optimized_plan": _allocations(model, materials, orders),
+        "total_cost": total_cost,
+        "stockyards": stockyards,
+        "orders": order_rows,
+        "reduced_costs": reduced_costs,
+        "what_if": answers,
+        "status": "success",
+        "timings": {"solve_seconds": solve_seconds, "analysis_seconds": time.perf_counter() - started - solve_seconds}
+    }
@@ -0,0 +1,224 @@
+from ortools.linear_solver import pywraplp
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+import time
+
+# Small per-tonne, per-day cost of waiting, so free capacity is used early
+# instead of pushing dispatches towards the due date
+WAITING_COST_PER_TON_DAY = 0.01
+
+# Delay penalty per day when an order has none (matches the seeded cost parameters)
+DEFAULT_PENALTY_PER_DAY = 2000.0
+
+# Solution values below this are solver noise
+EPSILON = 1e-6
+
+class RollingPlanner:
+    """
+    Time-expanded, rolling-horizon dispatch planner.
+
+    Days are integers from 0 (the plan start). Each roll solves an LP over
+    the next window_days only: how many tonnes of each order to dispatch on
+    each day, within the daily dispatch capacity and the stock on hand plus
+    production, minimising delay penalties. The first commit_days of the
+    window are committed and the state (remaining quantities, stock) is
+    carried forward, so each solve has the same size however long the
+    horizon and replanning a day re-solves only the tail window.
+
+    Orders are dicts with order_id, material, quantity and optionally
+    release_day (earliest dispatch), due_day (latest delivery), transit_days
+    and penalty_per_day (per order per day late). stock maps each material
+    to the tonnes on hand on day 0; production lists {material, rate
+    (tonnes/day), start_day}.
+    """
+
+    def __init__(
+        self,
+        orders: List[Dict[str, Any]],
+        stock: Dict[str, float],
+        production: Optional[List[Dict[str, Any]]] = None,
+        dispatch_capacity_per_day: float = 0,
+        horizon_days: int = 14,
+        window_days: int = 7,
+        commit_days: int = 1
+    ):
+        if window_days < 1 or commit_days < 1 or commit_days > window_days:
+            raise ValueError("Need 1 <= commit_days <= window_days")
+        self.horizon_days = horizon_days
+        self.window_days = window_days
+        self.commit_days = commit_days
+        self.dispatch_capacity_per_day = float(dispatch_capacity_per_day)
+
+        self.day = 0
+        self.stock = defaultdict(float, {material: float(tons) for material, tons in stock.items()})
+        self.production = production or []
+        self.orders: Dict[Any, Dict[str, Any]] = {}
+        self.remaining: Dict[Any, float] = {}
+        self.schedule: List[Dict[str, Any]] = []
+        self.solves: List[Dict[str, Any]] = []
+        self.add_orders(orders)
+
+    def add_orders(self, orders: List[Dict[str, Any]]):
+        """
+        Add orders that arrived since the last roll; they are planned from the next roll on
+        """
+        for order in orders:
+            self.orders[order["order_id"]] = order
+            self.remaining[order["order_id"]] = float(order["quantity"])
+
+    def production_on(self, material: str, day: int) -> float:
+        return sum(
+            float(item.get("rate") or 0)
+            for item in self.production
+            if item.get("material") == material and day >= (item.get("start_day") or 0)
+        )
+
+    def _lateness(self, order: Dict[str, Any], dispatch_day: int) -> int:
+        due_day = order.get("due_day")
+        if due_day is None:
+            return 0
+        return max(0, dispatch_day + int(order.get("transit_days") or 0) - due_day)
+
+    def _penalty_per_ton_day(self, order: Dict[str, Any]) -> float:
+        penalty = order.get("penalty_per_day")
+        penalty = DEFAULT_PENALTY_PER_DAY if penalty is None else float(penalty)
+        return penalty / max(float(order["quantity"]), EPSILON)
+
+    def _solve_window(self, start: int, days: int) -> Dict[int, Dict[Any, float]]:
+        """
+        Plan dispatches for days start..start+days-1 from the current state.
+        Returns {day: {order_id: tonnes}}.
+        """
+        solver = pywraplp.Solver.CreateSolver('GLOP')
+        if not solver:
+            raise RuntimeError("Could not create solver")
+        infinity = solver.infinity()
+        objective = solver.Objective()
+        window = range(start, start + days)
+        deferred_day = start + days
+
+        # d[o, t] = tonnes of order o dispatched on day t
+        d = {}
+        by_day: Dict[int, List[Any]] = defaultdict(list)
+        by_material_day: Dict[str, Dict[int, List[Any]]] = defaultdict(lambda: defaultdict(list))
+        for order_id, remaining in self.remaining.items():
+            order = self.orders[order_id]
+            # Orders released after the window don't affect it
+            if remaining <= EPSILON or (order.get("release_day") or 0) >= deferred_day:
+                continue
+            per_ton_day = self._penalty_per_ton_day(order)
+            fulfillment = solver.Constraint(remaining, remaining, f"order_{order_id}")
+            for t in window:
+                if t < (order.get("release_day") or 0):
+                    continue
+                d[order_id, t] = solver.NumVar(0, remaining, f"d_{order_id}_{t}")
+                objective.SetCoefficient(d[order_id, t], per_ton_day * self._lateness(order, t) + WAITING_COST_PER_TON_DAY * (t - start))
+                fulfillment.SetCoefficient(d[order_id, t], 1)
+                by_day[t].append(d[order_id, t])
+                by_material_day[order.get("material")][t].append(d[order_id, t])
+            # Tonnes left for later windows, costed as if dispatched the day after
+            # this one (at least a day's penalty, so deferring is never free)
+            deferred = solver.NumVar(0, remaining, f"defer_{order_id}")
+            objective.SetCoefficient(deferred, per_ton_day * max(1, self._lateness(order, deferred_day)) + WAITING_COST_PER_TON_DAY * days)
+            fulfillment.SetCoefficient(deferred, 1)
+
+        # 1. Daily dispatch capacity
+        for t, variables in by_day.items():
+            capacity = solver.Constraint(-infinity, self.dispatch_capacity_per_day, f"cap_{t}")
+            for var in variables:
+                capacity.SetCoefficient(var, 1)
+
+        # 2. Stock: cumulative dispatches never exceed stock on hand plus production so far
+        for material, days_vars in by_material_day.items():
+            available = self.stock[material]
+            dispatched_so_far: List[Any] = []
+            for t in window:
+                available += self.production_on(material, t)
+                dispatched_so_far.extend(days_vars.get(t, []))
+                if not dispatched_so_far:
+                    continue
+                supply = solver.Constraint(-infinity, available, f"stock_{material}_{t}")
+                for var in dispatched_so_far:
+                    supply.SetCoefficient(var, 1)
+
+        objective.SetMinimization()
+        status = solver.Solve()
+        if status != pywraplp.Solver.OPTIMAL and status != pywraplp.Solver.FEASIBLE:
+            raise RuntimeError(f"Dispatch window starting on day {start} has no solution")
+
+        plan: Dict[int, Dict[Any, float]] = defaultdict(dict)
+        for (order_id, t), var in d.items():
+            if var.solution_value() > EPSILON:
+                plan[t][order_id] = var.solution_value()
+        return plan
+
+    def roll(self) -> List[Dict[str, Any]]:
+        """
+        Solve the window starting today, commit its first commit_days and
+        advance. Returns the committed days.
+        """
+        days = min(self.window_days, self.horizon_days - self.day)
+        if days <= 0:
+            return []
+
+        started = time.perf_counter()
+        plan = self._solve_window(self.day, days)
+        self.solves.append({"start_day": self.day, "days": days, "seconds": round(time.perf_counter() - started, 4)})
+
+        committed = []
+        for t in range(self.day, self.day + min(self.commit_days, days)):
+            dispatches = []
+            for material in set(self.stock) | set(item.get("material") for item in self.production):
+                self.stock[material] += self.production_on(material, t)
+            for order_id, tons in sorted(plan.get(t, {}).items(), key=lambda item: -item[1]):
+                order = self.orders[order_id]
+                tons = min(tons, self.remaining[order_id])
+                self.remaining[order_id] -= tons
+                self.stock[order.get("material")] -= tons
+                dispatches.append({
+                    "order_id": order_id,
+                    "material": order.get("material"),
+                    "destination": order.get("destination"),
+                    "quantity": round(tons, 3),
+                    "arrival_day": t + int(order.get("transit_days") or 0),
+                    "days_late": self._lateness(order, t)
+                })
+            committed.append({
+                "day": t,
+                "dispatches": dispatches,
+                "dispatched_tons": round(sum(dispatch["quantity"] for dispatch in dispatches), 3),
+                "capacity_tons": self.dispatch_capacity_per_day,
+                "closing_stock": {material: round(tons, 3) for material, tons in self.stock.items()}
+            })
+        self.schedule.extend(committed)
+        self.day += len(committed)
+        return committed
+
+    def plan(self) -> Dict[str, Any]:
+        """
+        Roll to the end of the horizon and return the schedule
+        """
+        while self.day < self.horizon_days:
+            self.roll()
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        delay_penalty = 0.0
+        for day in self.schedule:
+            for dispatch in day["dispatches"]:
+                order = self.orders[dispatch["order_id"]]
+                delay_penalty += self._penalty_per_ton_day(order) * dispatch["days_late"] * dispatch["quantity"]
+
+        unscheduled = [
+            {"order_id": order_id, "quantity": round(remaining, 3)}
+            for order_id, remaining in self.remaining.items()
+            if remaining > EPSILON
+        ]
+        return {
+            "days": self.schedule,
+            "unscheduled": unscheduled,
+            "total_delay_penalty": round(delay_penalty, 2),
+            "windows_solved": len(self.solves),
+            "solve_seconds": round(sum(solve["seconds"] for solve in self.solves), 4),
+            "max_window_seconds": max((solve["seconds"] for solve in self.solves), default=0)
+        }
@@ -0,0 +1,193 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Tuple, Callable
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import time
+import uuid
+
+from app.ml.rake_optimizer import optimize_rakes
+from app.ml.heuristic_allocator import allocate_heuristic
+
+# Solvers that take a unit cost matrix, by optimization mode
+SCENARIO_SOLVERS = {
+    "cost": optimize_rakes,
+    "heuristic": allocate_heuristic,
+}
+
+# Worker processes are started once and reused by every batch; the inputs
+# shared by a batch's scenarios are written to a file once and loaded once
+# per worker (the latest batch is kept in _shared)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+_shared: Dict[str, Any] = {}
+
+def prepare_shared(
+    materials: List[Dict[str, Any]],
+    orders: List[Dict[str, Any]],
+    constraints: Dict[str, Any],
+    mode: str,
+    distance: Optional[Callable[[str, str], Optional[float]]],
+    base_rate: float,
+    fuel_factor: float
+) -> Dict[str, Any]:
+    """
+    The inputs shared by a batch of scenarios. The rail distance of every
+    compatible (order, stockyard) pair is looked up once here; scenarios
+    only rescale it by their freight rate (base_rate x fuel factor, as
+    CostModel prices freight). Pairs without a station, destination or path
+    cost the stockyard's cost alone. Without a distance function (no loading
+    stations) the scenarios are solved without freight.
+    """
+    freight_km: Optional[Dict[Tuple[int, int], float]] = None
+    if distance is not None:
+        freight_km = {}
+        distances: Dict[Tuple[str, str], Optional[float]] = {}
+        by_material: Dict[Any, List[int]] = {}
+        for j, stock in enumerate(materials):
+            by_material.setdefault(stock.get("material"), []).append(j)
+        for i, order in enumerate(orders):
+            destination = order.get("destination")
+            for j in by_material.get(order.get("material"), []):
+                station = materials[j].get("station")
+                if not station or not destination:
+                    continue
+                if (station, destination) not in distances:
+                    distances[station, destination] = distance(station, destination)
+                if distances[station, destination] is not None:
+                    freight_km[i, j] = distances[station, destination]
+
+    return {
+        "materials": materials,
+        "orders": orders,
+        "constraints": constraints,
+        "mode": mode,
+        "freight_km": freight_km,
+        "base_rate": base_rate,
+        "fuel_factor": fuel_factor,
+        "stockyard_index": {stock["stockyard_id"]: j for j, stock in enumerate(materials)},
+    }
+
+def _run_in_worker(batch: Tuple[str, str], scenario: Dict[str, Any]) -> Dict[str, Any]:
+    batch_id, path = batch
+    if _shared.get("batch_id") != batch_id:
+        with open(path, "rb") as f:
+            shared = pickle.load(f)
+        _shared.clear()
+        _shared.update(shared, batch_id=batch_id)
+    return run_scenario(_shared, scenario)
+
+def run_scenario(shared: Dict[str, Any], scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Solve one scenario: the shared base inputs with the scenario's stockyard
+    outages (capacity 0) and constraint overrides applied, and freight priced
+    at the base rate times its fuel factor (default: the shared one)
+    """
+    started = time.perf_counter()
+    outages = set(scenario.get("stockyard_outages") or [])
+    materials = [
+        dict(stock, capacity=0.0) if stock["stockyard_id"] in outages else stock
+        for stock in shared["materials"]
+    ]
+    orders = shared["orders"]
+    constraints = {**shared["constraints"], **(scenario.get("constraints") or {})}
+    if scenario.get("min_fulfillment_percentage") is not None:
+        constraints["min_fulfillment_percentage"] = scenario["min_fulfillment_percentage"]
+
+    unit_costs = None
+    rate = 0.0
+    if shared["freight_km"] is not None:
+        fuel_factor = scenario.get("fuel_factor")
+        rate = shared["base_rate"] * (shared["fuel_factor"] if fuel_factor is None else fuel_factor)
+        unit_costs = {
+            (i, j): float(materials[j].get("cost") or 0) + km * rate
+            for (i, j), km in shared["freight_km"].items()
+        }
+
+    try:
+        result = SCENARIO_SOLVERS[shared["mode"]](materials, orders, constraints, unit_costs)
+    except Exception as e:
+        result = {"optimized_plan": [], "total_cost": 0, "status": "failed", "error": str(e)}
+
+    # Split the cost into stockyard and freight parts
+    stockyard_index = shared["stockyard_index"]
+    stock_cost = 0.0
+    used = set()
+    for allocation in result.get("optimized_plan", []):
+        j = stockyard_index[allocation["from"]]
+        stock_cost += allocation["quantity"] * float(materials[j].get("cost") or 0)
+        used.add(allocation["from"])
+    succeeded = result.get("status") == "success"
+
+    return {
+        "name": scenario["name"],
+        "status": result.get("status", "failed"),
+        "error": result.get("error"),
+        "total_cost": result.get("total_cost") if succeeded else None,
+        "stockyard_cost": stock_cost if succeeded else None,
+        "freight_cost": result.get("total_cost", 0) - stock_cost if succeeded else None,
+        "freight_rate": rate,
+        "allocated_tons": sum(allocation["quantity"] for allocation in result.get("optimized_plan", [])),
+        "unfulfilled_tons": sum(item["quantity"] for item in result.get("unfulfilled") or []),
+        "stockyards_used": len(used),
+        "seconds": round(time.perf_counter() - started, 4),
+        "optimized_plan": result.get("optimized_plan", []) if scenario.get("include_plan") else None
+    }
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn: forking a server process with running threads isn't safe
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+def shutdown_pool():
+    """
+    Stop the scenario worker processes (on application shutdown)
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+def evaluate_scenarios(shared: Dict[str, Any], scenarios: List[Dict[str, Any]], workers: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Solve scenarios in the module's worker processes, started on first use
+    and reused by later batches. The shared inputs (base orders and
+    stockyards, the freight distance matrix) are written to a temporary file
+    once per batch and loaded once per worker; each task carries only its
+    scenario. With one worker (or one scenario) they run in this process.
+
+    Returns:
+        Scenario results in input order, and the number of workers used
+    """
+    global _pool
+    if workers <= 1 or len(scenarios) <= 1:
+        return [run_scenario(shared, scenario) for scenario in scenarios], 1
+
+    pool = _get_pool(workers)
+    fd, path = tempfile.mkstemp(prefix="scenarios-", suffix=".pickle")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(shared, f, protocol=pickle.HIGHEST_PROTOCOL)
+        batch = (uuid.uuid4().hex, path)
+        try:
+            results = list(pool.map(_run_in_worker, [batch] * len(scenarios), scenarios))
+        except BrokenProcessPool:
+            # A worker died: start a fresh pool for the next batch
+            with _pool_lock:
+                if _pool is pool:
+                    _pool = None
+            raise
+    finally:
+        os.remove(path)
+    return results, min(workers, len(scenarios))
@@ -6,4 +6,5 @@ from app.models.route_transport import RouteTransport
 from app.models.rake import Rake
 from app.models.order import Order
 from app.models.inventory import Inventory
-from app.models.optimization import OptimizationResult
+from app.models.optimization import OptimizationResult, OptimizationAllocation
+from app.models.seed_manifest import SeedManifest
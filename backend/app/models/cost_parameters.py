@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Integer
+from sqlalchemy import Column, String, Float, Integer, Index
 from app.core.database import Base
 
 class CostParameter(Base):
@@ -13,3 +13,7 @@ class CostParameter(Base):
     penalty_per_day_delay = Column(Float, nullable=False)
     priority_multiplier = Column(Float, nullable=False)
     fuel_surcharge_per_wagon = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("uq_cost_parameters_natural_key", "commodity", "priority", unique=True),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -19,6 +19,10 @@ class InventoryItem(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
+    __table_args__ = (
+        Index("uq_inventory_items_natural_key", "plant_location", "storage_location", "product_name", "material_grade", unique=True),
+    )
+
 class Inventory(Base):
     __tablename__ = "stockyards"
 
@@ -28,3 +32,7 @@ class Inventory(Base):
     location = Column(String)  # Latitude-Longitude as string, e.g., "23.6345,86.1432"
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_stockyards_material", "material"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, JSON, Integer
+from sqlalchemy import Column, String, Float, DateTime, JSON, Integer, Index, ForeignKey
 from sqlalchemy.sql import func
 import uuid
 
@@ -9,13 +9,41 @@ class OptimizationResult(Base):
     
     task_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
     rake_id = Column(String, nullable=True)
-    plan = Column(JSON)  # Store the optimization result JSON
+    plan = Column(JSON)  # Solver extras (mode, corridor utilization, unfulfilled, timings); allocations are in optimization_allocations
     total_cost = Column(Float)
-    iteration = Column(Integer, default=1)
+    iteration = Column(Integer, default=1)  # Nth solve of the same request fingerprint
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     
     # Metadata for the optimization
     num_orders = Column(Integer)
     num_stockyards = Column(Integer)
+    num_allocations = Column(Integer, nullable=True)
+    mode = Column(String(20), nullable=True)
     status = Column(String, default="Completed")  # Completed, Failed, In Progress
-    error_message = Column(String, nullable=True)
\ No newline at end of file
+    error_message = Column(String, nullable=True)
+
+    # Fingerprint of the request that produced the plan (see optimization_cache)
+    request_hash = Column(String(64), nullable=True)
+
+    # Set when retention dropped the plan details, keeping only this summary row
+    compacted_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_optimization_results_request_hash", "request_hash", "timestamp"),
+        Index("ix_optimization_results_timestamp", "timestamp", "task_id"),
+    )
+
+class OptimizationAllocation(Base):
+    __tablename__ = "optimization_allocations"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(String, ForeignKey("optimization_results.task_id", ondelete="CASCADE"), nullable=False)
+    order_id = Column(String, nullable=False)
+    from_stockyard = Column(String, nullable=False)
+    origin_station = Column(String, nullable=True)
+    destination = Column(String, nullable=True)
+    quantity = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_optimization_allocations_task_id", "task_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -8,6 +8,7 @@ class Order(Base):
     __tablename__ = "orders"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    order_number = Column(String(50), nullable=True)  # External/ERP order identity
     customer_name = Column(String(100), nullable=False)
     customer_id = Column(Integer, nullable=True)
     material = Column(String(100), nullable=False)
@@ -27,6 +28,19 @@ class Order(Base):
     rake_id = Column(Integer, ForeignKey("rakes.id"), nullable=True)
     rake = relationship("Rake", back_populates="orders")
 
+    # Optimistic concurrency: bumped on every update, writers check it (WHERE version = :v)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # Audit fields
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
+
+    __table_args__ = (
+        Index("uq_orders_natural_key", "order_number", unique=True),
+        Index("ix_orders_status_priority", "status", "priority"),
+        Index("ix_orders_priority", "priority"),
+        Index("ix_orders_rake_id", "rake_id"),
+        Index("ix_orders_created_at_id", "created_at", "id"),
+    )
+
+    __mapper_args__ = {"version_id_col": version}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -30,9 +30,19 @@ class Rake(Base):
     freight_type = Column(String(100), nullable=True)
     weight = Column(Float, nullable=True)  # Weight in tons
 
+    # Optimistic concurrency: bumped on every update, writers check it (WHERE version = :v)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # Audit fields
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
     # Relationships
     orders = relationship("Order", back_populates="rake")
+
+    __table_args__ = (
+        Index("ix_rakes_status", "status"),
+        Index("ix_rakes_created_at_id", "created_at", "id"),
+    )
+
+    __mapper_args__ = {"version_id_col": version}
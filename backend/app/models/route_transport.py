@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Integer
+from sqlalchemy import Column, String, Float, Integer, Index
 from app.core.database import Base
 
 class RouteTransport(Base):
@@ -15,3 +15,7 @@ class RouteTransport(Base):
     route_constraints = Column(String, nullable=True)
     expected_delays_days = Column(Integer, nullable=True)
     railway_zone = Column(String, nullable=False)
+
+    __table_args__ = (
+        Index("uq_route_transport_info_natural_key", "origin", "destination", unique=True),
+    )
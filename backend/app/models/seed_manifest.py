@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+class SeedManifest(Base):
+    __tablename__ = "seed_manifest"
+
+    # One row per seeded CSV file, used to skip files whose content hasn't changed
+    file_name = Column(String, primary_key=True)
+    table_name = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    row_count = Column(Integer, nullable=False, default=0)
+    seeded_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
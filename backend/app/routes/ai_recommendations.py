@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.schemas.report_schema import AIRecommendation
 from app.services.ai_service import get_recommendations
 
@@ -12,7 +12,7 @@ router = APIRouter()
 async def get_ai_recommendations(
     category: Optional[str] = None,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get AI-generated text suggestions for optimization and decision support
@@ -1,21 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.schemas.report_schema import DashboardOverview
 from app.services.dashboard_service import get_dashboard_metrics, get_dashboard_charts
 
 router = APIRouter()
 
 @router.get("/dashboard/overview", response_model=DashboardOverview)
-async def get_dashboard_overview(db: Session = Depends(get_db)):
+async def get_dashboard_overview(db: AsyncSession = Depends(get_read_db)):
     """
     Get metrics for dashboard (rake count, utilization, dispatch volume, ETA accuracy)
     """
     try:
-        metrics = get_dashboard_metrics(db)
-        charts = get_dashboard_charts(db)
+        metrics = await get_dashboard_metrics(db)
+        charts = await get_dashboard_charts(db)
         
         return {
             "metrics": metrics,
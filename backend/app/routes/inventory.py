@@ -1,35 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_read_db
 from app.schemas.inventory_schema import Inventory, InventoryCreate, InventoryUpdate
-from app.services.inventory_service import get_stockyard, get_all_stockyards, create_stockyard, update_stockyard, delete_stockyard
+from app.services.inventory_service import get_stockyard, get_all_stockyards, create_stockyard, update_stockyard, delete_stockyard, STOCKYARD_SORT_KEY
+from app.utils.pagination import filter_signature, encode_keyset_cursor, decode_keyset_cursor
 
 router = APIRouter()
 
 @router.get("/inventory/stockyards", response_model=List[Inventory])
 async def read_stockyards(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
     material: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Get all stockyards with optional material filter
+    Get all stockyards with optional material filter, ordered by ID. The cursor
+    for the next page is returned in the X-Next-Cursor header (absent on the last page).
     """
-    stockyards = get_all_stockyards(db, skip=skip, limit=limit, material=material)
+    signature = filter_signature({"material": material})
+    try:
+        after = decode_keyset_cursor(cursor, STOCKYARD_SORT_KEY, signature) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    stockyards = await get_all_stockyards(db, skip=skip, limit=limit, material=material, after=after)
+    if stockyards and len(stockyards) == limit:
+        response.headers["X-Next-Cursor"] = encode_keyset_cursor(stockyards[-1], STOCKYARD_SORT_KEY, signature)
     return stockyards
 
 @router.get("/inventory/stockyards/{stockyard_id}", response_model=Inventory)
 async def read_stockyard(
     stockyard_id: str = Path(..., description="The ID of the stockyard to get"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a single stockyard by ID
     """
-    stockyard = get_stockyard(db, stockyard_id=stockyard_id)
+    stockyard = await get_stockyard(db, stockyard_id=stockyard_id)
     if stockyard is None:
         raise HTTPException(status_code=404, detail="Stockyard not found")
     return stockyard
@@ -37,39 +49,36 @@ async def read_stockyard(
 @router.post("/inventory/stockyards", response_model=Inventory)
 async def add_stockyard(
     stockyard: InventoryCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add a new stockyard
     """
-    return create_stockyard(db=db, stockyard=stockyard)
+    return await create_stockyard(db=db, stockyard=stockyard)
 
 @router.put("/inventory/stockyards/{stockyard_id}", response_model=Inventory)
 async def update_existing_stockyard(
     stockyard_id: str,
     stockyard: InventoryUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an existing stockyard
     """
-    db_stockyard = get_stockyard(db, stockyard_id=stockyard_id)
-    if db_stockyard is None:
+    updated_stockyard = await update_stockyard(db=db, stockyard_id=stockyard_id, stockyard=stockyard)
+    if updated_stockyard is None:
         raise HTTPException(status_code=404, detail="Stockyard not found")
-    
-    return update_stockyard(db=db, stockyard_id=stockyard_id, stockyard=stockyard)
+    return updated_stockyard
 
 @router.delete("/inventory/stockyards/{stockyard_id}", response_model=dict)
 async def delete_existing_stockyard(
     stockyard_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete an existing stockyard
     """
-    db_stockyard = get_stockyard(db, stockyard_id=stockyard_id)
-    if db_stockyard is None:
+    deleted_stockyard = await delete_stockyard(db=db, stockyard_id=stockyard_id)
+    if deleted_stockyard is None:
         raise HTTPException(status_code=404, detail="Stockyard not found")
-    
-    delete_stockyard(db=db, stockyard_id=stockyard_id)
     return {"success": True, "message": f"Stockyard {stockyard_id} deleted"}
\ No newline at end of file
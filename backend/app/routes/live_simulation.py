@@ -1,29 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
 import asyncio
 import random
 import logging
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_read_db, read_session
 from app.services.simulation_service import get_live_positions, get_simulation_config, get_active_rakes, active_connections, broadcast_update, start_simulation_loop
 
 router = APIRouter()
 
 @router.get("/simulation/live")
-async def get_live_simulation_data(db: Session = Depends(get_db)):
+async def get_live_simulation_data(db: AsyncSession = Depends(get_read_db)):
     """
     Get real-time rake positions for the simulation map
     """
     try:
-        positions = get_live_positions(db)
+        positions = await get_live_positions(db)
         return positions
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get live simulation data: {str(e)}")
 
 @router.get("/simulation/config")
-async def get_simulation_configuration(db: Session = Depends(get_db)):
+async def get_simulation_configuration(db: AsyncSession = Depends(get_read_db)):
     """
     Get configuration data for the simulation (routes, stations, etc.)
     """
@@ -34,13 +34,13 @@ async def get_simulation_configuration(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get simulation configuration: {str(e)}")
 
 @router.get("/simulation/active-rakes")
-async def get_active_rakes(db: Session = Depends(get_db)):
+async def get_active_rakes(db: AsyncSession = Depends(get_read_db)):
     """
     Get all currently active rakes for the simulation
     """
     try:
         # Convert from service data format to expected frontend format
-        positions = get_live_positions(db)
+        positions = await get_live_positions(db)
         rakes = []
         
         for rake in positions["rakes"]:
@@ -62,7 +62,7 @@ async def get_active_rakes(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get active rakes: {str(e)}")
         
 @router.post("/simulation/start")
-async def start_simulation(request: Request, db: Session = Depends(get_db)):
+async def start_simulation(request: Request):
     """
     Start or restart the simulation
     """
@@ -74,8 +74,9 @@ async def start_simulation(request: Request, db: Session = Depends(get_db)):
         # Log simulation start
         logging.info(f"Starting simulation with speed_factor={speed_factor}, include_random_events={include_random_events}")
         
-        # Start the simulation loop in a background task
-        asyncio.create_task(start_simulation_loop(db, speed_factor, include_random_events))
+        # Start the simulation loop in a background task; it opens its own
+        # session because it outlives this request
+        asyncio.create_task(start_simulation_loop(speed_factor, include_random_events))
         
         # Broadcast to all connected clients that simulation is starting
         asyncio.create_task(broadcast_update("simulation_started", {
@@ -97,7 +98,7 @@ async def start_simulation(request: Request, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to start simulation: {str(e)}")
 
 @router.post("/simulation/event")
-async def handle_simulation_event(request: Request, db: Session = Depends(get_db)):
+async def handle_simulation_event(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Handle custom simulation events like delays, breakdowns, etc.
     """
@@ -211,11 +212,10 @@ async def websocket_simulation(websocket: WebSocket, client_id: str = None):
             "timestamp": datetime.now().isoformat()
         })
         
-        # Create a database session for this connection
-        db = next(get_db())
-        
-        # Send initial data immediately
-        positions = get_live_positions(db)
+        # Send initial data immediately (sessions are opened per read so an idle
+        # connection doesn't hold a pooled database connection)
+        async with read_session() as db:
+            positions = await get_live_positions(db)
         await websocket.send_json({
             "type": "position_update",
             "data": positions,
@@ -240,7 +240,8 @@ async def websocket_simulation(websocket: WebSocket, client_id: str = None):
             
             if message_type == "get_positions":
                 # Get current rake positions
-                positions = get_live_positions(db)
+                async with read_session() as db:
+                    positions = await get_live_positions(db)
                 await websocket.send_json({
                     "type": "position_update",
                     "data": positions,
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.core.database import get_read_db
+from app.ml.rail_network import METRICS
+from app.services.network_service import get_rail_network, find_path
+
+router = APIRouter()
+
+@router.get("/network/graph")
+async def read_network_graph(
+    include_edges: bool = Query(False, description="Include every corridor in the response"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get the rail network built from route transport info: stations,
+    corridor count and path cache statistics
+    """
+    try:
+        network = await get_rail_network(db)
+        data = {"stations": network.stations, "stats": network.stats()}
+        if include_edges:
+            data["edges"] = [
+                {
+                    "from": edge.source,
+                    "to": edge.target,
+                    "distance_km": round(edge.distance_km, 3),
+                    "transit_days": round(edge.transit_days, 3),
+                    "expected_delay_days": round(edge.delay_days, 3),
+                    "capacity_wagons_per_day": edge.capacity_wagons_per_day,
+                    "via": list(edge.via),
+                    "alternate_via": list(edge.alternate_via),
+                    "reverse": edge.reverse
+                }
+                for edge in network.edges()
+            ]
+        return {"success": True, "data": data}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to build rail network: {str(e)}")
+
+@router.get("/network/path")
+async def read_network_path(
+    origin: str = Query(..., description="Origin station"),
+    destination: str = Query(..., description="Destination station"),
+    metric: str = Query("distance", description="distance (cheapest) or time (fastest, transit + expected delays)"),
+    min_capacity: Optional[float] = Query(None, description="Skip corridors below this capacity (wagons/day)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get the cheapest or fastest path between two stations
+    """
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric '{metric}', expected one of {', '.join(METRICS)}")
+
+    try:
+        path = await find_path(db, origin, destination, metric=metric, min_capacity=min_capacity or 0)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Path lookup failed: {str(e)}")
+
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No path from {origin} to {destination}")
+    return {"success": True, "data": {"metric": metric, **path}}
@@ -1,10 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 from typing import List, Optional
 
-from app.core.database import get_db
-from app.schemas.order_schema import Order, OrderCreate, OrderUpdate
-from app.services.order_service import get_order, get_all_orders, create_order, update_order, delete_order
+from app.core.database import get_async_db, get_read_db
+from app.core.concurrency import VersionConflict
+from app.core.config import settings
+from app.schemas.order_schema import Order, OrderCreate, OrderUpdate, OrderBulkCreate, OrderBulkUpdate, OrderBulkDelete
+from app.services.order_service import (
+    get_order, get_all_orders, create_order, update_order, delete_order, ORDER_SORT_KEY,
+    bulk_create_orders, bulk_update_orders, bulk_delete_orders
+)
+from app.utils.pagination import filter_signature, encode_keyset_cursor, decode_keyset_cursor
 
 router = APIRouter()
 
@@ -13,24 +20,97 @@ async def read_orders(
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
-    priority: Optional[int] = None,
-    db: Session = Depends(get_db)
+    priority: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Get all customer orders with optional filters
+    Get all customer orders with optional filters, oldest first.
+    Follow next_cursor to page through the list; skip is only kept for
+    older clients and is ignored when a cursor is given.
     """
-    orders = get_all_orders(db, skip=skip, limit=limit, status=status, priority=priority)
-    return {"data": orders, "success": True, "message": f"Retrieved {len(orders)} orders"}
+    signature = filter_signature({"status": status, "priority": priority})
+    try:
+        after = decode_keyset_cursor(cursor, ORDER_SORT_KEY, signature) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    orders = await get_all_orders(db, skip=skip, limit=limit, status=status, priority=priority, after=after)
+    next_cursor = encode_keyset_cursor(orders[-1], ORDER_SORT_KEY, signature) if orders and len(orders) == limit else None
+    return {"data": orders, "next_cursor": next_cursor, "success": True, "message": f"Retrieved {len(orders)} orders"}
+
+def _check_batch_size(count: int):
+    if count == 0:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if count > settings.ORDER_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch of {count} rows exceeds the limit of {settings.ORDER_BULK_MAX_ROWS}")
+
+def _bulk_response(results, action: str):
+    succeeded = sum(1 for result in results if result.success)
+    return {
+        "data": {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results},
+        "success": True,
+        "message": f"{action} {succeeded} of {len(results)} orders"
+    }
+
+# Bulk routes are declared before /orders/{order_id} so "bulk" isn't taken as an ID
+@router.post("/orders/bulk")
+async def add_orders_bulk(
+    batch: OrderBulkCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a batch of orders in one transaction. Each row is validated on
+    its own; invalid rows are reported in the per-row results and skipped.
+    """
+    _check_batch_size(len(batch.orders))
+    try:
+        results = await bulk_create_orders(db, batch.orders)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk order creation failed: {str(e)}")
+    return _bulk_response(results, "Created")
+
+@router.patch("/orders/bulk")
+async def update_orders_bulk(
+    batch: OrderBulkUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Partially update a batch of orders by ID in one transaction
+    """
+    _check_batch_size(len(batch.orders))
+    try:
+        results = await bulk_update_orders(db, batch.orders)
+    except StaleDataError:
+        raise HTTPException(status_code=409, detail="Orders in the batch kept changing concurrently, retry the request")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk order update failed: {str(e)}")
+    return _bulk_response(results, "Updated")
+
+@router.delete("/orders/bulk")
+async def delete_orders_bulk(
+    batch: OrderBulkDelete,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a batch of orders by ID in one transaction
+    """
+    _check_batch_size(len(batch.ids))
+    try:
+        results = await bulk_delete_orders(db, batch.ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk order delete failed: {str(e)}")
+    return _bulk_response(results, "Deleted")
 
 @router.get("/orders/{order_id}", response_model=Order)
 async def read_order(
-    order_id: str = Path(..., description="The ID of the order to get"),
-    db: Session = Depends(get_db)
+    order_id: int = Path(..., description="The ID of the order to get"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a single order by ID
     """
-    order = get_order(db, order_id=order_id)
+    order = await get_order(db, order_id=order_id)
     if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -38,41 +118,40 @@ async def read_order(
 @router.post("/orders/add")
 async def add_order(
     order: OrderCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add a new customer order
     """
-    new_order = create_order(db=db, order=order)
+    new_order = await create_order(db=db, order=order)
     return {"data": new_order, "success": True, "message": "Order created successfully"}
 
 @router.put("/orders/{order_id}")
 async def update_existing_order(
-    order_id: str,
+    order_id: int,
     order: OrderUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an existing order
     """
-    db_order = get_order(db, order_id=order_id)
-    if db_order is None:
+    try:
+        updated_order = await update_order(db=db, order_id=order_id, order=order)
+    except VersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if updated_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
-
-    updated_order = update_order(db=db, order_id=order_id, order=order)
     return {"data": updated_order, "success": True, "message": "Order updated successfully"}
 
 @router.delete("/orders/{order_id}")
 async def delete_existing_order(
-    order_id: str,
-    db: Session = Depends(get_db)
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete an existing order
     """
-    db_order = get_order(db, order_id=order_id)
-    if db_order is None:
+    deleted_order = await delete_order(db=db, order_id=order_id)
+    if deleted_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
-
-    delete_order(db=db, order_id=order_id)
     return {"success": True, "message": f"Order {order_id} deleted"}
@@ -1,37 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.core.database import get_db
-from app.schemas.rake_schema import Rake, RakeCreate, RakeUpdate
-from app.schemas.optimize_schema import OptimizationRequest, OptimizationResponse
-from app.services.rake_service import get_rake, get_all_rakes, create_rake, update_rake, delete_rake
-from app.services.optimize_service import optimize_rake_allocation
+from app.core.config import settings
+from app.core.database import get_async_db, get_read_db
+from app.core.concurrency import VersionConflict
+from app.schemas.rake_schema import Rake, RakeCreate, RakeUpdate, RakeBulkStatusUpdate
+from app.schemas.optimize_schema import OptimizationRequest, OptimizationResponse, RollingPlanRequest, SensitivityRequest, ScenarioBatchRequest
+from app.services.rake_service import (
+    get_rake, get_all_rakes, create_rake, update_rake, delete_rake, RAKE_SORT_KEY,
+    bulk_update_rake_status, import_rakes
+)
+from app.utils.pagination import filter_signature, encode_keyset_cursor, decode_keyset_cursor
+from app.services.optimize_service import (
+    optimize_rake_allocation, plan_rolling_dispatch, analyze_allocation_sensitivity, evaluate_optimization_scenarios
+)
+from app.services.optimization_history_service import get_plan_history, get_plan_details, compact_plan_history, HISTORY_SORT_KEY
 
 router = APIRouter()
 
 @router.get("/rake/", response_model=List[Rake])
 async def read_rakes(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Get all rakes with optional status filter
+    Get all rakes with optional status filter, oldest first. The cursor for
+    the next page is returned in the X-Next-Cursor header (absent on the last page).
     """
-    rakes = get_all_rakes(db, skip=skip, limit=limit, status=status)
+    signature = filter_signature({"status": status})
+    try:
+        after = decode_keyset_cursor(cursor, RAKE_SORT_KEY, signature) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rakes = await get_all_rakes(db, skip=skip, limit=limit, status=status, after=after)
+    if rakes and len(rakes) == limit:
+        response.headers["X-Next-Cursor"] = encode_keyset_cursor(rakes[-1], RAKE_SORT_KEY, signature)
     return rakes
 
 @router.get("/rake/{rake_id}", response_model=Rake)
 async def read_rake(
-    rake_id: str = Path(..., description="The ID of the rake to get"),
-    db: Session = Depends(get_db)
+    rake_id: int = Path(..., description="The ID of the rake to get"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a single rake by ID
     """
-    rake = get_rake(db, rake_id=rake_id)
+    rake = await get_rake(db, rake_id=rake_id)
     if rake is None:
         raise HTTPException(status_code=404, detail="Rake not found")
     return rake
@@ -39,57 +59,231 @@ async def read_rake(
 @router.post("/rake/optimize", response_model=OptimizationResponse)
 async def optimize_rakes(
     request: OptimizationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Run AI optimization and get loading plan
+    Run AI optimization and get loading plan. mode=flow routes the plan over
+    the rail network within each corridor's track capacity and reports
+    corridor utilization.
     """
     try:
-        result = optimize_rake_allocation(db, request)
+        result = await optimize_rake_allocation(db, request)
         return {
             "result": result,
             "status": "success",
             "message": "Optimization completed successfully"
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
 
+@router.post("/rake/optimize/sensitivity")
+async def optimization_sensitivity(request: SensitivityRequest):
+    """
+    Sensitivity of the cost-mode plan from a single solve: what an extra ton
+    of capacity at each stockyard saves, what an extra ton ordered costs and
+    how much cheaper unused stockyards must get to be used. what_if changes
+    are priced from these values instead of re-running the optimizer.
+    """
+    try:
+        analysis = await analyze_allocation_sensitivity(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sensitivity analysis failed: {str(e)}")
+    return {
+        "data": analysis,
+        "success": True,
+        "message": f"Priced {len(analysis['what_if'])} what-if changes from one solve"
+    }
+
+@router.post("/rake/optimize/scenarios")
+async def optimization_scenarios(
+    request: ScenarioBatchRequest,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Compare variations of an optimization request (fuel factor, stockyard
+    outages, fulfillment levels) solved in parallel: one row per scenario
+    with its cost split and the change against the base request
+    """
+    if len(request.scenarios) > settings.SCENARIO_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Batch of {len(request.scenarios)} scenarios exceeds the limit of {settings.SCENARIO_BATCH_MAX}")
+
+    try:
+        comparison = await evaluate_optimization_scenarios(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scenario evaluation failed: {str(e)}")
+    return {
+        "data": comparison,
+        "success": True,
+        "message": f"Evaluated {len(comparison['comparison'])} scenarios on {comparison['workers']} workers"
+    }
+
+@router.get("/rake/optimize/history")
+async def read_optimization_history(
+    limit: int = Query(50, ge=1, le=500),
+    status: Optional[str] = None,
+    mode: Optional[str] = None,
+    request_hash: Optional[str] = None,
+    include_details: bool = Query(False, description="Include each plan's allocations, corridor utilization and unfulfilled orders"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Past optimization plans, newest first, as summary rows (cost, mode,
+    status, sizes) unless include_details is set. Follow next_cursor to
+    page through the history.
+    """
+    signature = filter_signature({"status": status, "mode": mode, "request_hash": request_hash, "include_details": include_details})
+    try:
+        after = decode_keyset_cursor(cursor, HISTORY_SORT_KEY, signature) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        plans = await get_plan_history(db, limit=limit, status=status, mode=mode, request_hash=request_hash, after=after, include_details=include_details)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load optimization history: {str(e)}")
+    next_cursor = encode_keyset_cursor(plans[-1], HISTORY_SORT_KEY, signature) if plans and len(plans) == limit else None
+    return {"data": plans, "next_cursor": next_cursor, "success": True, "message": f"Retrieved {len(plans)} plans"}
+
+@router.post("/rake/optimize/history/compact")
+async def compact_optimization_history(
+    compact_after_days: int = Query(settings.OPTIMIZATION_COMPACT_AFTER_DAYS, ge=0, description="Drop the details of plans older than this"),
+    retention_days: int = Query(settings.OPTIMIZATION_RETENTION_DAYS, ge=0, description="Delete plans older than this (0 keeps them)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Apply the plan retention policy: delete plans past retention_days and
+    older iterations of the same request, and reduce the remaining plans
+    older than compact_after_days to their summary row
+    """
+    try:
+        counts = await compact_plan_history(db, compact_after_days, retention_days)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Optimization history compaction failed: {str(e)}")
+    return {
+        "data": counts,
+        "success": True,
+        "message": f"Deleted {counts['deleted'] + counts['superseded']} and compacted {counts['compacted']} plans"
+    }
+
+@router.get("/rake/optimize/history/{task_id}")
+async def read_optimization_plan(
+    task_id: str = Path(..., description="Task ID of the optimization"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get one stored plan with its allocations
+    """
+    plan = await get_plan_details(db, task_id)
+    if plan is None:
+        raise HTTPException(status_code=404, detail="Optimization plan not found")
+    return {"data": plan, "success": True}
+
+@router.post("/rake/plan/rolling")
+async def plan_rolling(
+    request: RollingPlanRequest,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Day-by-day dispatch schedule over a rolling horizon: each day's plan is
+    re-solved over the next window_days with delay penalties, incoming
+    production and the daily loading capacity
+    """
+    try:
+        plan = await plan_rolling_dispatch(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rolling plan failed: {str(e)}")
+    return {
+        "data": plan,
+        "success": True,
+        "message": f"Scheduled {plan['orders'] - len(plan['unscheduled'])} of {plan['orders']} orders over {request.horizon_days} days"
+    }
+
 @router.post("/rake/", response_model=Rake)
 async def create_new_rake(
     rake: RakeCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new rake
     """
-    return create_rake(db=db, rake=rake)
+    return await create_rake(db=db, rake=rake)
+
+@router.patch("/rake/bulk-status")
+async def update_rake_status_bulk(
+    batch: RakeBulkStatusUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Apply status/location changes for many rakes in one transaction.
+    Rakes whose status and location already match are left untouched.
+    """
+    if not batch.rakes:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(batch.rakes) > settings.RAKE_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch of {len(batch.rakes)} rows exceeds the limit of {settings.RAKE_BULK_MAX_ROWS}")
+
+    try:
+        results = await bulk_update_rake_status(db, batch.rakes)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk rake status update failed: {str(e)}")
+
+    counts = {outcome: sum(1 for result in results if result.result == outcome) for outcome in ("updated", "unchanged", "not_found")}
+    return {
+        "data": {**counts, "results": results},
+        "success": True,
+        "message": f"Updated {counts['updated']} of {len(results)} rakes"
+    }
+
+@router.post("/rake/import")
+async def import_rake_fleet(
+    file: UploadFile = File(..., description="Rake wagon details CSV"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import a fleet file, inserting new rakes and updating existing ones by
+    rake number. Priority and transit progress of existing rakes are kept.
+    """
+    try:
+        written = await import_rakes(db, await file.read())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rake import failed: {str(e)}")
+    return {"data": {"rows": written}, "success": True, "message": f"Imported {written} rakes"}
 
 @router.put("/rake/{rake_id}", response_model=Rake)
 async def update_existing_rake(
-    rake_id: str,
+    rake_id: int,
     rake: RakeUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an existing rake
     """
-    db_rake = get_rake(db, rake_id=rake_id)
-    if db_rake is None:
+    try:
+        updated_rake = await update_rake(db=db, rake_id=rake_id, rake=rake)
+    except VersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if updated_rake is None:
         raise HTTPException(status_code=404, detail="Rake not found")
-    
-    return update_rake(db=db, rake_id=rake_id, rake=rake)
+    return updated_rake
 
 @router.delete("/rake/{rake_id}", response_model=dict)
 async def delete_existing_rake(
-    rake_id: str,
-    db: Session = Depends(get_db)
+    rake_id: int,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete an existing rake
     """
-    db_rake = get_rake(db, rake_id=rake_id)
-    if db_rake is None:
+    deleted_rake = await delete_rake(db=db, rake_id=rake_id)
+    if deleted_rake is None:
         raise HTTPException(status_code=404, detail="Rake not found")
-    
-    delete_rake(db=db, rake_id=rake_id)
     return {"success": True, "message": f"Rake {rake_id} deleted"}
\ No newline at end of file
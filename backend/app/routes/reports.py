@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime, timedelta
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.schemas.report_schema import DailyReport
 from app.services.report_service import get_daily_summary, get_custom_report, export_report_to_pdf
 
@@ -13,7 +13,7 @@ router = APIRouter()
 async def get_summary_report(
     date_from: Optional[date] = Query(None, description="Start date for the report"),
     date_to: Optional[date] = Query(None, description="End date for the report"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get daily summary report with metrics, charts and recommendations
@@ -36,7 +36,7 @@ async def get_custom_report_data(
     date_from: Optional[date] = Query(None, description="Start date for the report"),
     date_to: Optional[date] = Query(None, description="End date for the report"),
     filters: Optional[str] = Query(None, description="Additional filters for the report as JSON string"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Generate a custom report based on provided parameters
@@ -67,7 +67,7 @@ async def export_report_as_pdf(
     report_type: str = Query(..., description="Type of report to export"),
     date_from: Optional[date] = Query(None, description="Start date for the report"),
     date_to: Optional[date] = Query(None, description="End date for the report"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Export a report as PDF
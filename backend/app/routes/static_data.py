@@ -1,15 +1,21 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict, List, Any, Optional
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from typing import Dict, List, Any, Optional, Iterator, AsyncIterator
 import pandas as pd
 import os
 from datetime import datetime, timedelta
 import numpy as np
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_read_db, read_session
 from app.models import rake, order, inventory
 from app.models.cost_parameters import CostParameter
 from app.models.route_transport import RouteTransport
+from app.services.seed_service import create_seed_job, get_seed_job, run_seed_job
+from app.services.static_data_service import load_static_frame, parse_filters, apply_filters, project_columns, query_signature, format_records
+from app.utils.helpers import encode_cursor, decode_cursor
+from app.utils.streaming import streaming_records_response, STREAM_BATCH_SIZE
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,100 +27,42 @@ router = APIRouter()
 STATIC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "statics")
 
 # Database seeding and management endpoints
-@router.post("/database/seed")
-async def seed_database(db: Session = Depends(get_db)):
+@router.post("/database/seed", status_code=202)
+async def seed_database(
+    background_tasks: BackgroundTasks,
+    force: bool = Query(False, description="Re-seed files even if their content is unchanged")
+):
     """
-    Seed the database with sample data from CSV files
+    Seed the database with sample data from CSV files. Unchanged files are
+    skipped and changed files are upserted, so seeding is safe to repeat.
+    Runs as a background job; poll /database/seed/{job_id} for progress.
     """
-    try:
-        logger.info("Starting database seeding...")
-
-        # Import CSV data and seed database tables
-        from app.models.inventory import InventoryItem
-        from app.models.order import Order
-        from app.models.rake import Rake
-
-        # Read CSV files and create database records
-        inventory_df = pd.read_csv(os.path.join(STATIC_PATH, "production_inventory.csv"))
-        orders_df = pd.read_csv(os.path.join(STATIC_PATH, "customer_orders.csv"))
-        rakes_df = pd.read_csv(os.path.join(STATIC_PATH, "rake_wagon_details.csv"))
-
-        seeded_counts = {
-            "inventory_items": 0,
-            "orders": 0,
-            "rakes": 0
-        }
-
-        # Seed inventory items
-        for _, row in inventory_df.iterrows():
-            item = InventoryItem(
-                plant_location=str(row.get('plant_location', 'Plant A')),
-                product_name=str(row.get('product_name', 'Steel Product')),
-                material_grade=str(row.get('material_grade', 'Grade A')),
-                quantity=float(row.get('quantity', 1000)),
-                unit=str(row.get('unit', 'tons')),
-                storage_location=str(row.get('storage_location', 'Storage A')),
-                next_production_date=None,
-                production_rate=float(row.get('production_rate', 100)) if 'production_rate' in row and not pd.isna(row.get('production_rate')) else None
-            )
-            db.add(item)
-            seeded_counts["inventory_items"] += 1
-
-        # Seed orders
-        for _, row in orders_df.iterrows():
-            try:
-                order = Order(
-                    customer_name=str(row.get('customer_name', 'Customer A')).strip()[:100],
-                    customer_id=int(float(row.get('customer_id', 1001))) if pd.notna(row.get('customer_id')) else None,
-                    material=str(row.get('material', row.get('product_name', 'Steel'))).strip()[:100],
-                    quantity=float(row.get('quantity', 500)),
-                    unit=str(row.get('unit', 'tons')).strip()[:20],
-                    status="pending",
-                    priority="normal",
-                    origin_plant=str(row.get('origin_plant', 'Plant A')).strip()[:100],
-                    destination=str(row.get('destination', 'Location A')).strip()[:100],
-                    rate_per_ton=float(row.get('rate_per_ton', 1000)) if pd.notna(row.get('rate_per_ton')) else None
-                )
-                db.add(order)
-                seeded_counts["orders"] += 1
-            except Exception as e:
-                logger.warning(f"Failed to create order for row {_}: {e}")
-                continue
-
-        # Seed rakes
-        for _, row in rakes_df.iterrows():
-            rake = Rake(
-                rake_number=str(row.get('rake_number', f'RK{1000 + _}')),
-                origin_plant=str(row.get('origin_plant', 'Plant A')) if 'origin_plant' in row else 'Plant A',
-                destination=str(row.get('destination', 'Location B')) if 'destination' in row else 'Location B',
-                status=str(row.get('status', 'Available')),
-                capacity_tons=float(row.get('capacity_tons', 2000)) if 'capacity_tons' in row and not pd.isna(row.get('capacity_tons')) else 2000,
-                priority="normal",
-                current_location=str(row.get('current_location', 'At Plant')) if 'current_location' in row else 'At Plant',
-                total_wagons=int(row.get('total_wagons', 20)) if 'total_wagons' in row and not pd.isna(row.get('total_wagons')) else 20,
-                last_maintenance_date=None
-            )
-            db.add(rake)
-            seeded_counts["rakes"] += 1
-
-        # Commit all changes
-        db.commit()
-
-        logger.info(f"Database seeded successfully: {seeded_counts}")
-
-        return {
-            "success": True,
-            "message": "Database seeded successfully",
-            "data": seeded_counts
-        }
+    job = create_seed_job(force=force)
+    background_tasks.add_task(run_seed_job, job["job_id"])
+    logger.info(f"Queued database seeding job {job['job_id']}")
+
+    return {
+        "success": True,
+        "message": "Database seeding started",
+        "data": job
+    }
+
+@router.get("/database/seed/{job_id}")
+async def get_seed_status(job_id: str):
+    """
+    Get status and per-table progress of a database seeding job
+    """
+    job = get_seed_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Seeding job {job_id} not found")
 
-    except Exception as e:
-        logger.error(f"Database seeding failed: {str(e)}")
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Failed to seed database: {str(e)}")
+    return {
+        "success": job["status"] != "failed",
+        "data": job
+    }
 
 @router.get("/database/stats")
-async def get_database_stats(db: Session = Depends(get_db)):
+async def get_database_stats(db: AsyncSession = Depends(get_read_db)):
     """
     Get database statistics for all tables
     """
@@ -124,9 +72,9 @@ async def get_database_stats(db: Session = Depends(get_db)):
         from app.models.rake import Rake
 
         stats = {
-            "inventory_items": db.query(InventoryItem).count(),
-            "orders": db.query(Order).count(),
-            "rakes": db.query(Rake).count()
+            "inventory_items": await db.scalar(select(func.count()).select_from(InventoryItem)),
+            "orders": await db.scalar(select(func.count()).select_from(Order)),
+            "rakes": await db.scalar(select(func.count()).select_from(Rake))
         }
 
         return {
@@ -154,38 +102,78 @@ async def list_static_files():
         raise HTTPException(status_code=500, detail=f"Failed to list static files: {str(e)}")
 
 @router.get("/static-data/{file_name}")
-async def get_static_data(file_name: str, limit: Optional[int] = None):
+async def get_static_data(
+    file_name: str,
+    limit: Optional[int] = Query(
+        None, ge=1, le=settings.STATIC_DATA_MAX_PAGE_SIZE,
+        description=f"Maximum number of rows to return (json default {settings.STATIC_DATA_PAGE_SIZE}; ndjson/csv stream every matching row unless set)"
+    ),
+    offset: int = Query(0, ge=0, description="Number of matching rows to skip"),
+    columns: Optional[str] = Query(None, description="Comma-separated list of columns to return"),
+    filter: Optional[List[str]] = Query(None, description="Row filters as column:op:value (op: eq, ne, gt, gte, lt, lte, in)"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by a previous page"),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson|csv)$", description="Response format: json, ndjson or csv (streamed)")
+):
     """
-    Get data from a static CSV file with optional limit
+    Get data from a static CSV file with optional projection, filters and pagination.
+    JSON responses are paged (follow next_cursor for the rest); the ndjson
+    and csv formats stream every matching row unless a limit is given.
     """
+    if limit is None and response_format == "json":
+        limit = settings.STATIC_DATA_PAGE_SIZE
     file_path = get_csv_file_path(file_name)
 
     try:
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail=f"File {file_name} not found")
 
-        df = pd.read_csv(file_path)
-
-        # Process date fields for better frontend presentation
-        for col in df.columns:
-            if 'date' in col.lower():
-                try:
-                    df[col] = pd.to_datetime(df[col]).dt.strftime('%Y-%m-%d')
-                except:
-                    pass  # Ignore if column can't be converted
+        df, version = load_static_frame(file_path)
+
+        try:
+            selected_columns = [col.strip() for col in columns.split(",") if col.strip()] if columns else None
+            parsed_filters = parse_filters(filter)
+            signature = query_signature(selected_columns, parsed_filters)
+
+            # A cursor pins the file version and query so pages stay consistent
+            if cursor:
+                position = decode_cursor(cursor)
+                if position.get("q") != signature:
+                    raise ValueError("Cursor does not match the requested columns/filters")
+                if position.get("v") != version:
+                    raise HTTPException(status_code=409, detail=f"File {file_name} changed since the cursor was issued, restart from the first page")
+                offset = int(position.get("o", 0))
+
+            df = apply_filters(df, parsed_filters)
+            df = project_columns(df, selected_columns)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        total_count = len(df)
+        end = offset + limit if limit else total_count
+        page = df.iloc[offset:end]
+
+        if response_format != "json":
+            batches = (
+                format_records(page.iloc[start:start + STREAM_BATCH_SIZE])
+                for start in range(0, len(page), STREAM_BATCH_SIZE)
+            )
+            return streaming_records_response(batches, response_format, os.path.splitext(file_name)[0], list(page.columns))
 
-        # Apply limit if specified
-        if limit:
-            df = df.head(limit)
+        next_cursor = None
+        if end < total_count:
+            next_cursor = encode_cursor({"v": version, "q": signature, "o": end})
 
         # Convert to dict representation
-        result = df.to_dict(orient='records')
+        result = format_records(page)
 
         return {
             "file_name": file_name,
             "record_count": len(result),
+            "total_count": total_count,
+            "offset": offset,
+            "next_cursor": next_cursor,
             "last_modified": datetime.fromtimestamp(os.path.getmtime(file_path)).strftime('%Y-%m-%d %H:%M:%S'),
-            "columns": list(df.columns),
+            "columns": list(page.columns),
             "data": result
         }
     except Exception as e:
@@ -235,39 +223,168 @@ async def get_static_data_summary(file_name: str):
             raise e
         raise HTTPException(status_code=500, detail=f"Failed to summarize {file_name}: {str(e)}")
 
+def _inventory_record(item, i: int, today: datetime) -> Dict[str, Any]:
+    """Convert an InventoryItem row to the production inventory response format"""
+    return {
+        "plant_location": item.plant_location,
+        "product_name": item.product_name,
+        "material_grade": item.material_grade,
+        "quantity": float(item.quantity),
+        "unit": item.unit,
+        "storage_location": item.storage_location,
+        "production_schedule_date": (today + timedelta(days=i % 5)).strftime('%Y-%m-%d'),
+        "next_production_date": item.next_production_date.isoformat() if item.next_production_date else None,
+        "production_rate": float(item.production_rate) if item.production_rate else 0,
+    }
+
+def _order_record(order, i: int, today: datetime) -> Dict[str, Any]:
+    """Convert an Order row to the customer orders response format"""
+    return {
+        "order_id": order.id,
+        "customer_name": order.customer_name,
+        "customer_id": order.customer_id,
+        "material": order.material,
+        "quantity": float(order.quantity),
+        "unit": order.unit,
+        "preferred_dispatch_date": (today + timedelta(days=i % 30)).strftime('%Y-%m-%d'),
+        "latest_delivery_date": (today + timedelta(days=(i % 30) + 7 + (i % 7))).strftime('%Y-%m-%d'),
+        "order_status": order.status or "pending",
+        "priority": order.priority or "normal",
+        "origin_plant": order.origin_plant,
+        "destination": order.destination,
+        "rate_per_ton": float(order.rate_per_ton) if order.rate_per_ton else None,
+    }
+
+def _rake_record(rake, i: int, today: datetime) -> Dict[str, Any]:
+    """Convert a Rake row to the rake status response format"""
+    return {
+        "rake_id": rake.id,
+        "rake_number": rake.rake_number,
+        "origin_plant": rake.origin_plant,
+        "destination": rake.destination,
+        "status": rake.status or "Available",
+        "departure_date": (today + timedelta(days=i % 20 - 10)).strftime('%Y-%m-%d')
+                       if rake.status != 'Available' else None,
+        "expected_arrival_date": (today + timedelta(days=(i % 20 - 10) + 3 + (i % 7))).strftime('%Y-%m-%d')
+                               if rake.status != 'Available' else None,
+        "last_maintenance_date": (today - timedelta(days=i % 90)).strftime('%Y-%m-%d')
+                              if rake.last_maintenance_date else None,
+        "capacity_tons": float(rake.capacity_tons) if rake.capacity_tons else 0,
+        "priority": rake.priority or "normal",
+        "current_location": rake.current_location or "At Plant",
+        "total_wagons": rake.total_wagons or 0,
+    }
+
+def _refresh_inventory_dates(df: pd.DataFrame, start: int, today: datetime) -> pd.DataFrame:
+    """Update production schedule dates of CSV inventory rows, starting at row index `start`"""
+    df['production_schedule_date'] = [(today + timedelta(days=i % 5)).strftime('%Y-%m-%d') for i in range(start, start + len(df))]
+    return df
+
+def _refresh_order_dates(df: pd.DataFrame, start: int, today: datetime) -> pd.DataFrame:
+    """Update dispatch/delivery dates of CSV order rows, starting at row index `start`"""
+    # Set preferred dispatch dates to be within next 30 days
+    df['preferred_dispatch_date'] = [(today + timedelta(days=i % 30)).strftime('%Y-%m-%d') for i in range(start, start + len(df))]
+
+    # Set delivery dates to be 7-14 days after dispatch dates
+    df['latest_delivery_date'] = [
+        (datetime.strptime(dispatch_date, '%Y-%m-%d') + timedelta(days=7 + (i % 7))).strftime('%Y-%m-%d')
+        for i, dispatch_date in enumerate(df['preferred_dispatch_date'], start=start)
+    ]
+    return df
+
+def _refresh_rake_dates(df: pd.DataFrame, start: int, today: datetime) -> pd.DataFrame:
+    """Update operational dates of CSV rake rows, starting at row index `start`"""
+    arrivals = df['expected_arrival_date'].tolist() if 'expected_arrival_date' in df.columns else [None] * len(df)
+    departure_dates, arrival_dates, maintenance_dates = [], [], []
+
+    for i, status, departure, arrival, maintenance in zip(
+        range(start, start + len(df)), df['status'], df['departure_date'], arrivals, df['last_maintenance_date']
+    ):
+        # Departure dates within past 10 days or future 10 days
+        if status != 'Available' and not pd.isna(departure):
+            departure_date = today + timedelta(days=i % 20 - 10)
+            departure_dates.append(departure_date.strftime('%Y-%m-%d'))
+            # Expected arrival 3-10 days after departure for in-transit rakes
+            if status == 'In-use':
+                arrival = (departure_date + timedelta(days=3 + (i % 7))).strftime('%Y-%m-%d')
+        else:
+            departure_dates.append(None)
+        arrival_dates.append(arrival)
+
+        # Last maintenance dates within past 90 days
+        maintenance_dates.append((today - timedelta(days=i % 90)).strftime('%Y-%m-%d') if not pd.isna(maintenance) else None)
+
+    df['departure_date'] = departure_dates
+    df['expected_arrival_date'] = arrival_dates
+    df['last_maintenance_date'] = maintenance_dates
+    return df
+
+async def _db_record_batches(model, to_record) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream rows of a table in batches using a server-side cursor.
+    Uses its own session because the generator outlives the request handler.
+    """
+    async with read_session() as db:
+        today = datetime.now()
+        i = 0
+        result = await db.stream_scalars(select(model).execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for partition in result.partitions():
+            batch = []
+            for row in partition:
+                batch.append(to_record(row, i, today))
+                i += 1
+            yield batch
+
+def _csv_record_batches(file_path: str, refresh_dates) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream a CSV file in chunks, refreshing dates on each chunk as it is read
+    """
+    today = datetime.now()
+    start = 0
+    for chunk in pd.read_csv(file_path, chunksize=STREAM_BATCH_SIZE):
+        chunk = refresh_dates(chunk, start, today)
+        start += len(chunk)
+        yield chunk.replace({np.nan: None}).to_dict(orient='records')
+
+async def _stream_current_data(db: AsyncSession, model, to_record, csv_name: str, refresh_dates, response_format: str):
+    """
+    Stream current data from the database, falling back to the CSV file when the table is empty
+    """
+    try:
+        if await db.scalar(select(model.id).limit(1)) is not None:
+            return streaming_records_response(_db_record_batches(model, to_record), response_format, model.__tablename__)
+    except Exception as sql_error:
+        logger.warning(f"Database query failed, falling back to CSV: {str(sql_error)}")
+
+    file_path = get_csv_file_path(csv_name)
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail=f"File {csv_name} not found")
+    return streaming_records_response(_csv_record_batches(file_path, refresh_dates), response_format, os.path.splitext(csv_name)[0])
+
 @router.get("/static-data/production-inventory/current")
-async def get_production_inventory(db: Session = Depends(get_db)):
+async def get_production_inventory(
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson|csv)$", description="Response format: json, ndjson or csv (streamed)"),
+    db: AsyncSession = Depends(get_read_db)
+):
     """
     Get the current production inventory with updated dates - SQL database integration
     """
+    from app.models.inventory import InventoryItem
+
+    if response_format != "json":
+        return await _stream_current_data(db, InventoryItem, _inventory_record, "production_inventory.csv", _refresh_inventory_dates, response_format)
+
     # Try SQL database first (for production)
     try:
-        from app.models.inventory import InventoryItem
-
         # Get all inventory items from database
-        inventory_items = db.query(InventoryItem).all()
+        inventory_items = (await db.execute(select(InventoryItem))).scalars().all()
 
         if inventory_items:
             logger.info(f"Retrieved {len(inventory_items)} inventory items from database")
 
             # Convert SQLAlchemy objects to dict and update dates
-            result = []
             today = datetime.now()
-
-            for i, item in enumerate(inventory_items):
-                # Convert to dict and update production_schedule_date
-                item_dict = {
-                    "plant_location": item.plant_location,
-                    "product_name": item.product_name,
-                    "material_grade": item.material_grade,
-                    "quantity": float(item.quantity),
-                    "unit": item.unit,
-                    "storage_location": item.storage_location,
-                    "production_schedule_date": (today + timedelta(days=i % 5)).strftime('%Y-%m-%d'),
-                    "next_production_date": item.next_production_date.isoformat() if item.next_production_date else None,
-                    "production_rate": float(item.production_rate) if item.production_rate else 0,
-                }
-                result.append(item_dict)
+            result = [_inventory_record(item, i, today) for i, item in enumerate(inventory_items)]
 
             return {
                 "last_updated": today.strftime('%Y-%m-%d %H:%M:%S'),
@@ -288,7 +405,7 @@ async def get_production_inventory(db: Session = Depends(get_db)):
 
         # Update the dates to reflect current date
         today = datetime.now()
-        df['production_schedule_date'] = [(today + timedelta(days=i % 5)).strftime('%Y-%m-%d') for i in range(len(df))]
+        df = _refresh_inventory_dates(df, 0, today)
 
         result = df.to_dict(orient='records')
 
@@ -303,42 +420,29 @@ async def get_production_inventory(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get production inventory from database or CSV: {str(e)}")
 
 @router.get("/static-data/customer-orders/current")
-async def get_customer_orders(db: Session = Depends(get_db)):
+async def get_customer_orders(
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson|csv)$", description="Response format: json, ndjson or csv (streamed)"),
+    db: AsyncSession = Depends(get_read_db)
+):
     """
     Get customer orders with updated dates based on current date - SQL database integration
     """
+    from app.models.order import Order
+
+    if response_format != "json":
+        return await _stream_current_data(db, Order, _order_record, "customer_orders.csv", _refresh_order_dates, response_format)
+
     try:
         # Try SQL database first (for production)
-        from app.models.order import Order
-
         # Get all orders from database
-        orders = db.query(Order).all()
+        orders = (await db.execute(select(Order))).scalars().all()
 
         if orders:
             logger.info(f"Retrieved {len(orders)} orders from database")
 
             # Convert SQLAlchemy objects to dict and update dates
-            result = []
             today = datetime.now()
-
-            for i, order in enumerate(orders):
-                # Convert to dict and update dispatch/delivery dates
-                order_dict = {
-                    "order_id": order.id,
-                    "customer_name": order.customer_name,
-                    "customer_id": order.customer_id,
-                    "material": order.material,
-                    "quantity": float(order.quantity),
-                    "unit": order.unit,
-                    "preferred_dispatch_date": (today + timedelta(days=i % 30)).strftime('%Y-%m-%d'),
-                    "latest_delivery_date": (today + timedelta(days=(i % 30) + 7 + (i % 7))).strftime('%Y-%m-%d'),
-                    "order_status": order.status or "pending",
-                    "priority": order.priority or "normal",
-                    "origin_plant": order.origin_plant,
-                    "destination": order.destination,
-                    "rate_per_ton": float(order.rate_per_ton) if order.rate_per_ton else None,
-                }
-                result.append(order_dict)
+            result = [_order_record(order, i, today) for i, order in enumerate(orders)]
 
             return {
                 "last_updated": today.strftime('%Y-%m-%d %H:%M:%S'),
@@ -359,15 +463,7 @@ async def get_customer_orders(db: Session = Depends(get_db)):
 
         # Update the dates to reflect current date
         today = datetime.now()
-
-        # Set preferred dispatch dates to be within next 30 days
-        df['preferred_dispatch_date'] = [(today + timedelta(days=i % 30)).strftime('%Y-%m-%d') for i in range(len(df))]
-
-        # Set delivery dates to be 7-14 days after dispatch dates
-        df['latest_delivery_date'] = [
-            (datetime.strptime(dispatch_date, '%Y-%m-%d') + timedelta(days=7 + (i % 7))).strftime('%Y-%m-%d')
-            for i, dispatch_date in enumerate(df['preferred_dispatch_date'])
-        ]
+        df = _refresh_order_dates(df, 0, today)
 
         result = df.to_dict(orient='records')
 
@@ -382,44 +478,29 @@ async def get_customer_orders(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get customer orders from database or CSV: {str(e)}")
 
 @router.get("/static-data/rake-status/current")
-async def get_rake_status(db: Session = Depends(get_db)):
+async def get_rake_status(
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson|csv)$", description="Response format: json, ndjson or csv (streamed)"),
+    db: AsyncSession = Depends(get_read_db)
+):
     """
     Get current rake status with updated dates - SQL database integration
     """
+    from app.models.rake import Rake
+
+    if response_format != "json":
+        return await _stream_current_data(db, Rake, _rake_record, "rake_wagon_details.csv", _refresh_rake_dates, response_format)
+
     try:
         # Try SQL database first (for production)
-        from app.models.rake import Rake
-
         # Get all rakes from database
-        rakes = db.query(Rake).all()
+        rakes = (await db.execute(select(Rake))).scalars().all()
 
         if rakes:
             logger.info(f"Retrieved {len(rakes)} rakes from database")
 
             # Convert SQLAlchemy objects to dict and update dates
-            result = []
             today = datetime.now()
-
-            for i, rake in enumerate(rakes):
-                # Convert to dict and update operational dates
-                rake_dict = {
-                    "rake_id": rake.id,
-                    "rake_number": rake.rake_number,
-                    "origin_plant": rake.origin_plant,
-                    "destination": rake.destination,
-                    "status": rake.status or "Available",
-                    "departure_date": (today + timedelta(days=i % 20 - 10)).strftime('%Y-%m-%d')
-                                   if rake.status != 'Available' else None,
-                    "expected_arrival_date": (today + timedelta(days=(i % 20 - 10) + 3 + (i % 7))).strftime('%Y-%m-%d')
-                                           if rake.status != 'Available' else None,
-                    "last_maintenance_date": (today - timedelta(days=i % 90)).strftime('%Y-%m-%d')
-                                          if rake.last_maintenance_date else None,
-                    "capacity_tons": float(rake.capacity_tons) if rake.capacity_tons else 0,
-                    "priority": rake.priority or "normal",
-                    "current_location": rake.current_location or "At Plant",
-                    "total_wagons": rake.total_wagons or 0,
-                }
-                result.append(rake_dict)
+            result = [_rake_record(rake, i, today) for i, rake in enumerate(rakes)]
 
             return {
                 "last_updated": today.strftime('%Y-%m-%d %H:%M:%S'),
@@ -440,30 +521,7 @@ async def get_rake_status(db: Session = Depends(get_db)):
 
         # Update the dates to reflect current date
         today = datetime.now()
-
-        # Set departure dates to be within past 10 days or future 10 days
-        df['departure_date'] = [
-            (today + timedelta(days=i % 20 - 10)).strftime('%Y-%m-%d')
-            if df.iloc[i]['status'] != 'Available' and not pd.isna(df.iloc[i]['departure_date'])
-            else None
-            for i in range(len(df))
-        ]
-
-        # Set expected arrival dates to be 3-10 days after departure dates for in-transit rakes
-        for i in range(len(df)):
-            if df.iloc[i]['departure_date'] and df.iloc[i]['status'] == 'In-use':
-                departure_date_val = df.iloc[i]['departure_date']
-                if pd.notna(departure_date_val):
-                    departure_date = datetime.strptime(str(departure_date_val), '%Y-%m-%d')
-                    df.at[i, 'expected_arrival_date'] = (departure_date + timedelta(days=3 + (i % 7))).strftime('%Y-%m-%d')
-
-        # Set last maintenance dates to be within past 90 days
-        df['last_maintenance_date'] = [
-            (today - timedelta(days=i % 90)).strftime('%Y-%m-%d')
-            if not pd.isna(df.iloc[i]['last_maintenance_date'])
-            else None
-            for i in range(len(df))
-        ]
+        df = _refresh_rake_dates(df, 0, today)
 
         # Replace any NaN values with None for JSON serialization
         df = df.replace({np.nan: None})
@@ -485,7 +543,7 @@ async def get_routes_csv():
     """
     Get the routes CSV file specifically
     """
-    return await get_static_data("route_transport_info_updated.csv")
+    return await get_static_data("route_transport_info_updated.csv", limit=None, offset=0, columns=None, filter=None, cursor=None, response_format="json")
 
 
 @router.get("/route-transport-info")
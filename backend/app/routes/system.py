@@ -0,0 +1,116 @@
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+import logging
+
+from app.core.config import settings
+from app.core.database import engine, async_engine, read_async_engine, replica_state
+from app.core.pool_metrics import pool_status
+from app.core.concurrency import contention_metrics
+from app.services.reference_cache import reference_caches, invalidate_reference_caches
+from app.services.optimization_cache import optimization_cache
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/system/db-pool")
+async def get_db_pool_metrics():
+    """
+    Get connection pool occupancy and checkout wait-time histograms
+    for the sync (seeding/scripts), async (API) and read replica engines
+    """
+    try:
+        pools = {
+            "sync": pool_status(engine.pool),
+            "async": pool_status(async_engine.sync_engine.pool)
+        }
+        if read_async_engine is not None:
+            pools["async_read"] = pool_status(read_async_engine.sync_engine.pool)
+
+        return {
+            "success": True,
+            "data": {
+                "config": {
+                    "pool_size": settings.DB_POOL_SIZE,
+                    "max_overflow": settings.DB_MAX_OVERFLOW,
+                    "pool_timeout": settings.DB_POOL_TIMEOUT,
+                    "pool_recycle": settings.DB_POOL_RECYCLE,
+                    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+                    "server_pooler": settings.DB_USE_SERVER_POOLER
+                },
+                "pools": pools,
+                "replica": {
+                    "configured": read_async_engine is not None,
+                    "max_lag_seconds": settings.DB_READ_MAX_LAG_SECONDS or None,
+                    "lag_seconds": replica_state["lag_seconds"],
+                    "fresh": replica_state["fresh"],
+                    "error": replica_state["error"]
+                }
+            }
+        }
+    except Exception as e:
+        logger.error(f"Failed to get pool metrics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get pool metrics: {str(e)}")
+
+@router.get("/system/contention")
+async def get_contention_metrics():
+    """
+    Get optimistic concurrency counters per write operation: attempts,
+    version conflicts, retries and writes that gave up after the last retry
+    """
+    try:
+        return {
+            "success": True,
+            "data": {
+                "config": {
+                    "max_attempts": settings.OCC_MAX_ATTEMPTS,
+                    "retry_backoff_ms": settings.OCC_RETRY_BACKOFF_MS
+                },
+                "operations": contention_metrics.snapshot()
+            }
+        }
+    except Exception as e:
+        logger.error(f"Failed to get contention metrics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get contention metrics: {str(e)}")
+
+@router.get("/system/reference-cache")
+async def get_reference_cache_stats():
+    """
+    Get size, load time and hit/miss counters of the reference data caches
+    """
+    try:
+        return {
+            "success": True,
+            "data": {name: cache.stats() for name, cache in reference_caches.items()}
+        }
+    except Exception as e:
+        logger.error(f"Failed to get reference cache stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get reference cache stats: {str(e)}")
+
+@router.post("/system/reference-cache/invalidate")
+async def invalidate_reference_cache(table: Optional[str] = None):
+    """
+    Force the reference caches (or the one for a table) of this worker to
+    reload on next use, e.g. after editing cost parameters or routes by hand
+    """
+    if table is not None and table not in reference_caches:
+        raise HTTPException(status_code=404, detail=f"No reference cache for table '{table}'")
+
+    invalidate_reference_caches([table] if table else None)
+    return {"success": True, "message": f"Invalidated {table or 'all reference caches'}"}
+
+@router.get("/system/optimization-cache")
+async def get_optimization_cache_stats():
+    """
+    Get size and hit/miss counters of this worker's optimization plan cache,
+    and how many requests waited on an identical solve already in progress
+    """
+    return {"success": True, "data": optimization_cache.stats()}
+
+@router.post("/system/optimization-cache/clear")
+async def clear_optimization_cache():
+    """
+    Drop this worker's in-memory plans (stored plans are still reused;
+    send use_cache=false to re-solve)
+    """
+    optimization_cache.clear()
+    return {"success": True, "message": "Cleared the optimization cache"}
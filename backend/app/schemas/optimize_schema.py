@@ -1,27 +1,48 @@
 from pydantic import BaseModel, Field, Json
-from datetime import datetime
+from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 
 class OrderItem(BaseModel):
     order_id: str
     quantity: float
+    material: Optional[str] = None
+    destination: Optional[str] = Field(None, description="Destination station (required for flow mode)")
+    priority: Optional[str] = Field(None, description="urgent, high, normal or low (heuristic mode serves higher first when stock is short)")
 
 class StockyardItem(BaseModel):
     stockyard_id: str
     material: str
     capacity: float
     cost: float = Field(..., description="Cost per ton")
+    station: Optional[str] = Field(None, description="Rail station the stockyard loads at (flow mode)")
 
 class OptimizationRequest(BaseModel):
     orders: List[OrderItem] = Field(..., description="List of orders to fulfill")
     materials: List[StockyardItem] = Field(..., description="List of available materials in stockyards")
     constraints: Optional[Dict[str, Any]] = Field(None, description="Optional constraints for the optimization")
+    mode: str = Field("cost", description="'cost': cheapest stockyards (exact); 'flow': route over the rail network within track capacity; 'heuristic': fast greedy + local search for large instances")
+    use_cache: bool = Field(True, description="Reuse the plan of an identical earlier request")
 
 class AllocationItem(BaseModel):
     order_id: str
     from_stockyard: str
-    destination: str
+    destination: Optional[str] = None
     quantity: float
+    origin_station: Optional[str] = None
+
+class CorridorUtilization(BaseModel):
+    from_station: str
+    to_station: str
+    flow_tons: float
+    capacity_tons: float
+    wagons: float
+    utilization: Optional[float] = None
+    via: List[str] = Field(default_factory=list, description="Stations the corridor's preferred route passes")
+
+class UnfulfilledOrder(BaseModel):
+    order_id: str
+    quantity: float
+    reason: str
 
 class OptimizationResult(BaseModel):
     task_id: str
@@ -29,8 +50,71 @@ class OptimizationResult(BaseModel):
     optimized_plan: List[AllocationItem]
     total_cost: float
     timestamp: datetime
+    mode: str = "cost"
+    corridor_utilization: Optional[List[CorridorUtilization]] = None
+    unfulfilled: Optional[List[UnfulfilledOrder]] = None
+    cached: bool = False
+
+class OptimizationSummary(BaseModel):
+    task_id: str
+    timestamp: Optional[datetime] = None
+    mode: Optional[str] = None
+    status: Optional[str] = None
+    total_cost: Optional[float] = None
+    iteration: Optional[int] = None
+    num_orders: Optional[int] = None
+    num_stockyards: Optional[int] = None
+    num_allocations: Optional[int] = None
+    error_message: Optional[str] = None
+    request_hash: Optional[str] = None
+    compacted_at: Optional[datetime] = Field(None, description="When retention dropped the plan details")
+
+    model_config = {
+        "from_attributes": True
+    }
+
+class OptimizationHistoryItem(OptimizationSummary):
+    optimized_plan: Optional[List[AllocationItem]] = None
+    corridor_utilization: Optional[List[CorridorUtilization]] = None
+    unfulfilled: Optional[List[UnfulfilledOrder]] = None
+    timings: Optional[Dict[str, float]] = None
 
 class OptimizationResponse(BaseModel):
     result: OptimizationResult
     status: str = "success"
-    message: Optional[str] = None
\ No newline at end of file
+    message: Optional[str] = None
+
+class WhatIfChange(BaseModel):
+    kind: str = Field(..., description="'capacity' (needs stockyard_id), 'demand' (order_id) or 'unit_cost' (order_id and stockyard_id)")
+    delta: float = Field(..., description="Change in tons, or in cost per ton for unit_cost")
+    stockyard_id: Optional[str] = None
+    order_id: Optional[str] = None
+
+class SensitivityRequest(BaseModel):
+    orders: List[OrderItem] = Field(..., description="List of orders to fulfill")
+    materials: List[StockyardItem] = Field(..., description="List of available materials in stockyards")
+    constraints: Optional[Dict[str, Any]] = Field(None, description="Optional constraints for the optimization")
+    what_if: List[WhatIfChange] = Field(default_factory=list, description="Changes to price from the single solve")
+    max_reduced_costs: int = Field(50, ge=0, le=10000, description="Unused order/stockyard pairs to report")
+    verify: bool = Field(False, description="Also re-solve each what-if change for its actual cost change")
+
+class Scenario(BaseModel):
+    name: str
+    fuel_factor: Optional[float] = Field(None, gt=0, description="Fuel price factor on freight (default: the cost model's fuel_factor)")
+    stockyard_outages: List[str] = Field(default_factory=list, description="Stockyards unavailable in this scenario")
+    min_fulfillment_percentage: Optional[float] = Field(None, ge=0, le=100)
+    constraints: Optional[Dict[str, Any]] = Field(None, description="Other constraint overrides")
+
+class ScenarioBatchRequest(BaseModel):
+    base: OptimizationRequest = Field(..., description="The unperturbed request ('cost' or 'heuristic' mode)")
+    scenarios: List[Scenario] = Field(..., description="Variations of the base request to compare")
+    include_plans: bool = Field(False, description="Include each scenario's allocations")
+
+class RollingPlanRequest(BaseModel):
+    horizon_days: int = Field(14, ge=1, le=365, description="Days to schedule")
+    window_days: int = Field(7, ge=1, le=60, description="Days each re-solve looks ahead")
+    commit_days: int = Field(1, ge=1, description="Days fixed per roll before re-solving")
+    start_date: Optional[date] = Field(None, description="Day 0 of the plan (default today)")
+    order_ids: Optional[List[int]] = Field(None, description="Orders to schedule (default: all pending)")
+    rakes_per_day: int = Field(4, ge=0, description="Rakes that can be loaded per day")
+    rake_capacity_tons: Optional[float] = Field(None, description="Tonnes per rake (default: fleet average)")
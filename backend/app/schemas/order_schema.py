@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 
 class OrderBase(BaseModel):
+    order_number: Optional[str] = Field(None, description="External order number")
     customer_name: str = Field(..., description="Customer name")
     customer_id: Optional[int] = Field(None, description="Customer ID")
     material: str = Field(..., description="Material type")
@@ -21,6 +22,7 @@ class OrderCreate(OrderBase):
     pass
 
 class OrderUpdate(BaseModel):
+    order_number: Optional[str] = None
     customer_name: Optional[str] = None
     customer_id: Optional[int] = None
     material: Optional[str] = None
@@ -34,9 +36,29 @@ class OrderUpdate(BaseModel):
     preferred_dispatch_date: Optional[str] = None
     latest_delivery_date: Optional[str] = None
     rake_id: Optional[int] = None
+    version: Optional[int] = Field(None, description="Expected current version; the update fails with 409 if the order changed since")
+
+class OrderBulkCreate(BaseModel):
+    # Rows are validated one by one so a bad row is reported instead of failing the batch
+    orders: List[Dict[str, Any]] = Field(..., description="Orders to create (OrderCreate fields)")
+
+class OrderBulkUpdate(BaseModel):
+    orders: List[Dict[str, Any]] = Field(..., description="Partial updates (OrderUpdate fields), each with the order 'id'")
+
+class OrderBulkDelete(BaseModel):
+    ids: List[int] = Field(..., description="IDs of the orders to delete")
+
+class OrderBulkRowResult(BaseModel):
+    index: int = Field(..., description="Position of the row in the request")
+    success: bool
+    id: Optional[int] = Field(None, description="Order ID")
+    order_number: Optional[str] = None
+    version: Optional[int] = Field(None, description="Order version after the write")
+    error: Optional[str] = None
 
 class OrderInDB(OrderBase):
     id: int
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -42,9 +42,24 @@ class RakeUpdate(BaseModel):
     arrival_time: Optional[datetime] = None
     freight_type: Optional[str] = None
     weight: Optional[float] = None
+    version: Optional[int] = Field(None, description="Expected current version; the update fails with 409 if the rake changed since")
+
+class RakeStatusChange(BaseModel):
+    rake_number: str = Field(..., description="Rake number")
+    status: Optional[str] = Field(None, description="New status (unchanged when omitted)")
+    current_location: Optional[str] = Field(None, description="New location (unchanged when omitted)")
+
+class RakeBulkStatusUpdate(BaseModel):
+    rakes: List[RakeStatusChange] = Field(..., description="Status/location changes keyed by rake number")
+
+class RakeStatusResult(BaseModel):
+    rake_number: str
+    id: Optional[int] = Field(None, description="Rake ID")
+    result: str = Field(..., description="updated, unchanged or not_found")
 
 class RakeInDB(RakeBase):
     id: int
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional
 import random
 from datetime import datetime
@@ -6,7 +6,7 @@ from datetime import datetime
 from app.schemas.report_schema import AIRecommendation
 
 def get_recommendations(
-    db: Session, 
+    db: AsyncSession, 
     category: Optional[str] = None, 
     limit: int = 10
 ) -> List[AIRecommendation]:
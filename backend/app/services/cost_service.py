@@ -1,24 +1,29 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.models.cost_parameters import CostParameter
 
-def get_all_cost_parameters(db: Session) -> List[CostParameter]:
+from app.services.reference_cache import cost_parameter_cache
+
+# Cost parameters are served from the process-local reference cache; the
+# database is only polled for changes (see ReferenceCache)
+
+async def get_all_cost_parameters(db: AsyncSession) -> List[Row]:
     """
-    Get all cost parameters from database
+    Get all cost parameters
     """
-    return db.query(CostParameter).all()
+    cache = await cost_parameter_cache.refresh_if_stale(db)
+    return cache.all()
 
-def get_cost_parameters_by_commodity(db: Session, commodity: str) -> List[CostParameter]:
+async def get_cost_parameters_by_commodity(db: AsyncSession, commodity: str) -> List[Row]:
     """
     Get cost parameters for a specific commodity
     """
-    return db.query(CostParameter).filter(CostParameter.commodity == commodity).all()
+    cache = await cost_parameter_cache.refresh_if_stale(db)
+    return cache.group("commodity", commodity)
 
-def get_cost_parameters_by_priority(db: Session, commodity: str, priority: str) -> Optional[CostParameter]:
+async def get_cost_parameters_by_priority(db: AsyncSession, commodity: str, priority: str) -> Optional[Row]:
     """
     Get cost parameters for a specific commodity and priority
     """
-    return db.query(CostParameter).filter(
-        CostParameter.commodity == commodity,
-        CostParameter.priority == priority
-    ).first()
+    cache = await cost_parameter_cache.refresh_if_stale(db)
+    return cache.get(commodity, priority)
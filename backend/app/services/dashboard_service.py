@@ -1,11 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional
 import random
 from datetime import datetime, timedelta
 
 from app.schemas.report_schema import MetricItem, ChartData
 
-def get_dashboard_metrics(db: Session) -> List[MetricItem]:
+async def get_dashboard_metrics(db: AsyncSession) -> List[MetricItem]:
     """
     Get key metrics for dashboard display from database
     """
@@ -15,18 +16,18 @@ def get_dashboard_metrics(db: Session) -> List[MetricItem]:
         from app.models.inventory import InventoryItem
 
         # Get total rakes count
-        total_rakes = db.query(Rake).count()
+        total_rakes = await db.scalar(select(func.count()).select_from(Rake))
 
         # Calculate rake utilization (rakes that are not "Available")
-        active_rakes = db.query(Rake).filter(Rake.status != "Available").count()
+        active_rakes = await db.scalar(select(func.count()).select_from(Rake).where(Rake.status != "Available"))
         utilization_rate = (active_rakes / total_rakes * 100) if total_rakes > 0 else 0
 
         # Get pending orders count
-        pending_orders = db.query(Order).filter(Order.status == "pending").count()
+        pending_orders = await db.scalar(select(func.count()).select_from(Order).where(Order.status == "pending"))
 
         # On-time delivery calculation (mock based on current data)
-        completed_orders = db.query(Order).filter(Order.status == "Dispatched").count()
-        total_processed = db.query(Order).filter(Order.status != "pending").count()
+        completed_orders = await db.scalar(select(func.count()).select_from(Order).where(Order.status == "Dispatched"))
+        total_processed = await db.scalar(select(func.count()).select_from(Order).where(Order.status != "pending"))
         on_time_delivery = (completed_orders / total_processed * 100) if total_processed > 0 else 92.0
 
         metrics = [
@@ -62,8 +63,8 @@ def get_dashboard_metrics(db: Session) -> List[MetricItem]:
         # Fallback to real database counts if possible
         print(f"Database metrics query failed: {e}")
         try:
-            total_rakes = db.query(Rake).count()
-            pending_orders = db.query(Order).filter(Order.status == "pending").count()
+            total_rakes = await db.scalar(select(func.count()).select_from(Rake))
+            pending_orders = await db.scalar(select(func.count()).select_from(Order).where(Order.status == "pending"))
 
             metrics = [
                 MetricItem(label="Total Rakes", value=total_rakes, change=5.5, trend="up"),
@@ -82,7 +83,7 @@ def get_dashboard_metrics(db: Session) -> List[MetricItem]:
 
         return metrics
 
-def get_dashboard_charts(db: Session) -> Dict[str, ChartData]:
+async def get_dashboard_charts(db: AsyncSession) -> Dict[str, ChartData]:
     """
     Get chart data for dashboard visualizations from database
     """
@@ -90,14 +91,13 @@ def get_dashboard_charts(db: Session) -> Dict[str, ChartData]:
         from app.models.rake import Rake
         from app.models.order import Order
         from app.models.inventory import Inventory, InventoryItem
-        from sqlalchemy import func
 
         # Generate dates for the last 7 days
         dates = [(datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7, 0, -1)]
 
         # Get rake utilization data (mock trend based on current data)
-        total_rakes = db.query(Rake).count()
-        active_rakes = db.query(Rake).filter(Rake.status != "Available").count()  # Any non-Available status
+        total_rakes = await db.scalar(select(func.count()).select_from(Rake))
+        active_rakes = await db.scalar(select(func.count()).select_from(Rake).where(Rake.status != "Available"))  # Any non-Available status
         current_utilization = (active_rakes / total_rakes * 100) if total_rakes > 0 else 0
 
         # Generate utilization trend (vary around current utilization)
@@ -109,7 +109,7 @@ def get_dashboard_charts(db: Session) -> Dict[str, ChartData]:
 
         # Get order completion data for dispatch volume
         # For now, use current pending orders to generate mock historical data
-        pending_orders = db.query(Order).filter(Order.status == "pending").count()
+        pending_orders = await db.scalar(select(func.count()).select_from(Order).where(Order.status == "pending"))
         avg_daily_orders = max(15, pending_orders // 7)  # Mock daily average
 
         dispatch_data = []
@@ -120,10 +120,12 @@ def get_dashboard_charts(db: Session) -> Dict[str, ChartData]:
         # Get material distribution from inventory
         try:
             # Try to get from InventoryItem (production inventory)
-            material_volume = db.query(
-                InventoryItem.product_name,
-                func.sum(InventoryItem.quantity).label('total_quantity')
-            ).group_by(InventoryItem.product_name).all()
+            material_volume = (await db.execute(
+                select(
+                    InventoryItem.product_name,
+                    func.sum(InventoryItem.quantity).label('total_quantity')
+                ).group_by(InventoryItem.product_name)
+            )).all()
 
             if material_volume:
                 # Use actual product data
@@ -131,10 +133,12 @@ def get_dashboard_charts(db: Session) -> Dict[str, ChartData]:
                 material_data = [float(item.total_quantity) for item in material_volume]
             else:
                 # Fallback to stockyards if no inventory items
-                stockyard_volume = db.query(
-                    Inventory.material,
-                    func.sum(Inventory.capacity).label('total_capacity')
-                ).group_by(Inventory.material).all()
+                stockyard_volume = (await db.execute(
+                    select(
+                        Inventory.material,
+                        func.sum(Inventory.capacity).label('total_capacity')
+                    ).group_by(Inventory.material)
+                )).all()
 
                 if stockyard_volume:
                     material_labels = [item.material for item in stockyard_volume if item.material]
@@ -1,62 +1,69 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime
 
 from app.models.inventory import Inventory
 from app.schemas.inventory_schema import InventoryCreate, InventoryUpdate
+from app.utils.pagination import keyset_page
+from app.utils.mutations import update_returning, delete_returning
 
-def get_stockyard(db: Session, stockyard_id: str):
+async def get_stockyard(db: AsyncSession, stockyard_id: str):
     """
     Get a stockyard by ID
     """
-    return db.query(Inventory).filter(Inventory.stockyard_id == stockyard_id).first()
+    result = await db.execute(select(Inventory).where(Inventory.stockyard_id == stockyard_id))
+    return result.scalars().first()
 
-def get_all_stockyards(
-    db: Session, 
+# Keyset pagination order for stockyard lists (the primary key)
+STOCKYARD_SORT_KEY = (Inventory.stockyard_id,)
+
+async def get_all_stockyards(
+    db: AsyncSession, 
     skip: int = 0, 
     limit: int = 100, 
-    material: Optional[str] = None
+    material: Optional[str] = None,
+    after: Optional[List[Any]] = None
 ):
     """
-    Get all stockyards with optional material filter
+    Get all stockyards with optional material filter, ordered by ID. Pass the
+    previous page's last stockyard ID as `after` to seek to the next page.
     """
-    query = db.query(Inventory)
+    query = select(Inventory)
     
     if material:
-        query = query.filter(Inventory.material == material)
+        query = query.where(Inventory.material == material)
+    
+    if skip and not after:
+        query = query.offset(skip)
     
-    return query.offset(skip).limit(limit).all()
+    query = keyset_page(query, STOCKYARD_SORT_KEY, after, limit, db.get_bind().dialect.name)
+    result = await db.execute(query)
+    return result.scalars().all()
 
-def create_stockyard(db: Session, stockyard: InventoryCreate):
+async def create_stockyard(db: AsyncSession, stockyard: InventoryCreate):
     """
     Create a new stockyard
     """
     db_stockyard = Inventory(**stockyard.dict())
     db.add(db_stockyard)
-    db.commit()
-    db.refresh(db_stockyard)
+    await db.commit()
+    await db.refresh(db_stockyard)
     return db_stockyard
 
-def update_stockyard(db: Session, stockyard_id: str, stockyard: InventoryUpdate):
+async def update_stockyard(db: AsyncSession, stockyard_id: str, stockyard: InventoryUpdate):
     """
-    Update an existing stockyard
+    Update an existing stockyard. Returns None if the stockyard doesn't exist.
     """
-    db_stockyard = get_stockyard(db, stockyard_id=stockyard_id)
-    
-    # Update stockyard fields
-    for key, value in stockyard.dict().items():
-        setattr(db_stockyard, key, value)
-    
-    db.commit()
-    db.refresh(db_stockyard)
+    db_stockyard = await update_returning(db, Inventory, Inventory.stockyard_id, stockyard_id, stockyard.dict(exclude_unset=True))
+    await db.commit()
     return db_stockyard
 
-def delete_stockyard(db: Session, stockyard_id: str):
+async def delete_stockyard(db: AsyncSession, stockyard_id: str):
     """
-    Delete a stockyard
+    Delete a stockyard. Returns None if the stockyard doesn't exist.
     """
-    db_stockyard = get_stockyard(db, stockyard_id=stockyard_id)
-    db.delete(db_stockyard)
-    db.commit()
-    return db_stockyard
\ No newline at end of file
+    db_stockyard = await delete_returning(db, Inventory, Inventory.stockyard_id, stockyard_id)
+    await db.commit()
+    return db_stockyard
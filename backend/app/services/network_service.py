@@ -0,0 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.ml.rail_network import RailNetwork
+from app.services.reference_cache import route_transport_cache
+
+# Network built from the route cache, rebuilt when the cache reloads
+_network: Dict[str, Any] = {"generation": None, "network": None}
+
+async def get_rail_network(db: AsyncSession) -> RailNetwork:
+    """
+    Get the rail network for the current route transport data. The graph
+    and its path cache are kept until route_transport_info changes.
+    """
+    cache = await route_transport_cache.refresh_if_stale(db)
+    if _network["network"] is None or _network["generation"] != cache.generation:
+        _network["network"] = RailNetwork.from_routes(cache.all(), path_cache_size=settings.RAIL_PATH_CACHE_SIZE)
+        _network["generation"] = cache.generation
+    return _network["network"]
+
+async def find_path(
+    db: AsyncSession,
+    origin: str,
+    destination: str,
+    metric: str = "distance",
+    min_capacity: float = 0
+) -> Optional[Dict[str, Any]]:
+    """
+    Best path between two stations, or None if they are not connected
+    """
+    network = await get_rail_network(db)
+    return network.shortest_path(origin, destination, metric=metric, min_capacity=min_capacity)
@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+import asyncio
+import hashlib
+import json
+
+from app.core.config import settings
+from app.schemas.optimize_schema import OptimizationRequest, OptimizationResult
+
+def _canonical(value: Any) -> Any:
+    """
+    Normalize a JSON-like value so equal inputs serialize identically
+    (numbers as floats: 100 and 100.0 are the same quantity)
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return str(value)
+
+def request_fingerprint(request: OptimizationRequest, reference: Optional[Dict[str, Optional[str]]] = None) -> str:
+    """
+    SHA-256 of a canonical form of an optimization request: orders sorted by
+    order ID, stockyards by stockyard ID, constraint keys sorted. reference
+    holds the signatures of the reference data the mode reads, so plans are
+    not reused after that data changes.
+    """
+    orders = sorted((_canonical(order.model_dump()) for order in request.orders), key=lambda order: json.dumps(order, sort_keys=True))
+    materials = sorted((_canonical(material.model_dump()) for material in request.materials), key=lambda material: json.dumps(material, sort_keys=True))
+    canonical = {
+        "mode": request.mode,
+        "orders": orders,
+        "materials": materials,
+        "constraints": _canonical(request.constraints or {}),
+        "reference": reference or {}
+    }
+    raw = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class OptimizationCache:
+    """
+    Process-local LRU of solved plans by request fingerprint, and the solves
+    in progress so concurrent identical requests wait for one solve instead
+    of starting their own
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = settings.OPTIMIZATION_CACHE_SIZE if max_size is None else max_size
+        self._entries: "OrderedDict[str, OptimizationResult]" = OrderedDict()
+        self._in_flight: Dict[str, "asyncio.Future[OptimizationResult]"] = {}
+        self._stats = {"hits": 0, "misses": 0, "shared": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[OptimizationResult]:
+        result = self._entries.get(key)
+        if result is None:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return result
+
+    def put(self, key: str, result: OptimizationResult):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def share(self, key: str, solve: Callable[[], Awaitable[OptimizationResult]]) -> OptimizationResult:
+        """
+        Run solve() unless the same key is already being solved, in which
+        case wait for that result. The solve is shielded: a caller that goes
+        away doesn't cancel it for the others.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._stats["shared"] += 1
+            result = await asyncio.shield(task)
+            return result.model_copy(update={"cached": True})
+
+        task = asyncio.ensure_future(solve())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def discard(self, keys: Iterable[str]) -> int:
+        """
+        Drop the entries for these keys. Returns how many were cached.
+        """
+        return sum(1 for key in set(keys) if self._entries.pop(key, None) is not None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "in_flight": len(self._in_flight),
+            **self._stats
+        }
+
+optimization_cache = OptimizationCache()
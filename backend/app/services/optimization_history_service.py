@@ -0,0 +1,296 @@
+from sqlalchemy import select, insert, update, delete, func, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Any
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from app.schemas.optimize_schema import OptimizationResult, AllocationItem, OptimizationSummary, OptimizationHistoryItem
+from app.models.optimization import OptimizationResult as OptimizationResultModel, OptimizationAllocation
+from app.services.optimization_cache import optimization_cache
+from app.utils.pagination import keyset_page
+
+# History is listed newest first by this key (ix_optimization_results_timestamp)
+HISTORY_SORT_KEY = (OptimizationResultModel.timestamp, OptimizationResultModel.task_id)
+
+# Columns returned by the history list without details: the plan JSON and
+# allocations are never read for them
+SUMMARY_COLUMNS = (
+    OptimizationResultModel.task_id,
+    OptimizationResultModel.timestamp,
+    OptimizationResultModel.mode,
+    OptimizationResultModel.status,
+    OptimizationResultModel.total_cost,
+    OptimizationResultModel.iteration,
+    OptimizationResultModel.num_orders,
+    OptimizationResultModel.num_stockyards,
+    OptimizationResultModel.num_allocations,
+    OptimizationResultModel.error_message,
+    OptimizationResultModel.request_hash,
+    OptimizationResultModel.compacted_at,
+)
+
+# Task IDs per IN (...) query when loading or deleting plan details
+TASK_CHUNK_SIZE = 500
+
+def allocation_items(allocations: List[Dict[str, Any]]) -> List[AllocationItem]:
+    """
+    API allocations from a solver's optimized_plan rows
+    """
+    return [
+        AllocationItem(
+            order_id=allocation["order_id"],
+            from_stockyard=allocation["from"],
+            destination=allocation.get("destination"),
+            quantity=allocation["quantity"],
+            origin_station=allocation.get("origin_station")
+        )
+        for allocation in allocations
+    ]
+
+def plan_result(
+    task_id: str,
+    plan: Dict[str, Any],
+    allocations: List[AllocationItem],
+    total_cost: float,
+    timestamp: datetime,
+    mode: str,
+    cached: bool = False
+) -> OptimizationResult:
+    """
+    API result from a plan's allocations and its solver extras (optimization_results.plan)
+    """
+    plan = plan or {}
+    return OptimizationResult(
+        task_id=task_id,
+        optimized_plan=allocations,
+        total_cost=total_cost,
+        timestamp=timestamp,
+        mode=mode,
+        corridor_utilization=plan.get("corridor_utilization"),
+        unfulfilled=plan.get("unfulfilled"),
+        cached=cached
+    )
+
+async def store_plan(
+    db: AsyncSession,
+    task_id: str,
+    result: Dict[str, Any],
+    mode: str,
+    fingerprint: Optional[str],
+    num_orders: int,
+    num_stockyards: int
+):
+    """
+    Store a solver result: one summary row in optimization_results (with the
+    solver extras as its plan JSON) and its allocations in
+    optimization_allocations. The iteration counts earlier solves of the
+    same request fingerprint.
+    """
+    succeeded = result.get("status") == "success"
+    allocations = result.get("optimized_plan") or []
+
+    iteration = 1
+    if fingerprint:
+        earlier = await db.execute(
+            select(func.count()).select_from(OptimizationResultModel).where(OptimizationResultModel.request_hash == fingerprint)
+        )
+        iteration += earlier.scalar() or 0
+
+    db.add(OptimizationResultModel(
+        task_id=task_id,
+        rake_id=None,  # To be assigned later if needed
+        plan={key: value for key, value in result.items() if key != "optimized_plan"},
+        total_cost=result["total_cost"],
+        iteration=iteration,
+        num_orders=num_orders,
+        num_stockyards=num_stockyards,
+        num_allocations=len(allocations),
+        mode=mode,
+        status="Completed" if succeeded else "Failed",
+        error_message=result.get("error"),
+        request_hash=fingerprint
+    ))
+    await db.flush()
+    if allocations:
+        await db.execute(insert(OptimizationAllocation), [
+            {
+                "task_id": task_id,
+                "order_id": allocation["order_id"],
+                "from_stockyard": allocation["from"],
+                "origin_station": allocation.get("origin_station"),
+                "destination": allocation.get("destination"),
+                "quantity": allocation["quantity"]
+            }
+            for allocation in allocations
+        ])
+    await db.commit()
+
+async def load_allocations(db: AsyncSession, task_ids: List[str]) -> Dict[str, List[AllocationItem]]:
+    """
+    Stored allocations per task, in plan order
+    """
+    by_task: Dict[str, List[AllocationItem]] = defaultdict(list)
+    for start in range(0, len(task_ids), TASK_CHUNK_SIZE):
+        chunk = task_ids[start:start + TASK_CHUNK_SIZE]
+        rows = await db.execute(
+            select(OptimizationAllocation)
+            .where(OptimizationAllocation.task_id.in_(chunk))
+            .order_by(OptimizationAllocation.id)
+        )
+        for row in rows.scalars():
+            by_task[row.task_id].append(AllocationItem(
+                order_id=row.order_id,
+                from_stockyard=row.from_stockyard,
+                destination=row.destination,
+                quantity=row.quantity,
+                origin_station=row.origin_station
+            ))
+    return by_task
+
+async def find_plan_by_fingerprint(db: AsyncSession, fingerprint: str) -> Optional[OptimizationResult]:
+    """
+    Latest completed, uncompacted plan stored for a request fingerprint
+    """
+    query = (
+        select(OptimizationResultModel)
+        .where(
+            OptimizationResultModel.request_hash == fingerprint,
+            OptimizationResultModel.status == "Completed",
+            OptimizationResultModel.compacted_at.is_(None)
+        )
+        .order_by(OptimizationResultModel.timestamp.desc())
+        .limit(1)
+    )
+    stored = (await db.execute(query)).scalars().first()
+    if stored is None:
+        return None
+    allocations = (await load_allocations(db, [stored.task_id])).get(stored.task_id, [])
+    return plan_result(stored.task_id, stored.plan, allocations, stored.total_cost, stored.timestamp, stored.mode or "cost", cached=True)
+
+def _history_item(row: Any, allocations: List[AllocationItem]) -> OptimizationHistoryItem:
+    plan = row.plan or {}
+    return OptimizationHistoryItem.model_validate(row).model_copy(update={
+        "optimized_plan": allocations,
+        "corridor_utilization": plan.get("corridor_utilization"),
+        "unfulfilled": plan.get("unfulfilled"),
+        "timings": plan.get("timings")
+    })
+
+async def get_plan_history(
+    db: AsyncSession,
+    limit: int = 50,
+    status: Optional[str] = None,
+    mode: Optional[str] = None,
+    request_hash: Optional[str] = None,
+    after: Optional[List[Any]] = None,
+    include_details: bool = False
+) -> List[OptimizationSummary]:
+    """
+    Stored plans, newest first. Only the summary columns are read unless
+    include_details, which adds each plan's allocations and solver extras.
+    Pass the sort key of the previous page's last plan as `after` to seek
+    to the next page.
+    """
+    columns = SUMMARY_COLUMNS + ((OptimizationResultModel.plan,) if include_details else ())
+    query = select(*columns)
+    if status:
+        query = query.where(OptimizationResultModel.status == status)
+    if mode:
+        query = query.where(OptimizationResultModel.mode == mode)
+    if request_hash:
+        query = query.where(OptimizationResultModel.request_hash == request_hash)
+
+    query = keyset_page(query, HISTORY_SORT_KEY, after, limit, db.get_bind().dialect.name, descending=True)
+    rows = (await db.execute(query)).all()
+    if not include_details:
+        return [OptimizationSummary.model_validate(row) for row in rows]
+
+    allocations = await load_allocations(db, [row.task_id for row in rows])
+    return [_history_item(row, allocations.get(row.task_id, [])) for row in rows]
+
+async def get_plan_details(db: AsyncSession, task_id: str) -> Optional[OptimizationHistoryItem]:
+    """
+    One stored plan with its allocations and solver extras
+    """
+    row = (await db.execute(
+        select(*SUMMARY_COLUMNS, OptimizationResultModel.plan).where(OptimizationResultModel.task_id == task_id)
+    )).first()
+    if row is None:
+        return None
+    allocations = await load_allocations(db, [task_id])
+    return _history_item(row, allocations.get(task_id, []))
+
+async def _delete_plans(db: AsyncSession, task_ids: List[str]) -> int:
+    """
+    Delete plans and their allocations. Returns the number of allocations removed.
+    """
+    removed = 0
+    for start in range(0, len(task_ids), TASK_CHUNK_SIZE):
+        chunk = task_ids[start:start + TASK_CHUNK_SIZE]
+        result = await db.execute(delete(OptimizationAllocation).where(OptimizationAllocation.task_id.in_(chunk)))
+        removed += result.rowcount or 0
+        await db.execute(
+            delete(OptimizationResultModel).where(OptimizationResultModel.task_id.in_(chunk)),
+            execution_options={"synchronize_session": False}
+        )
+    return removed
+
+async def compact_plan_history(db: AsyncSession, compact_after_days: int, retention_days: int) -> Dict[str, int]:
+    """
+    Apply the plan retention policy, in one transaction:
+
+    1. Plans older than retention_days are deleted (retention_days <= 0 keeps them).
+    2. Plans older than compact_after_days that a newer solve of the same
+       request has superseded are deleted.
+    3. The remaining plans older than compact_after_days lose their
+       allocations and solver extras; the summary row stays in the history.
+
+    Returns how many plans were deleted, superseded and compacted, and the
+    number of allocation rows removed. The fingerprints of those plans are
+    evicted from this worker's optimization cache so they aren't served again.
+    """
+    now = datetime.now(timezone.utc)
+    Plan = OptimizationResultModel
+    counts = {"deleted": 0, "superseded": 0, "compacted": 0, "allocations_removed": 0}
+    fingerprints = set()
+
+    if retention_days > 0:
+        expired = (await db.execute(
+            select(Plan.task_id, Plan.request_hash).where(Plan.timestamp < now - timedelta(days=retention_days))
+        )).all()
+        counts["deleted"] = len(expired)
+        counts["allocations_removed"] += await _delete_plans(db, [row.task_id for row in expired])
+        fingerprints.update(row.request_hash for row in expired)
+
+    cutoff = now - timedelta(days=compact_after_days)
+    newer = aliased(OptimizationResultModel)
+    superseded = (await db.execute(
+        select(Plan.task_id, Plan.request_hash).where(
+            Plan.timestamp < cutoff,
+            Plan.request_hash.is_not(None),
+            exists().where(newer.request_hash == Plan.request_hash, newer.timestamp > Plan.timestamp)
+        )
+    )).all()
+    counts["superseded"] = len(superseded)
+    counts["allocations_removed"] += await _delete_plans(db, [row.task_id for row in superseded])
+    fingerprints.update(row.request_hash for row in superseded)
+
+    stale_rows = (await db.execute(
+        select(Plan.task_id, Plan.request_hash).where(Plan.timestamp < cutoff, Plan.compacted_at.is_(None))
+    )).all()
+    stale = [row.task_id for row in stale_rows]
+    fingerprints.update(row.request_hash for row in stale_rows)
+    for start in range(0, len(stale), TASK_CHUNK_SIZE):
+        chunk = stale[start:start + TASK_CHUNK_SIZE]
+        result = await db.execute(delete(OptimizationAllocation).where(OptimizationAllocation.task_id.in_(chunk)))
+        counts["allocations_removed"] += result.rowcount or 0
+        await db.execute(
+            update(Plan).where(Plan.task_id.in_(chunk)).values(plan=None, compacted_at=now),
+            execution_options={"synchronize_session": False}
+        )
+    counts["compacted"] = len(stale)
+
+    await db.commit()
+    optimization_cache.discard(fingerprint for fingerprint in fingerprints if fingerprint)
+    return counts
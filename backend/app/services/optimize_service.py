@@ -1,55 +1,315 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional, Dict, Any, Callable, Awaitable, Tuple
 import uuid
-from datetime import datetime
+import time
+from datetime import datetime, date
 
-from app.schemas.optimize_schema import OptimizationRequest, OptimizationResult, AllocationItem
-from app.models.optimization import OptimizationResult as OptimizationResultModel
-from app.ml.rake_optimizer import optimize_rakes
+from app.core.database import AsyncSessionLocal
+from app.core.config import settings
+from app.schemas.optimize_schema import OptimizationRequest, OptimizationResult, RollingPlanRequest, SensitivityRequest, ScenarioBatchRequest
+from app.models.order import Order
+from app.models.inventory import InventoryItem
+from app.models.rake import Rake
+from app.ml.rake_optimizer import optimize_rakes, analyze_sensitivity
+from app.ml.flow_optimizer import optimize_flow
+from app.ml.rolling_planner import RollingPlanner
+from app.ml.heuristic_allocator import allocate_heuristic, build_unit_costs
+from app.ml.scenario_runner import SCENARIO_SOLVERS, prepare_shared, evaluate_scenarios
+from app.ml.cost_model import cost_model
+from app.services.network_service import get_rail_network
+from app.services.reference_cache import cost_parameter_cache, route_transport_cache
+from app.services.optimization_cache import optimization_cache, request_fingerprint
+from app.services.optimization_history_service import store_plan, find_plan_by_fingerprint, allocation_items, plan_result
+from app.utils.helpers import parse_timestamp
 
-def optimize_rake_allocation(db: Session, request: OptimizationRequest) -> OptimizationResult:
+# Order priorities mapped to the cost parameter priority levels
+COST_PRIORITY = {"urgent": "High", "high": "High", "normal": "Medium", "low": "Low"}
+
+async def _run_cost_optimizer(db: AsyncSession, materials: List[Dict], orders: List[Dict], constraints: Dict) -> Dict[str, Any]:
+    return await run_in_threadpool(optimize_rakes, materials, orders, constraints)
+
+async def _with_freight_rate(db: AsyncSession, constraints: Dict) -> Dict:
     """
-    Run the optimization algorithm for rake allocation
+    Constraints with the default freight rate (mean of the cost parameters) filled in
+    """
+    if not constraints.get("cost_per_tonne_km"):
+        cost_parameters = (await cost_parameter_cache.refresh_if_stale(db)).all()
+        if cost_parameters:
+            rates = [row.cost_per_tonne_km for row in cost_parameters]
+            constraints = {**constraints, "cost_per_tonne_km": sum(rates) / len(rates)}
+    return constraints
+
+async def _run_flow_optimizer(db: AsyncSession, materials: List[Dict], orders: List[Dict], constraints: Dict) -> Dict[str, Any]:
+    network = await get_rail_network(db)
+    constraints = await _with_freight_rate(db, constraints)
+    return await run_in_threadpool(optimize_flow, materials, orders, network, constraints)
+
+async def _run_heuristic_optimizer(db: AsyncSession, materials: List[Dict], orders: List[Dict], constraints: Dict) -> Dict[str, Any]:
+    default_station = constraints.get("origin_station")
+    if not default_station and not any(stock.get("station") for stock in materials):
+        return await run_in_threadpool(allocate_heuristic, materials, orders, constraints)
+
+    # With loading stations known, unit costs include freight over the rail network
+    network = await get_rail_network(db)
+    constraints = await _with_freight_rate(db, constraints)
+    materials = [{**stock, "station": stock.get("station") or default_station} for stock in materials]
+
+    def distance(origin: str, destination: str) -> Optional[float]:
+        path = network.shortest_path(origin, destination)
+        return path["distance_km"] if path else None
+
+    def run() -> Dict[str, Any]:
+        unit_costs = build_unit_costs(materials, orders, distance, float(constraints.get("cost_per_tonne_km") or 0))
+        return allocate_heuristic(materials, orders, constraints, unit_costs)
+    return await run_in_threadpool(run)
+
+# Optimization modes: each runner gathers what its solver needs and runs it
+# off the event loop (the solvers are CPU-bound)
+SOLVERS: Dict[str, Callable[[AsyncSession, List[Dict], List[Dict], Dict], Awaitable[Dict[str, Any]]]] = {
+    "cost": _run_cost_optimizer,
+    "flow": _run_flow_optimizer,
+    "heuristic": _run_heuristic_optimizer,
+}
+
+# Reference data each mode reads besides the request: part of the request
+# fingerprint, so cached plans aren't reused after that data changes
+SOLVER_REFERENCE_DATA = {
+    "flow": (route_transport_cache, cost_parameter_cache),
+    "heuristic": (route_transport_cache, cost_parameter_cache),
+}
+
+async def _solve_and_store(db: AsyncSession, request: OptimizationRequest, fingerprint: str) -> Tuple[OptimizationResult, bool]:
+    """
+    Solve a request and store the plan. Returns the result and whether the solve succeeded.
     """
     # Extract orders and materials from request
     orders = [order.dict() for order in request.orders]
     materials = [material.dict() for material in request.materials]
     constraints = request.constraints or {}
-    
-    # Call ML optimization logic
-    result = optimize_rakes(materials, orders, constraints)
-    
+
+    result = await SOLVERS[request.mode](db, materials, orders, constraints)
+    result["mode"] = request.mode
+
     # Create task ID
     task_id = str(uuid.uuid4())
-    
-    # Convert to format expected by frontend
-    optimized_plan = []
-    for allocation in result["optimized_plan"]:
-        optimized_plan.append(
-            AllocationItem(
-                order_id=allocation["order_id"],
-                from_stockyard=allocation["from"],
-                destination=allocation["destination"],
-                quantity=allocation["quantity"]
-            )
-        )
-    
-    # Store optimization result in database
-    db_result = OptimizationResultModel(
-        task_id=task_id,
-        rake_id=None,  # To be assigned later if needed
-        plan=result,
-        total_cost=result["total_cost"],
-        num_orders=len(orders),
-        num_stockyards=len(materials)
+    await store_plan(db, task_id, result, request.mode, fingerprint, len(orders), len(materials))
+
+    allocations = allocation_items(result["optimized_plan"])
+    return plan_result(task_id, result, allocations, result["total_cost"], datetime.now(), request.mode), result.get("status") == "success"
+
+async def _lookup_or_solve(request: OptimizationRequest, fingerprint: str) -> OptimizationResult:
+    # Own session: the solve is shared with concurrent identical requests and
+    # must outlive the request that started it
+    async with AsyncSessionLocal() as db:
+        result = await find_plan_by_fingerprint(db, fingerprint)
+        succeeded = result is not None
+        if result is None:
+            result, succeeded = await _solve_and_store(db, request, fingerprint)
+    if succeeded:
+        optimization_cache.put(fingerprint, result.model_copy(update={"cached": True}))
+    return result
+
+async def optimize_rake_allocation(db: AsyncSession, request: OptimizationRequest) -> OptimizationResult:
+    """
+    Run the optimization algorithm for rake allocation. An identical request
+    (same orders, stockyards, constraints and mode, in any order) returns the
+    plan already solved, from memory or the optimization_results table, and
+    concurrent identical requests share one solve.
+
+    Raises:
+        ValueError: If the request names an unknown mode
+    """
+    if request.mode not in SOLVERS:
+        raise ValueError(f"Unknown optimization mode '{request.mode}', expected one of {', '.join(SOLVERS)}")
+
+    reference = {}
+    for cache in SOLVER_REFERENCE_DATA.get(request.mode, ()):
+        reference[cache.name] = (await cache.refresh_if_stale(db)).signature
+    fingerprint = request_fingerprint(request, reference)
+
+    if not request.use_cache:
+        result, _ = await _solve_and_store(db, request, fingerprint)
+        return result
+
+    cached = optimization_cache.get(fingerprint)
+    if cached is not None:
+        return cached
+    return await optimization_cache.share(fingerprint, lambda: _lookup_or_solve(request, fingerprint))
+
+async def analyze_allocation_sensitivity(request: SensitivityRequest) -> Dict[str, Any]:
+    """
+    Shadow prices, marginal order costs and reduced costs of the cost-mode
+    plan, with what-if changes priced from the same solve
+
+    Raises:
+        ValueError: If a what-if change is invalid or the model has no solution
+    """
+    orders = [order.dict() for order in request.orders]
+    materials = [material.dict() for material in request.materials]
+    what_if = [change.dict() for change in request.what_if]
+
+    analysis = await run_in_threadpool(
+        analyze_sensitivity, materials, orders, request.constraints or {},
+        what_if=what_if, max_reduced_costs=request.max_reduced_costs, verify=request.verify
+    )
+    if analysis.get("status") != "success":
+        raise ValueError(analysis.get("error") or "No optimal solution found")
+    return analysis
+
+async def evaluate_optimization_scenarios(db: AsyncSession, request: ScenarioBatchRequest) -> Dict[str, Any]:
+    """
+    Solve the base request and each of its scenarios (fuel factor, stockyard
+    outages, fulfillment level or other constraint changes) in parallel
+    worker processes and compare them. With loading stations known, freight
+    is priced in every mode per tonne-km at the cost model's base_rate times
+    the fuel factor (default: the cost model's fuel_factor), over rail
+    distances looked up once for the batch.
+
+    /rake/optimize prices freight differently (none in cost mode, the mean
+    cost parameter rate in heuristic mode), so the base row is flagged with
+    matches_live_plan = False whenever freight was priced.
+
+    Raises:
+        ValueError: If the mode has no matrix-based solver, scenario names
+            repeat or an outage names an unknown stockyard
+    """
+    base = request.base
+    if base.mode not in SCENARIO_SOLVERS:
+        raise ValueError(f"Scenario batches support the {', '.join(SCENARIO_SOLVERS)} modes, not '{base.mode}'")
+    names = ["base"] + [scenario.name for scenario in request.scenarios]
+    if len(set(names)) != len(names):
+        raise ValueError("Scenario names must be unique and not 'base'")
+    stockyard_ids = {material.stockyard_id for material in base.materials}
+    for scenario in request.scenarios:
+        unknown = [stockyard_id for stockyard_id in scenario.stockyard_outages if stockyard_id not in stockyard_ids]
+        if unknown:
+            raise ValueError(f"Scenario '{scenario.name}' names unknown stockyards: {', '.join(unknown)}")
+
+    constraints = base.constraints or {}
+    default_station = constraints.get("origin_station")
+    orders = [order.dict() for order in base.orders]
+    materials = [{**material.dict(), "station": material.station or default_station} for material in base.materials]
+    base_rate = float(cost_model.parameters["base_rate"])
+    fuel_factor = float(cost_model.parameters["fuel_factor"])
+
+    distance = None
+    if any(stock.get("station") for stock in materials):
+        network = await get_rail_network(db)
+
+        def distance(origin: str, destination: str) -> Optional[float]:
+            path = network.shortest_path(origin, destination)
+            return path["distance_km"] if path else None
+
+    scenarios = [{"name": "base", "include_plan": request.include_plans}] + [
+        {**scenario.dict(), "include_plan": request.include_plans} for scenario in request.scenarios
+    ]
+
+    def run():
+        shared = prepare_shared(materials, orders, constraints, base.mode, distance, base_rate, fuel_factor)
+        return evaluate_scenarios(shared, scenarios, settings.SCENARIO_WORKERS), bool(shared["freight_km"])
+
+    started = time.perf_counter()
+    (results, workers), freight_priced = await run_in_threadpool(run)
+
+    # Without freight the base is priced exactly as /rake/optimize prices it
+    results[0]["matches_live_plan"] = not freight_priced
+    base_cost = results[0]["total_cost"]
+    for row in results:
+        comparable = row["total_cost"] is not None and base_cost is not None
+        row["cost_change"] = row["total_cost"] - base_cost if comparable else None
+        row["cost_change_percent"] = (row["total_cost"] - base_cost) / base_cost * 100 if comparable and base_cost else None
+        if row["optimized_plan"] is not None:
+            row["optimized_plan"] = allocation_items(row["optimized_plan"])
+    solved = [row for row in results if row["total_cost"] is not None]
+
+    return {
+        "mode": base.mode,
+        "comparison": results,
+        "cheapest": min(solved, key=lambda row: row["total_cost"])["name"] if solved else None,
+        "pricing": {"base_rate": base_rate, "fuel_factor": fuel_factor},
+        "workers": workers,
+        "seconds": round(time.perf_counter() - started, 3)
+    }
+
+def _day_offset(value: Any, start: date) -> Optional[int]:
+    """
+    Days from the plan start to a date string or datetime (None if missing or unparseable)
+    """
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = parse_timestamp(str(value), "%Y-%m-%d")
+        except ValueError:
+            return None
+    return (value.date() - start).days
+
+async def plan_rolling_dispatch(db: AsyncSession, request: RollingPlanRequest) -> Dict[str, Any]:
+    """
+    Schedule pending orders day by day with the rolling-horizon planner.
+    Dispatch windows come from the orders' dates, delay penalties from the
+    cost parameters, transit times from the route data and supply from the
+    inventory items' stock and production.
+    """
+    start = request.start_date or date.today()
+
+    query = select(Order)
+    if request.order_ids:
+        query = query.where(Order.id.in_(request.order_ids))
+    else:
+        query = query.where(Order.status == "pending")
+    db_orders = (await db.execute(query)).scalars().all()
+
+    costs = await cost_parameter_cache.refresh_if_stale(db)
+    routes = await route_transport_cache.refresh_if_stale(db)
+
+    orders = []
+    for order in db_orders:
+        cost = costs.get(order.material, COST_PRIORITY.get((order.priority or "normal").lower(), "Medium"))
+        route = routes.get(order.origin_plant, order.destination)
+        if route is None:
+            # Orders name the plant, routes the station: take the quickest route into the destination
+            candidates = routes.group("destination", order.destination)
+            route = min(candidates, key=lambda row: row.transit_time_days + (row.expected_delays_days or 0), default=None)
+        orders.append({
+            "order_id": order.id,
+            "material": order.material,
+            "destination": order.destination,
+            "quantity": order.quantity,
+            "release_day": max(0, _day_offset(order.preferred_dispatch_date, start) or 0),
+            "due_day": _day_offset(order.latest_delivery_date, start),
+            "transit_days": route.transit_time_days + (route.expected_delays_days or 0) if route else 0,
+            "penalty_per_day": cost.penalty_per_day_delay * cost.priority_multiplier if cost else None
+        })
+
+    stock: Dict[str, float] = {}
+    production = []
+    for item in (await db.execute(select(InventoryItem))).scalars().all():
+        stock[item.product_name] = stock.get(item.product_name, 0.0) + item.quantity
+        if item.production_rate:
+            production.append({
+                "material": item.product_name,
+                "rate": item.production_rate,
+                "start_day": max(0, _day_offset(item.next_production_date, start) or 0)
+            })
+
+    rake_capacity = request.rake_capacity_tons
+    if rake_capacity is None:
+        rake_capacity = (await db.execute(select(func.avg(Rake.capacity_tons)))).scalar() or 0
+
+    planner = RollingPlanner(
+        orders,
+        stock,
+        production,
+        dispatch_capacity_per_day=request.rakes_per_day * rake_capacity,
+        horizon_days=request.horizon_days,
+        window_days=request.window_days,
+        commit_days=request.commit_days
     )
-    db.add(db_result)
-    db.commit()
-    
-    # Return result in format expected by API
-    return OptimizationResult(
-        task_id=task_id,
-        optimized_plan=optimized_plan,
-        total_cost=result["total_cost"],
-        timestamp=datetime.now()
-    )
\ No newline at end of file
+    result = await run_in_threadpool(planner.plan)
+
+    for day in result["days"]:
+        day["date"] = date.fromordinal(start.toordinal() + day["day"]).isoformat()
+    return {"start_date": start.isoformat(), "orders": len(orders), **result}
@@ -1,38 +1,55 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import ValidationError
+from typing import List, Optional, Dict, Any, Iterable
 import uuid
 from datetime import datetime
 
 from app.models.order import Order
-from app.schemas.order_schema import OrderCreate, OrderUpdate
+from app.models.rake import Rake
+from app.schemas.order_schema import OrderCreate, OrderUpdate, OrderBulkRowResult
+from app.utils.pagination import keyset_page
+from app.utils.mutations import update_returning, delete_returning
+from app.core.concurrency import VersionConflict, contention_metrics, retry_on_conflict
 
-def get_order(db: Session, order_id: str):
+async def get_order(db: AsyncSession, order_id: int):
     """
     Get an order by ID
     """
-    return db.query(Order).filter(Order.id == order_id).first()
+    result = await db.execute(select(Order).where(Order.id == order_id))
+    return result.scalars().first()
 
-def get_all_orders(
-    db: Session, 
+# Keyset pagination order for order lists (matches ix_orders_created_at_id)
+ORDER_SORT_KEY = (Order.created_at, Order.id)
+
+async def get_all_orders(
+    db: AsyncSession, 
     skip: int = 0, 
     limit: int = 100, 
     status: Optional[str] = None,
-    priority: Optional[int] = None
+    priority: Optional[str] = None,
+    after: Optional[List[Any]] = None
 ):
     """
-    Get all orders with optional filters
+    Get all orders with optional filters, oldest first. Pass the sort key
+    of the previous page's last order as `after` to seek to the next page.
     """
-    query = db.query(Order)
+    query = select(Order)
     
     if status:
-        query = query.filter(Order.status == status)
+        query = query.where(Order.status == status)
     
     if priority:
-        query = query.filter(Order.priority == priority)
+        query = query.where(Order.priority == priority)
+    
+    if skip and not after:
+        query = query.offset(skip)
     
-    return query.offset(skip).limit(limit).all()
+    query = keyset_page(query, ORDER_SORT_KEY, after, limit, db.get_bind().dialect.name)
+    result = await db.execute(query)
+    return result.scalars().all()
 
-def create_order(db: Session, order: OrderCreate):
+async def create_order(db: AsyncSession, order: OrderCreate):
     """
     Create a new order
     """
@@ -43,29 +60,212 @@ def create_order(db: Session, order: OrderCreate):
 
     db_order = Order(**order_dict)
     db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
+    await db.commit()
+    await db.refresh(db_order)
     return db_order
 
-def update_order(db: Session, order_id: str, order: OrderUpdate):
+async def update_order(db: AsyncSession, order_id: int, order: OrderUpdate):
     """
-    Update an existing order
+    Update an existing order. Returns None if the order doesn't exist.
+    When the client sends the version it read, the update only applies at
+    that version (VersionConflict otherwise).
     """
-    db_order = get_order(db, order_id=order_id)
-    
-    # Update order fields
-    for key, value in order.dict(exclude_unset=True).items():
-        setattr(db_order, key, value)
-    
-    db.commit()
-    db.refresh(db_order)
+    changes = order.dict(exclude_unset=True)
+    expected_version = changes.pop("version", None)
+    try:
+        db_order = await update_returning(db, Order, Order.id, order_id, changes, expected_version=expected_version)
+    except VersionConflict:
+        contention_metrics.record("order_update", "conflicts")
+        raise
+    finally:
+        contention_metrics.record("order_update", "attempts")
+    await db.commit()
     return db_order
 
-def delete_order(db: Session, order_id: str):
+async def delete_order(db: AsyncSession, order_id: int):
     """
-    Delete an order
+    Delete an order. Returns None if the order doesn't exist.
     """
-    db_order = get_order(db, order_id=order_id)
-    db.delete(db_order)
-    db.commit()
+    db_order = await delete_returning(db, Order, Order.id, order_id)
+    await db.commit()
     return db_order
+
+# Values per IN (...) lookup, well under SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+# Columns a bulk update may not set to NULL
+REQUIRED_ORDER_FIELDS = {column.key for column in Order.__table__.columns if not column.nullable and not column.primary_key}
+
+def _validation_message(error: ValidationError) -> str:
+    """
+    Flatten a pydantic validation error into one line for a per-row result
+    """
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors())
+
+async def _lookup(db: AsyncSession, key_column, value_column, keys: Iterable[Any]) -> Dict[Any, Any]:
+    """
+    Map each existing key to a value column, one query per chunk of keys
+    """
+    keys = list(keys)
+    found: Dict[Any, Any] = {}
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+        result = await db.execute(select(key_column, value_column).where(key_column.in_(chunk)))
+        found.update({key: value for key, value in result.all()})
+    return found
+
+async def bulk_create_orders(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[OrderBulkRowResult]:
+    """
+    Validate a batch of orders and insert the valid ones in one transaction
+    with a multi-row INSERT ... RETURNING. Invalid rows (schema errors,
+    duplicate order numbers, unknown rakes) are reported and skipped.
+    """
+    results: List[Optional[OrderBulkRowResult]] = [None] * len(rows)
+    candidates = []
+    batch_numbers: Dict[str, int] = {}
+
+    for index, row in enumerate(rows):
+        try:
+            values = OrderCreate.model_validate(row).model_dump()
+        except ValidationError as e:
+            results[index] = OrderBulkRowResult(index=index, success=False, error=_validation_message(e))
+            continue
+
+        number = values.get("order_number")
+        if number is not None:
+            if number in batch_numbers:
+                results[index] = OrderBulkRowResult(index=index, success=False, order_number=number, error=f"Duplicate order number (row {batch_numbers[number]})")
+                continue
+            batch_numbers[number] = index
+        candidates.append((index, values))
+
+    # Reference checks for the whole batch instead of per row
+    taken_numbers = await _lookup(db, Order.order_number, Order.id, batch_numbers.keys())
+    known_rakes = await _lookup(db, Rake.id, Rake.id, {values["rake_id"] for _, values in candidates if values["rake_id"] is not None})
+
+    to_insert = []
+    for index, values in candidates:
+        if values["order_number"] in taken_numbers:
+            results[index] = OrderBulkRowResult(index=index, success=False, order_number=values["order_number"], error="Order number already exists")
+        elif values["rake_id"] is not None and values["rake_id"] not in known_rakes:
+            results[index] = OrderBulkRowResult(index=index, success=False, order_number=values["order_number"], error=f"Rake {values['rake_id']} not found")
+        else:
+            to_insert.append((index, values))
+
+    if to_insert:
+        result = await db.execute(
+            insert(Order).returning(Order.id, sort_by_parameter_order=True),
+            [values for _, values in to_insert]
+        )
+        order_ids = result.scalars().all()
+        await db.commit()
+
+        for (index, values), order_id in zip(to_insert, order_ids):
+            results[index] = OrderBulkRowResult(index=index, success=True, id=order_id, order_number=values["order_number"])
+
+    return results
+
+async def bulk_update_orders(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[OrderBulkRowResult]:
+    """
+    Apply a batch of partial updates keyed by order ID in one transaction
+    (ORM bulk UPDATE by primary key). Only the fields given in a row are
+    changed; rows for unknown orders or with invalid values are reported and skipped.
+
+    Every row is written with WHERE version = :v, using the version sent in
+    the row or the one read during validation. If another writer changes an
+    order in between, the transaction is rolled back and the batch retried.
+    """
+    return await retry_on_conflict("order_bulk_update", lambda: _bulk_update_attempt(db, rows), on_conflict=db.rollback)
+
+async def _bulk_update_attempt(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[OrderBulkRowResult]:
+    results: List[Optional[OrderBulkRowResult]] = [None] * len(rows)
+    candidates = []
+    batch_ids: Dict[int, int] = {}
+
+    for index, row in enumerate(rows):
+        order_id = row.get("id")
+        if not isinstance(order_id, int) or isinstance(order_id, bool):
+            results[index] = OrderBulkRowResult(index=index, success=False, error="Missing or invalid 'id'")
+            continue
+        if order_id in batch_ids:
+            results[index] = OrderBulkRowResult(index=index, success=False, id=order_id, error=f"Duplicate order ID (row {batch_ids[order_id]})")
+            continue
+        batch_ids[order_id] = index
+
+        try:
+            changes = OrderUpdate.model_validate({key: value for key, value in row.items() if key != "id"}).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            results[index] = OrderBulkRowResult(index=index, success=False, id=order_id, error=_validation_message(e))
+            continue
+
+        expected_version = changes.pop("version", None)
+        nulls = sorted(key for key, value in changes.items() if value is None and key in REQUIRED_ORDER_FIELDS)
+        if nulls:
+            results[index] = OrderBulkRowResult(index=index, success=False, id=order_id, error=f"{', '.join(nulls)} cannot be null")
+        elif not changes:
+            results[index] = OrderBulkRowResult(index=index, success=False, id=order_id, error="No fields to update")
+        else:
+            candidates.append((index, order_id, changes, expected_version))
+
+    versions = await _lookup(db, Order.id, Order.version, [order_id for _, order_id, _, _ in candidates])
+    numbers = {changes["order_number"] for _, _, changes, _ in candidates if changes.get("order_number")}
+    number_owners = await _lookup(db, Order.order_number, Order.id, numbers)
+    known_rakes = await _lookup(db, Rake.id, Rake.id, {changes["rake_id"] for _, _, changes, _ in candidates if changes.get("rake_id") is not None})
+
+    to_update = []
+    for index, order_id, changes, expected_version in candidates:
+        number = changes.get("order_number")
+        rake_id = changes.get("rake_id")
+        if order_id not in versions:
+            results[index] = OrderBulkRowResult(index=index, success=False, id=order_id, error="Order not found")
+        elif expected_version is not None and expected_version != versions[order_id]:
+            results[index] = OrderBulkRowResult(index=index, success=False, id=order_id, version=versions[order_id], error=f"Version conflict (expected {expected_version}, found {versions[order_id]})")
+        elif number and number_owners.get(number, order_id) != order_id:
+            results[index] = OrderBulkRowResult(index=index, success=False, id=order_id, order_number=number, error="Order number already exists")
+        elif rake_id is not None and rake_id not in known_rakes:
+            results[index] = OrderBulkRowResult(index=index, success=False, id=order_id, error=f"Rake {rake_id} not found")
+        else:
+            to_update.append((index, order_id, changes, versions[order_id]))
+
+    if to_update:
+        # Rows with different sets of fields are grouped into one executemany per set.
+        # With the mapper's version_id_col the "version" key is the expected version:
+        # each row is updated WHERE version = :v and bumped, and StaleDataError is
+        # raised if any row no longer matches.
+        await db.execute(update(Order), [{"id": order_id, "version": version, **changes} for _, order_id, changes, version in to_update])
+        await db.commit()
+
+        for index, order_id, changes, version in to_update:
+            results[index] = OrderBulkRowResult(index=index, success=True, id=order_id, order_number=changes.get("order_number"), version=version + 1)
+
+    return results
+
+async def bulk_delete_orders(db: AsyncSession, order_ids: List[int]) -> List[OrderBulkRowResult]:
+    """
+    Delete a batch of orders by ID in one transaction with DELETE ... RETURNING.
+    An ID repeated in the batch is reported as a duplicate of its first row.
+    """
+    batch_ids: Dict[int, int] = {}
+    for index, order_id in enumerate(order_ids):
+        batch_ids.setdefault(order_id, index)
+
+    unique_ids = list(batch_ids)
+    deleted = set()
+    for start in range(0, len(unique_ids), LOOKUP_CHUNK_SIZE):
+        chunk = unique_ids[start:start + LOOKUP_CHUNK_SIZE]
+        result = await db.execute(
+            delete(Order).where(Order.id.in_(chunk)).returning(Order.id),
+            execution_options={"synchronize_session": False}
+        )
+        deleted.update(result.scalars().all())
+    await db.commit()
+
+    results = []
+    for index, order_id in enumerate(order_ids):
+        if batch_ids[order_id] != index:
+            results.append(OrderBulkRowResult(index=index, success=False, id=order_id, error=f"Duplicate order ID (row {batch_ids[order_id]})"))
+        elif order_id in deleted:
+            results.append(OrderBulkRowResult(index=index, success=True, id=order_id))
+        else:
+            results.append(OrderBulkRowResult(index=index, success=False, id=order_id, error="Order not found"))
+    return results
@@ -1,58 +1,204 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, bindparam, column, values, or_, func, String
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional, Dict, Any
 import uuid
+import io
 from datetime import datetime
 
+import pandas as pd
+
 from app.models.rake import Rake
-from app.schemas.rake_schema import RakeCreate, RakeUpdate
+from app.models.order import Order
+from app.schemas.rake_schema import RakeCreate, RakeUpdate, RakeStatusChange, RakeStatusResult
+from app.services.seed_service import SEED_TABLES, build_rake_frame, upsert_frame
 from app.schemas.optimize_schema import OptimizationRequest, OptimizationResult
 from app.ml.rake_optimizer import optimize_rakes
+from app.utils.pagination import keyset_page
+from app.utils.mutations import update_returning, delete_returning
+from app.core.concurrency import VersionConflict, contention_metrics
 
-def get_rake(db: Session, rake_id: str):
+async def get_rake(db: AsyncSession, rake_id: int):
     """
     Get a rake by ID
     """
-    return db.query(Rake).filter(Rake.id == rake_id).first()
+    result = await db.execute(select(Rake).where(Rake.id == rake_id))
+    return result.scalars().first()
+
+# Keyset pagination order for rake lists (matches ix_rakes_created_at_id)
+RAKE_SORT_KEY = (Rake.created_at, Rake.id)
 
-def get_all_rakes(db: Session, skip: int = 0, limit: int = 100, status: Optional[str] = None):
+async def get_all_rakes(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    after: Optional[List[Any]] = None
+):
     """
-    Get all rakes with optional status filter
+    Get all rakes with optional status filter, oldest first. Pass the sort key
+    of the previous page's last rake as `after` to seek to the next page.
     """
-    query = db.query(Rake)
+    query = select(Rake)
     if status:
-        query = query.filter(Rake.status == status)
+        query = query.where(Rake.status == status)
     
-    return query.offset(skip).limit(limit).all()
+    if skip and not after:
+        query = query.offset(skip)
+    
+    query = keyset_page(query, RAKE_SORT_KEY, after, limit, db.get_bind().dialect.name)
+    result = await db.execute(query)
+    return result.scalars().all()
 
-def create_rake(db: Session, rake: RakeCreate):
+async def create_rake(db: AsyncSession, rake: RakeCreate):
     """
     Create a new rake
     """
     db_rake = Rake(**rake.dict())
     db.add(db_rake)
-    db.commit()
-    db.refresh(db_rake)
+    await db.commit()
+    await db.refresh(db_rake)
     return db_rake
 
-def update_rake(db: Session, rake_id: str, rake: RakeUpdate):
+async def update_rake(db: AsyncSession, rake_id: int, rake: RakeUpdate):
     """
-    Update an existing rake
+    Update an existing rake. Only the fields the client sent are applied.
+    Returns None if the rake doesn't exist. When the client sends the version
+    it read, the update only applies at that version (VersionConflict otherwise).
     """
-    db_rake = get_rake(db, rake_id=rake_id)
-    
-    # Update rake fields
-    for key, value in rake.dict().items():
-        setattr(db_rake, key, value)
-    
-    db.commit()
-    db.refresh(db_rake)
+    changes = rake.dict(exclude_unset=True)
+    expected_version = changes.pop("version", None)
+    try:
+        db_rake = await update_returning(db, Rake, Rake.id, rake_id, changes, expected_version=expected_version)
+    except VersionConflict:
+        contention_metrics.record("rake_update", "conflicts")
+        raise
+    finally:
+        contention_metrics.record("rake_update", "attempts")
+    await db.commit()
     return db_rake
 
-def delete_rake(db: Session, rake_id: str):
+async def delete_rake(db: AsyncSession, rake_id: int):
     """
-    Delete a rake
+    Delete a rake, unassigning its orders first. Returns None if the rake doesn't exist.
     """
-    db_rake = get_rake(db, rake_id=rake_id)
-    db.delete(db_rake)
-    db.commit()
+    await db.execute(
+        update(Order).where(Order.rake_id == rake_id).values(rake_id=None, version=Order.version + 1),
+        execution_options={"synchronize_session": False}
+    )
+    db_rake = await delete_returning(db, Rake, Rake.id, rake_id)
+    if db_rake is None:
+        await db.rollback()
+        return None
+    await db.commit()
     return db_rake
+
+# Rows per UPDATE ... FROM (VALUES ...) statement (3 bound parameters per row)
+STATUS_UPDATE_CHUNK_SIZE = 1000
+
+async def _rakes_by_number(db: AsyncSession, rake_numbers: List[str]) -> Dict[str, Any]:
+    """
+    Current (id, status, current_location) of the given rakes, keyed by rake number
+    """
+    found: Dict[str, Any] = {}
+    for start in range(0, len(rake_numbers), STATUS_UPDATE_CHUNK_SIZE):
+        chunk = rake_numbers[start:start + STATUS_UPDATE_CHUNK_SIZE]
+        result = await db.execute(
+            select(Rake.rake_number, Rake.id, Rake.status, Rake.current_location).where(Rake.rake_number.in_(chunk))
+        )
+        found.update({row.rake_number: row for row in result.all()})
+    return found
+
+async def _apply_status_changes_from_values(db: AsyncSession, changes: List[RakeStatusChange]) -> Dict[str, int]:
+    """
+    PostgreSQL: one UPDATE ... FROM (VALUES ...) per chunk. Rows whose values
+    already match are filtered out with IS DISTINCT FROM, so they are not
+    written and keep their updated_at. Returns the IDs of the changed rakes.
+    """
+    changed: Dict[str, int] = {}
+    for start in range(0, len(changes), STATUS_UPDATE_CHUNK_SIZE):
+        chunk = changes[start:start + STATUS_UPDATE_CHUNK_SIZE]
+        incoming = values(
+            column("rake_number", String), column("status", String), column("current_location", String),
+            name="incoming"
+        ).data([(change.rake_number, change.status, change.current_location) for change in chunk])
+
+        new_status = func.coalesce(incoming.c.status, Rake.status)
+        new_location = func.coalesce(incoming.c.current_location, Rake.current_location)
+        stmt = (
+            update(Rake)
+            .where(Rake.rake_number == incoming.c.rake_number)
+            .where(or_(Rake.status.is_distinct_from(new_status), Rake.current_location.is_distinct_from(new_location)))
+            .values(status=new_status, current_location=new_location, version=Rake.version + 1)
+            .returning(Rake.rake_number, Rake.id)
+        )
+        result = await db.execute(stmt, execution_options={"synchronize_session": False})
+        changed.update({rake_number: rake_id for rake_number, rake_id in result.all()})
+    return changed
+
+async def _apply_status_changes_executemany(db: AsyncSession, changes: List[RakeStatusChange], current: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Other dialects (SQLite has no VALUES column aliases): compare against the
+    current rows and send only the changed ones as one executemany UPDATE
+    """
+    to_write = []
+    for change in changes:
+        row = current.get(change.rake_number)
+        if row is None:
+            continue
+        new_status = change.status if change.status is not None else row.status
+        new_location = change.current_location if change.current_location is not None else row.current_location
+        if (new_status, new_location) != (row.status, row.current_location):
+            to_write.append({"b_rake_number": change.rake_number, "b_status": new_status, "b_location": new_location})
+
+    if to_write:
+        rakes = Rake.__table__
+        stmt = (
+            update(rakes)
+            .where(rakes.c.rake_number == bindparam("b_rake_number"))
+            .values(status=bindparam("b_status"), current_location=bindparam("b_location"), version=rakes.c.version + 1)
+        )
+        await db.execute(stmt, to_write)
+    return {params["b_rake_number"]: current[params["b_rake_number"]].id for params in to_write}
+
+async def bulk_update_rake_status(db: AsyncSession, changes: List[RakeStatusChange]) -> List[RakeStatusResult]:
+    """
+    Apply a batch of status/location changes in one transaction. Omitted
+    fields are left as they are, and rakes whose values don't change are not
+    written (no updated_at bump). If a rake number repeats, the last change wins.
+    """
+    latest = list({change.rake_number: change for change in changes}.values())
+
+    if db.get_bind().dialect.name == "postgresql":
+        changed = await _apply_status_changes_from_values(db, latest)
+        # Only the rows that weren't written need a lookup to tell unchanged from unknown
+        current = await _rakes_by_number(db, [change.rake_number for change in latest if change.rake_number not in changed])
+    else:
+        current = await _rakes_by_number(db, [change.rake_number for change in latest])
+        changed = await _apply_status_changes_executemany(db, latest, current)
+    await db.commit()
+
+    results = []
+    for change in latest:
+        if change.rake_number in changed:
+            results.append(RakeStatusResult(rake_number=change.rake_number, id=changed[change.rake_number], result="updated"))
+        elif change.rake_number in current:
+            results.append(RakeStatusResult(rake_number=change.rake_number, id=current[change.rake_number].id, result="unchanged"))
+        else:
+            results.append(RakeStatusResult(rake_number=change.rake_number, result="not_found"))
+    return results
+
+async def import_rakes(db: AsyncSession, content: bytes) -> int:
+    """
+    Upsert a fleet file (rake wagon details CSV format) on rake number, with
+    the same column mapping and preserved columns as the seed loader.
+    Returns the number of rows written.
+    """
+    spec = next(seed_table for seed_table in SEED_TABLES if seed_table.name == "rakes")
+    frame = await run_in_threadpool(lambda: build_rake_frame(pd.read_csv(io.BytesIO(content))))
+
+    written = await db.run_sync(
+        lambda session: upsert_frame(session.connection(), spec.table, frame, spec.key_columns, spec.preserve_columns)
+    )
+    await db.commit()
+    return written
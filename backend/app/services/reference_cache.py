@@ -0,0 +1,178 @@
+from sqlalchemy import Table, select, func
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.models.cost_parameters import CostParameter
+from app.models.route_transport import RouteTransport
+from app.models.seed_manifest import SeedManifest
+
+logger = logging.getLogger(__name__)
+
+class ReferenceCache:
+    """
+    Process-local snapshot of a small, rarely changing reference table,
+    held in dicts for O(1) lookups without database I/O.
+
+    The table's signature (row count, max ID and its seed manifest entry)
+    is polled at most once per poll interval; the table is only reloaded
+    when the signature changed. invalidate() forces a reload on next use.
+    Rows are immutable result rows (attribute access, no session attached).
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        key_columns: Sequence[str],
+        group_columns: Sequence[str] = (),
+        poll_interval: Optional[float] = None
+    ):
+        self.table = table
+        self.key_columns = tuple(key_columns)
+        self.group_columns = tuple(group_columns)
+        self.poll_interval = settings.REFERENCE_CACHE_POLL_SECONDS if poll_interval is None else poll_interval
+
+        self._rows: List[Row] = []
+        self._by_key: Dict[Tuple[Any, ...], Row] = {}
+        self._groups: Dict[str, Dict[Any, List[Row]]] = {}
+        self._signature: Optional[Tuple[Any, ...]] = None
+        self._checked_at = 0.0
+        self._loaded_at: Optional[datetime] = None
+        self._stale = True
+        self._lock: Optional[asyncio.Lock] = None
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "polls": 0}
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    @property
+    def generation(self) -> int:
+        """
+        Number of loads so far; changes whenever the snapshot is replaced, so
+        data derived from the rows can be rebuilt only when needed
+        """
+        return self._stats["loads"]
+
+    @property
+    def signature(self) -> Optional[str]:
+        """
+        Signature of the loaded snapshot (row count, max ID, seed manifest
+        entry), the same in every process looking at the same data
+        """
+        return None if self._signature is None else "|".join(str(value) for value in self._signature)
+
+    def _signature_query(self):
+        manifest = SeedManifest.__table__
+        seeded = manifest.c.table_name == self.name
+        return select(
+            select(func.count()).select_from(self.table).scalar_subquery(),
+            select(func.max(self.table.c.id)).scalar_subquery(),
+            select(func.max(manifest.c.content_hash)).where(seeded).scalar_subquery(),
+            select(func.max(manifest.c.seeded_at)).where(seeded).scalar_subquery()
+        )
+
+    def _needs_poll(self) -> bool:
+        return self._stale or time.monotonic() - self._checked_at >= self.poll_interval
+
+    async def refresh_if_stale(self, db: AsyncSession) -> "ReferenceCache":
+        """
+        Poll the signature if the poll interval has passed (or the cache was
+        invalidated) and reload the table if it changed. Returns the cache.
+        """
+        if not self._needs_poll():
+            return self
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another request may have refreshed while this one waited
+            if not self._needs_poll():
+                return self
+
+            self._stats["polls"] += 1
+            signature = tuple((await db.execute(self._signature_query())).one())
+            if self._stale or signature != self._signature:
+                await self._load(db)
+                self._signature = signature
+            self._checked_at = time.monotonic()
+            self._stale = False
+        return self
+
+    async def _load(self, db: AsyncSession):
+        rows = (await db.execute(select(*self.table.columns))).all()
+
+        by_key = {tuple(getattr(row, column) for column in self.key_columns): row for row in rows}
+        groups: Dict[str, Dict[Any, List[Row]]] = {column: {} for column in self.group_columns}
+        for row in rows:
+            for column in self.group_columns:
+                groups[column].setdefault(getattr(row, column), []).append(row)
+
+        # Swap the snapshot in one step so lookups never see a partial load
+        self._rows, self._by_key, self._groups = rows, by_key, groups
+        self._loaded_at = datetime.now(timezone.utc)
+        self._stats["loads"] += 1
+        logger.info(f"Reference cache '{self.name}' loaded {len(rows)} rows")
+
+    def get(self, *key: Any) -> Optional[Row]:
+        """
+        Look up the row with the given key column values
+        """
+        row = self._by_key.get(key)
+        self._stats["hits" if row is not None else "misses"] += 1
+        return row
+
+    def group(self, column: str, value: Any) -> List[Row]:
+        """
+        All rows where a grouped column has the given value
+        """
+        return self._groups[column].get(value, [])
+
+    def all(self) -> List[Row]:
+        """
+        All rows in the snapshot
+        """
+        return self._rows
+
+    def invalidate(self):
+        """
+        Force a reload on the next lookup (after writes made by this process)
+        """
+        self._stale = True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get snapshot size, load time and lookup counters
+        """
+        return {
+            "rows": len(self._rows),
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "poll_interval_seconds": self.poll_interval,
+            "stale": self._stale,
+            **self._stats
+        }
+
+cost_parameter_cache = ReferenceCache(
+    CostParameter.__table__, key_columns=("commodity", "priority"), group_columns=("commodity",)
+)
+route_transport_cache = ReferenceCache(
+    RouteTransport.__table__, key_columns=("origin", "destination"), group_columns=("origin", "destination")
+)
+
+# Caches by table name, for invalidation and metrics
+reference_caches: Dict[str, ReferenceCache] = {
+    cache.name: cache for cache in (cost_parameter_cache, route_transport_cache)
+}
+
+def invalidate_reference_caches(table_names: Optional[Sequence[str]] = None):
+    """
+    Invalidate the caches of the given tables (all caches by default)
+    """
+    for name, cache in reference_caches.items():
+        if table_names is None or name in table_names:
+            cache.invalidate()
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, date, timedelta
@@ -6,7 +6,7 @@ import random
 
 from app.schemas.report_schema import DailyReport, MetricItem, ChartData
 
-def get_daily_summary(db: Session, date_from: date, date_to: date) -> DailyReport:
+def get_daily_summary(db: AsyncSession, date_from: date, date_to: date) -> DailyReport:
     """
     Generate a daily summary report with metrics, charts, and recommendations
     """
@@ -92,7 +92,7 @@ def get_daily_summary(db: Session, date_from: date, date_to: date) -> DailyRepor
     )
 
 def get_custom_report(
-    db: Session, 
+    db: AsyncSession, 
     report_type: str,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
@@ -113,7 +113,7 @@ def get_custom_report(
     }
 
 def export_report_to_pdf(
-    db: Session, 
+    db: AsyncSession, 
     report_type: str,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None
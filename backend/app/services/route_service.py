@@ -1,30 +1,36 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.models.route_transport import RouteTransport
 
-def get_all_route_transport(db: Session) -> List[RouteTransport]:
+from app.services.reference_cache import route_transport_cache
+
+# Route transport info is served from the process-local reference cache; the
+# database is only polled for changes (see ReferenceCache)
+
+async def get_all_route_transport(db: AsyncSession) -> List[Row]:
     """
-    Get all route transport information from database
+    Get all route transport information
     """
-    return db.query(RouteTransport).all()
+    cache = await route_transport_cache.refresh_if_stale(db)
+    return cache.all()
 
-def get_route_transport_by_origin_destination(db: Session, origin: str, destination: str) -> Optional[RouteTransport]:
+async def get_route_transport_by_origin_destination(db: AsyncSession, origin: str, destination: str) -> Optional[Row]:
     """
     Get route transport information for specific origin and destination
     """
-    return db.query(RouteTransport).filter(
-        RouteTransport.origin == origin,
-        RouteTransport.destination == destination
-    ).first()
+    cache = await route_transport_cache.refresh_if_stale(db)
+    return cache.get(origin, destination)
 
-def get_routes_by_origin(db: Session, origin: str) -> List[RouteTransport]:
+async def get_routes_by_origin(db: AsyncSession, origin: str) -> List[Row]:
     """
     Get all routes originating from a specific location
     """
-    return db.query(RouteTransport).filter(RouteTransport.origin == origin).all()
+    cache = await route_transport_cache.refresh_if_stale(db)
+    return cache.group("origin", origin)
 
-def get_routes_by_destination(db: Session, destination: str) -> List[RouteTransport]:
+async def get_routes_by_destination(db: AsyncSession, destination: str) -> List[Row]:
     """
     Get all routes terminating at a specific destination
     """
-    return db.query(RouteTransport).filter(RouteTransport.destination == destination).all()
+    cache = await route_transport_cache.refresh_if_stale(db)
+    return cache.group("destination", destination)
@@ -0,0 +1,579 @@
+from sqlalchemy import Table, select, update, func, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from typing import List, Optional, Dict, Any, Callable, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from app.core.database import engine
+from app.models.cost_parameters import CostParameter
+from app.models.route_transport import RouteTransport
+from app.models.inventory import InventoryItem
+from app.models.order import Order
+from app.models.rake import Rake
+from app.models.seed_manifest import SeedManifest
+from app.services.reference_cache import invalidate_reference_caches
+
+logger = logging.getLogger(__name__)
+
+# Rows per COPY chunk / INSERT batch
+SEED_CHUNK_SIZE = 10000
+
+# Tables seeded concurrently, each on its own pooled connection
+SEED_MAX_WORKERS = 4
+
+# Rows per INSERT ... ON CONFLICT batch
+UPSERT_CHUNK_SIZE = 1000
+
+# NULL marker used in COPY payloads
+COPY_NULL = "\\N"
+
+# Define the base path for static files
+STATIC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "statics")
+
+# In-memory registry of seeding jobs, keyed by job ID (in creation order)
+seed_jobs: Dict[str, Dict[str, Any]] = {}
+
+# Finished seeding jobs kept for status polling; older ones are dropped
+SEED_JOBS_KEPT = 20
+_seed_jobs_lock = threading.Lock()
+
+def _source_column(df: pd.DataFrame, names: Sequence[str]) -> Optional[pd.Series]:
+    """Return the first CSV column present among `names`"""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return None
+
+def _text(df: pd.DataFrame, names: Sequence[str], default: Optional[str], max_length: Optional[int] = None) -> pd.Series:
+    """Vectorized string column with a default for missing columns/values"""
+    source = _source_column(df, names)
+    if source is None:
+        return pd.Series([default] * len(df), index=df.index, dtype=object)
+    values = source.astype(str).str.strip()
+    if max_length:
+        values = values.str.slice(0, max_length)
+    return values.astype(object).where(source.notna(), default)
+
+def _number(df: pd.DataFrame, names: Sequence[str], default: Optional[float]) -> pd.Series:
+    """Vectorized numeric column with a default for missing columns/values"""
+    source = _source_column(df, names)
+    if source is None:
+        return pd.Series([default] * len(df), index=df.index, dtype=float)
+    values = pd.to_numeric(source, errors="coerce")
+    return values.fillna(default) if default is not None else values
+
+def _integer(df: pd.DataFrame, names: Sequence[str], default: Optional[int]) -> pd.Series:
+    """Vectorized nullable integer column"""
+    return _number(df, names, default).round().astype("Int64")
+
+def build_inventory_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Map production inventory CSV columns to the inventory_items table"""
+    return pd.DataFrame({
+        "plant_location": _text(df, ["plant_location"], "Plant A"),
+        "product_name": _text(df, ["product_name", "product"], "Steel Product"),
+        "material_grade": _text(df, ["material_grade"], "Grade A"),
+        "quantity": _number(df, ["quantity", "inventory_tonnes"], 1000),
+        "unit": _text(df, ["unit"], "tons"),
+        "storage_location": _text(df, ["storage_location"], "Storage A"),
+        "production_schedule_date": _text(df, ["production_schedule_date"], None),
+        "next_production_date": pd.Series([None] * len(df), index=df.index, dtype=object),
+        "production_rate": _number(df, ["production_rate"], None),
+    })
+
+def _order_number_for_key(key: str) -> str:
+    return "ORD-" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def _derived_order_numbers(df: pd.DataFrame) -> pd.Series:
+    """Deterministic order identity for CSVs without an order ID column"""
+    parts = [
+        _text(df, ["customer_name"], ""),
+        _text(df, ["material", "commodity", "product_name"], ""),
+        _text(df, ["destination"], ""),
+        _text(df, ["preferred_dispatch_date"], ""),
+    ]
+    keys = parts[0].str.cat(parts[1:], sep="|")
+    return keys.map(_order_number_for_key)
+
+def _stored_order_number(row: Any) -> str:
+    """_derived_order_numbers for a stored order (as backfilled by migration 0002)"""
+    parts = [row.customer_name, row.material, row.destination, row.preferred_dispatch_date]
+    return _order_number_for_key("|".join("" if part is None else str(part).strip() for part in parts))
+
+def claim_legacy_orders(connection: Connection, frame: pd.DataFrame) -> int:
+    """
+    Re-key orders stored before order numbers existed to the CSV order they
+    were seeded from, so the upsert updates them instead of inserting the
+    CSV again. Migration 0002 numbered such orders from their own content
+    (with a -2, -3, ... suffix on repeats). Each CSV order whose number isn't
+    stored yet claims the oldest such order with the same customer and
+    destination. Returns the number of orders re-keyed.
+    """
+    table = Order.__table__
+    numbers = list(dict.fromkeys(frame["order_number"].dropna()))
+    stored = set()
+    for start in range(0, len(numbers), UPSERT_CHUNK_SIZE):
+        chunk = numbers[start:start + UPSERT_CHUNK_SIZE]
+        stored.update(connection.execute(select(table.c.order_number).where(table.c.order_number.in_(chunk))).scalars())
+    if len(stored) == len(numbers):
+        return 0
+    seeded = set(numbers)
+
+    legacy: Dict[Tuple[str, str], List[int]] = {}
+    rows = connection.execute(
+        select(table.c.id, table.c.order_number, table.c.customer_name, table.c.material, table.c.destination, table.c.preferred_dispatch_date)
+        .where(table.c.order_number.like("ORD-%"))
+        .order_by(table.c.id)
+    )
+    for row in rows:
+        derived = _stored_order_number(row)
+        if row.order_number in seeded or not (row.order_number == derived or row.order_number.startswith(derived + "-")):
+            continue
+        key = (str(row.customer_name or "").strip(), str(row.destination or "").strip())
+        legacy.setdefault(key, []).append(row.id)
+
+    claims = []
+    for order in frame.drop_duplicates(subset=["order_number"]).itertuples():
+        if order.order_number in stored:
+            continue
+        candidates = legacy.get((str(order.customer_name or "").strip(), str(order.destination or "").strip()))
+        if candidates:
+            claims.append({"row_id": candidates.pop(0), "number": order.order_number})
+    if claims:
+        connection.execute(
+            update(table).where(table.c.id == bindparam("row_id")).values(order_number=bindparam("number")),
+            claims
+        )
+        logger.info(f"Re-keyed {len(claims)} legacy orders to their CSV order numbers")
+    return len(claims)
+
+def build_order_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Map customer orders CSV columns to the orders table"""
+    order_numbers = _text(df, ["order_number", "order_id"], None, 50)
+    return pd.DataFrame({
+        "order_number": order_numbers.where(order_numbers.notna(), _derived_order_numbers(df)),
+        "customer_name": _text(df, ["customer_name"], "Customer A", 100),
+        "customer_id": _integer(df, ["customer_id"], None),
+        "material": _text(df, ["material", "commodity", "product_name"], "Steel", 100),
+        "quantity": _number(df, ["quantity", "order_quantity_tonnes"], 500),
+        "unit": _text(df, ["unit"], "tons", 20),
+        "status": "pending",
+        "priority": "normal",
+        "origin_plant": _text(df, ["origin_plant"], "Plant A", 100),
+        "destination": _text(df, ["destination"], "Location A", 100),
+        "rate_per_ton": _number(df, ["rate_per_ton"], None),
+        "preferred_dispatch_date": _text(df, ["preferred_dispatch_date"], None),
+        "latest_delivery_date": _text(df, ["latest_delivery_date"], None),
+    })
+
+def build_rake_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Map rake wagon details CSV columns to the rakes table"""
+    default_numbers = pd.Series([f"RK{1000 + i}" for i in range(len(df))], index=df.index)
+    rake_numbers = _text(df, ["rake_number"], None, 50)
+    return pd.DataFrame({
+        "rake_number": rake_numbers.where(rake_numbers.notna(), default_numbers),
+        "origin_plant": _text(df, ["origin_plant"], "Plant A", 100),
+        "destination": _text(df, ["destination"], "Location B", 100),
+        "status": _text(df, ["status"], "Available", 50),
+        "capacity_tons": _number(df, ["capacity_tons"], 2000),
+        "total_wagons": _integer(df, ["total_wagons"], 20),
+        "priority": "normal",
+        "current_location": _text(df, ["current_location"], "At Plant", 100),
+        "last_maintenance_date": None,
+        "transit_progress": 0.0,
+    })
+
+def build_cost_parameter_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Map cost parameters CSV columns to the cost_parameters table"""
+    return pd.DataFrame({
+        "commodity": _text(df, ["commodity"], None),
+        "priority": _text(df, ["priority"], None),
+        "cost_per_tonne_km": _number(df, ["cost_per_tonne_km"], None),
+        "loading_cost_per_wagon": _number(df, ["loading_cost_per_wagon"], None),
+        "unloading_cost_per_wagon": _number(df, ["unloading_cost_per_wagon"], None),
+        "penalty_per_day_delay": _number(df, ["penalty_per_day_delay"], None),
+        "priority_multiplier": _number(df, ["priority_multiplier"], None),
+        "fuel_surcharge_per_wagon": _number(df, ["fuel_surcharge_per_wagon"], None),
+    })
+
+def build_route_transport_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Map route transport CSV columns to the route_transport_info table"""
+    return pd.DataFrame({
+        "origin": _text(df, ["origin"], None),
+        "destination": _text(df, ["destination"], None),
+        "distance_km": _number(df, ["distance_km"], None),
+        "transit_time_days": _integer(df, ["transit_time_days"], None),
+        "preferred_route": _text(df, ["preferred_route"], None),
+        "alternate_route": _text(df, ["alternate_route"], None),
+        "track_capacity_wagons_per_day": _integer(df, ["track_capacity_wagons_per_day"], None),
+        "route_constraints": _text(df, ["route_constraints"], None),
+        "expected_delays_days": _integer(df, ["expected_delays_days"], None),
+        "railway_zone": _text(df, ["railway_zone"], None),
+    })
+
+@dataclass
+class SeedTable:
+    """A table loaded from one CSV file in the statics folder"""
+    name: str
+    csv_file: str
+    table: Table
+    build_frame: Callable[[pd.DataFrame], pd.DataFrame]
+    # Natural key used to upsert re-seeded rows
+    key_columns: Tuple[str, ...]
+    # Operational columns that re-seeding must not overwrite on existing rows
+    preserve_columns: Tuple[str, ...] = field(default_factory=tuple)
+    # Seed tables that must be loaded first (foreign key parents)
+    depends_on: Tuple[str, ...] = field(default_factory=tuple)
+    # Run on populated tables before the upsert, with the frame to be upserted
+    before_upsert: Optional[Callable[[Connection, pd.DataFrame], Any]] = None
+
+# Tables seeded from the statics folder. Tables without dependencies are loaded concurrently.
+SEED_TABLES: List[SeedTable] = [
+    SeedTable("cost_parameters", "cost_parameters.csv", CostParameter.__table__, build_cost_parameter_frame,
+              key_columns=("commodity", "priority")),
+    SeedTable("route_transport_info", "route_transport_info_updated.csv", RouteTransport.__table__, build_route_transport_frame,
+              key_columns=("origin", "destination")),
+    SeedTable("inventory_items", "production_inventory.csv", InventoryItem.__table__, build_inventory_frame,
+              key_columns=("plant_location", "storage_location", "product_name", "material_grade")),
+    SeedTable("rakes", "rake_wagon_details.csv", Rake.__table__, build_rake_frame,
+              key_columns=("rake_number",), preserve_columns=("priority", "transit_progress")),
+    SeedTable("orders", "customer_orders.csv", Order.__table__, build_order_frame,
+              key_columns=("order_number",), preserve_columns=("status", "priority"), depends_on=("rakes",),
+              before_upsert=claim_legacy_orders),
+]
+
+def _frame_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a frame to insert parameters, mapping NaN/NA to None"""
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+def _copy_frame(connection: Connection, table: Table, frame: pd.DataFrame) -> None:
+    """Load a frame into a Postgres table with COPY FROM STDIN"""
+    preparer = connection.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(col) for col in frame.columns)
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+    buffer.seek(0)
+
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {preparer.format_table(table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+def bulk_load_frame(
+    connection: Connection,
+    table: Table,
+    frame: pd.DataFrame,
+    chunk_size: int = SEED_CHUNK_SIZE,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Bulk load a frame into a table: COPY on Postgres, batched executemany
+    inserts elsewhere (SQLite). Returns the number of rows loaded.
+    """
+    loaded = 0
+    for start in range(0, len(frame), chunk_size):
+        chunk = frame.iloc[start:start + chunk_size]
+        if connection.dialect.name == "postgresql":
+            _copy_frame(connection, table, chunk)
+        else:
+            connection.execute(table.insert(), _frame_records(chunk))
+        loaded += len(chunk)
+        if on_progress:
+            on_progress(len(chunk))
+    return loaded
+
+def _dialect_insert(connection: Connection, table: Table):
+    """INSERT construct supporting ON CONFLICT for the connection's dialect"""
+    if connection.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    if connection.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upsert is not supported on {connection.dialect.name}")
+
+def upsert_frame(
+    connection: Connection,
+    table: Table,
+    frame: pd.DataFrame,
+    key_columns: Sequence[str],
+    preserve_columns: Sequence[str] = (),
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Insert or update rows on their natural key with batched INSERT ... ON CONFLICT.
+    Returns the number of rows written.
+    """
+    # A batch may not touch the same key twice, keep the last occurrence
+    frame = frame.drop_duplicates(subset=list(key_columns), keep="last")
+
+    stmt = _dialect_insert(connection, table)
+    update_columns = {
+        col: stmt.excluded[col]
+        for col in frame.columns
+        if col not in key_columns and col not in preserve_columns
+    }
+    if "updated_at" in table.c:
+        update_columns["updated_at"] = func.now()
+    if "version" in table.c:
+        # Re-seeded rows count as a change for optimistic concurrency checks
+        update_columns["version"] = table.c.version + 1
+    if update_columns:
+        stmt = stmt.on_conflict_do_update(index_elements=list(key_columns), set_=update_columns)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(key_columns))
+
+    written = 0
+    for start in range(0, len(frame), chunk_size):
+        chunk = frame.iloc[start:start + chunk_size]
+        connection.execute(stmt, _frame_records(chunk))
+        written += len(chunk)
+        if on_progress:
+            on_progress(len(chunk))
+    return written
+
+def file_content_hash(file_path: str) -> str:
+    """
+    SHA-256 of a file's bytes, read in blocks
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def get_seeded_hash(connection: Connection, file_name: str) -> Optional[str]:
+    """
+    Content hash recorded the last time a file was seeded, if any
+    """
+    manifest = SeedManifest.__table__
+    return connection.execute(
+        select(manifest.c.content_hash).where(manifest.c.file_name == file_name)
+    ).scalar_one_or_none()
+
+def record_seeded_hash(connection: Connection, file_name: str, table_name: str, content_hash: str, row_count: int) -> None:
+    """
+    Record a file's content hash after it has been seeded
+    """
+    upsert_frame(
+        connection,
+        SeedManifest.__table__,
+        pd.DataFrame([{
+            "file_name": file_name,
+            "table_name": table_name,
+            "content_hash": content_hash,
+            "row_count": row_count,
+            "seeded_at": datetime.now(timezone.utc),
+        }]),
+        key_columns=("file_name",)
+    )
+
+def _table_is_empty(connection: Connection, table: Table) -> bool:
+    return connection.execute(select(1).select_from(table).limit(1)).first() is None
+
+def read_seed_frame(spec: SeedTable, static_path: str = STATIC_PATH) -> pd.DataFrame:
+    """Read a seed CSV file and map it to the target table columns"""
+    return spec.build_frame(pd.read_csv(os.path.join(static_path, spec.csv_file)))
+
+def seed_table(
+    connection: Connection,
+    spec: SeedTable,
+    static_path: str = STATIC_PATH,
+    force: bool = False,
+    on_total: Optional[Callable[[int], None]] = None,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> Optional[int]:
+    """
+    Seed one table from its CSV file, skipping it when the file content is
+    unchanged since the last seed. Empty tables are bulk loaded (COPY on
+    Postgres); populated tables are upserted on the natural key.
+
+    Returns:
+        Number of rows written, or None if the file was skipped
+    """
+    file_path = os.path.join(static_path, spec.csv_file)
+    content_hash = file_content_hash(file_path)
+    if not force and get_seeded_hash(connection, spec.csv_file) == content_hash:
+        return None
+
+    frame = read_seed_frame(spec, static_path)
+    if on_total:
+        on_total(len(frame))
+
+    if _table_is_empty(connection, spec.table):
+        frame = frame.drop_duplicates(subset=list(spec.key_columns), keep="last")
+        written = bulk_load_frame(connection, spec.table, frame, on_progress=on_progress)
+    else:
+        if spec.before_upsert:
+            spec.before_upsert(connection, frame)
+        written = upsert_frame(connection, spec.table, frame, spec.key_columns, spec.preserve_columns, on_progress=on_progress)
+
+    record_seeded_hash(connection, spec.csv_file, spec.name, content_hash, written)
+    return written
+
+def _seed_one(
+    db_engine: Engine,
+    spec: SeedTable,
+    static_path: str,
+    force: bool,
+    on_total: Optional[Callable[[str, int], None]],
+    on_progress: Optional[Callable[[str, int], None]]
+) -> Dict[str, Any]:
+    """Seed one table in its own transaction and measure its throughput"""
+    started = time.perf_counter()
+    with db_engine.begin() as connection:
+        written = seed_table(
+            connection,
+            spec,
+            static_path=static_path,
+            force=force,
+            on_total=(lambda rows: on_total(spec.name, rows)) if on_total else None,
+            on_progress=(lambda rows: on_progress(spec.name, rows)) if on_progress else None
+        )
+    elapsed = time.perf_counter() - started
+
+    return {
+        "status": "skipped" if written is None else "completed",
+        "rows": written or 0,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round((written or 0) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+def seed_tables(
+    db_engine: Engine = engine,
+    specs: Sequence[SeedTable] = SEED_TABLES,
+    static_path: str = STATIC_PATH,
+    force: bool = False,
+    max_workers: int = SEED_MAX_WORKERS,
+    on_start: Optional[Callable[[str], None]] = None,
+    on_total: Optional[Callable[[str, int], None]] = None,
+    on_progress: Optional[Callable[[str, int], None]] = None,
+    on_done: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Seed tables concurrently, each over its own pooled connection. A table
+    starts once all tables it depends on have finished. After a failure no
+    further tables are started and the first error is raised.
+
+    Returns:
+        Per-table stats (status, rows, seconds, rows_per_second)
+    """
+    if db_engine.dialect.name == "sqlite":
+        max_workers = 1  # SQLite allows a single writer at a time
+
+    names = {spec.name for spec in specs}
+    pending = list(specs)
+    finished = set()
+    results: Dict[str, Dict[str, Any]] = {}
+    errors: List[Exception] = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+
+        def submit_ready() -> None:
+            for spec in list(pending):
+                if all(dep in finished or dep not in names for dep in spec.depends_on):
+                    pending.remove(spec)
+                    if on_start:
+                        on_start(spec.name)
+                    future = executor.submit(_seed_one, db_engine, spec, static_path, force, on_total, on_progress)
+                    running[future] = spec.name
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Seeding {name} failed: {str(e)}")
+                    errors.append(e)
+                    continue
+                finished.add(name)
+                if on_done:
+                    on_done(name, results[name])
+            if not errors:
+                submit_ready()
+
+    if errors:
+        raise errors[0]
+    return results
+
+def _prune_seed_jobs() -> None:
+    """Drop the oldest finished jobs beyond SEED_JOBS_KEPT (call with the lock held)"""
+    finished = [job_id for job_id, job in seed_jobs.items() if job["status"] in ("completed", "failed")]
+    for job_id in finished[:max(0, len(finished) - SEED_JOBS_KEPT)]:
+        del seed_jobs[job_id]
+
+def create_seed_job(force: bool = False) -> Dict[str, Any]:
+    """
+    Register a new seeding job in the queued state. Only the last
+    SEED_JOBS_KEPT finished jobs stay in the registry.
+    """
+    job = {
+        "job_id": str(uuid.uuid4()),
+        "status": "queued",
+        "force": force,
+        "tables": {spec.name: {"rows_total": None, "rows_loaded": 0, "status": "queued"} for spec in SEED_TABLES},
+        "created_at": datetime.now().isoformat(),
+        "finished_at": None,
+        "error": None,
+    }
+    with _seed_jobs_lock:
+        _prune_seed_jobs()
+        seed_jobs[job["job_id"]] = job
+    return job
+
+def get_seed_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a seeding job's status and progress by ID
+    """
+    return seed_jobs.get(job_id)
+
+def run_seed_job(job_id: str, db_engine: Engine = engine) -> None:
+    """
+    Load every seed table, one transaction per table, updating job progress
+    """
+    job = seed_jobs[job_id]
+    job["status"] = "running"
+    tables = job["tables"]
+
+    def on_start(name: str) -> None:
+        tables[name]["status"] = "running"
+
+    def on_total(name: str, rows: int) -> None:
+        tables[name]["rows_total"] = rows
+
+    def on_progress(name: str, rows: int) -> None:
+        tables[name]["rows_loaded"] += rows
+
+    def on_done(name: str, stats: Dict[str, Any]) -> None:
+        tables[name]["status"] = stats["status"]
+        tables[name]["rows_per_second"] = stats["rows_per_second"]
+        logger.info(f"Seeding {name}: {stats['status']}, {stats['rows']} rows in {stats['seconds']}s")
+
+    try:
+        seed_tables(db_engine, force=job["force"], on_start=on_start, on_total=on_total, on_progress=on_progress, on_done=on_done)
+        job["status"] = "completed"
+    except Exception as e:
+        logger.error(f"Database seeding job {job_id} failed: {str(e)}")
+        job["status"] = "failed"
+        job["error"] = str(e)
+    finally:
+        # Reference data may have changed; don't wait for the next poll in this process
+        invalidate_reference_caches()
+        job["finished_at"] = datetime.now().isoformat()
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional, Callable
 import random
 import logging
@@ -6,27 +7,30 @@ import asyncio
 from datetime import datetime, timedelta
 from fastapi import WebSocket
 
+from app.core.database import read_session
+from app.core.concurrency import retry_on_conflict
 from app.models.rake import Rake
 from app.models.order import Order
+from app.utils.mutations import update_returning
 
 # Dictionary to store active WebSocket connections
 # This is shared with the WebSocket handler in live_simulation.py
 active_connections: Dict[str, WebSocket] = {}
 
-def get_live_positions(db: Session) -> Dict[str, Any]:
+async def get_live_positions(db: AsyncSession) -> Dict[str, Any]:
     """
     Get real-time rake positions for the simulation map based on real database data
     """
     try:
         # Query active rakes from database
-        active_rakes = db.query(Rake).filter(Rake.status != "Idle").all()
+        active_rakes = (await db.execute(select(Rake).where(Rake.status != "Idle"))).scalars().all()
         
         rakes_data = []
         
         if active_rakes:
             for rake in active_rakes:
                 # Get associated order for destination info
-                order = db.query(Order).filter(Order.rake_id == rake.id).first()
+                order = (await db.execute(select(Order).where(Order.rake_id == rake.id).limit(1))).scalars().first()
                 destination = order.destination if order else "Unknown"
                 
                 # Calculate position based on progress
@@ -120,20 +124,20 @@ def get_live_positions(db: Session) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat()
         }
 
-def get_active_rakes(db: Session) -> List[Dict[str, Any]]:
+async def get_active_rakes(db: AsyncSession) -> List[Dict[str, Any]]:
     """
     Get all currently active rakes for simulation display
     """
     try:
         # Query active rakes from database
-        active_rakes = db.query(Rake).filter(Rake.status != "Idle").all()
+        active_rakes = (await db.execute(select(Rake).where(Rake.status != "Idle"))).scalars().all()
         
         rakes_data = []
         
         if active_rakes:
             for rake in active_rakes:
                 # Get associated order for destination info
-                order = db.query(Order).filter(Order.rake_id == rake.id).first()
+                order = (await db.execute(select(Order).where(Order.rake_id == rake.id).limit(1))).scalars().first()
                 destination = order.destination if order else "Unknown"
                 
                 rakes_data.append({
@@ -167,7 +171,7 @@ def get_active_rakes(db: Session) -> List[Dict[str, Any]]:
             {"id": "R5678", "from": "Bokaro", "to": "Customer A123", "progress": 78, "status": "In Transit", "departureTime": "07:15 AM", "eta": "12:30 PM", "freight": "Steel Plates", "weight": "980 Tons"}
         ]
 
-def get_simulation_config(db: Session) -> Dict[str, Any]:
+def get_simulation_config(db: AsyncSession) -> Dict[str, Any]:
     """
     Get configuration data for the simulation (routes, stations, etc.)
     """
@@ -247,6 +251,52 @@ def get_simulation_config(db: Session) -> Dict[str, Any]:
     
     return config
     
+def advance_simulated_rake(rake: Dict[str, Any], speed: float):
+    """
+    Move a simulated rake one tick forward and derive its status from progress
+    """
+    if rake["progress"] < 100:
+        rake["progress"] = min(100, rake["progress"] + 1 * speed)
+        if rake["progress"] >= 100:
+            rake["status"] = "Arrived"
+
+    if 90 <= rake["progress"] < 100:
+        rake["status"] = "Arriving"
+    elif 10 <= rake["progress"] < 90:
+        rake["status"] = "In Transit"
+    elif rake["progress"] < 10:
+        rake["status"] = "Departed"
+
+async def save_simulated_rake(db: AsyncSession, rake: Dict[str, Any], speed: float):
+    """
+    Advance a database-backed simulated rake and write it with a conditional
+    update on the version it was loaded at. If another writer (an operator,
+    a bulk status update, another worker's simulation) changed the rake in
+    the meantime, its stored state is reloaded and the tick applied on top
+    of it instead of overwriting the change. The caller commits.
+    """
+    async def attempt():
+        changes = {"transit_progress": rake["progress"], "status": rake["status"]}
+        if rake["progress"] >= 100:
+            changes["arrival_time"] = datetime.now()
+        saved = await update_returning(db, Rake, Rake.id, rake["id"], changes, expected_version=rake.get("version"))
+        if saved is not None:
+            rake["version"] = saved.version
+        return saved
+
+    async def rebase():
+        row = (await db.execute(
+            select(Rake.transit_progress, Rake.status, Rake.version).where(Rake.id == rake["id"])
+        )).first()
+        if row is not None:
+            rake["progress"] = row.transit_progress or 0
+            rake["status"] = row.status
+            rake["version"] = row.version
+            advance_simulated_rake(rake, speed)
+
+    advance_simulated_rake(rake, speed)
+    return await retry_on_conflict("simulation_progress", attempt, on_conflict=rebase)
+
 async def broadcast_update(update_type: str, data: Dict[str, Any], exclude_client_id: str = None):
     """
     Broadcast an update to all active WebSocket connections
@@ -285,12 +335,13 @@ async def broadcast_update(update_type: str, data: Dict[str, Any], exclude_clien
         if client_id in active_connections:
             del active_connections[client_id]
 
-async def start_simulation_loop(db: Session, speed_factor: float = 1.0, include_random_events: bool = False):
+async def start_simulation_loop(speed_factor: float = 1.0, include_random_events: bool = False):
     """
-    Start a continuous simulation loop that updates rake positions and broadcasts updates
+    Start a continuous simulation loop that updates rake positions and broadcasts updates.
+    A short-lived session is opened per tick since the loop outlives the request that
+    started it and shouldn't hold a pooled connection between updates.
     
     Args:
-        db: Database session
         speed_factor: Speed multiplier for the simulation (1.0 = real-time)
         include_random_events: Whether to generate random events
     """
@@ -301,7 +352,8 @@ async def start_simulation_loop(db: Session, speed_factor: float = 1.0, include_
         # Main simulation loop
         while is_running:
             # Get current positions
-            positions = get_live_positions(db)
+            async with read_session() as db:
+                positions = await get_live_positions(db)
             
             # Broadcast the positions to all clients
             await broadcast_update("position_update", positions)
@@ -0,0 +1,152 @@
+from typing import List, Optional, Dict, Any, Tuple
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Supported filter operators for "column:op:value" expressions
+FILTER_OPERATORS = ("eq", "ne", "gt", "gte", "lt", "lte", "in")
+
+# Parsed CSV files keyed by path -> (mtime_ns, DataFrame)
+_frame_cache: Dict[str, Tuple[int, pd.DataFrame]] = {}
+_frame_cache_lock = threading.Lock()
+
+def get_file_version(file_path: str) -> int:
+    """
+    Get the version of a static file (its modification time in nanoseconds)
+    """
+    return os.stat(file_path).st_mtime_ns
+
+def load_static_frame(file_path: str) -> Tuple[pd.DataFrame, int]:
+    """
+    Load a static CSV file into a columnar DataFrame, reusing the cached copy
+    until the file changes on disk. Date columns are parsed once so that
+    range filters can be evaluated without re-reading the file.
+
+    Returns:
+        Tuple of (DataFrame, file version)
+    """
+    version = get_file_version(file_path)
+
+    with _frame_cache_lock:
+        cached = _frame_cache.get(file_path)
+        if cached and cached[0] == version:
+            return cached[1], version
+
+    df = pd.read_csv(file_path)
+    for col in df.columns:
+        if 'date' in col.lower():
+            try:
+                df[col] = pd.to_datetime(df[col])
+            except (ValueError, TypeError):
+                pass  # Keep the raw column if it can't be converted
+
+    with _frame_cache_lock:
+        _frame_cache[file_path] = (version, df)
+
+    return df, version
+
+def parse_filters(filters: Optional[List[str]]) -> List[Tuple[str, str, str]]:
+    """
+    Parse "column:op:value" filter expressions
+
+    Raises:
+        ValueError: If an expression is malformed or uses an unknown operator
+    """
+    parsed = []
+    for expression in filters or []:
+        parts = expression.split(":", 2)
+        if len(parts) != 3:
+            raise ValueError(f"Invalid filter '{expression}', expected column:op:value")
+        column, op, value = parts
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Invalid filter operator '{op}', must be one of: {', '.join(FILTER_OPERATORS)}")
+        parsed.append((column, op, value))
+    return parsed
+
+def _coerce_value(series: pd.Series, value: str) -> Any:
+    """
+    Convert a filter value to the dtype of the column it is compared with
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return pd.Timestamp(value)
+    if pd.api.types.is_bool_dtype(series):
+        return value.lower() in ("1", "true", "yes")
+    if pd.api.types.is_numeric_dtype(series):
+        return float(value)
+    return value
+
+def apply_filters(df: pd.DataFrame, filters: List[Tuple[str, str, str]]) -> pd.DataFrame:
+    """
+    Apply parsed filters to a DataFrame as vectorized boolean masks
+
+    Raises:
+        ValueError: If a filter references an unknown column or an invalid value
+    """
+    if not filters:
+        return df
+
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in filters:
+        if column not in df.columns:
+            raise ValueError(f"Unknown filter column '{column}'")
+        series = df[column]
+        try:
+            if op == "in":
+                values = [_coerce_value(series, v) for v in value.split("|")]
+                mask &= series.isin(values).to_numpy()
+                continue
+            target = _coerce_value(series, value)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid value '{value}' for column '{column}'")
+
+        if op == "eq":
+            mask &= (series == target).to_numpy()
+        elif op == "ne":
+            mask &= (series != target).to_numpy()
+        elif op == "gt":
+            mask &= (series > target).to_numpy()
+        elif op == "gte":
+            mask &= (series >= target).to_numpy()
+        elif op == "lt":
+            mask &= (series < target).to_numpy()
+        elif op == "lte":
+            mask &= (series <= target).to_numpy()
+
+    return df[mask]
+
+def project_columns(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    """
+    Restrict a DataFrame to the requested columns, preserving request order
+
+    Raises:
+        ValueError: If a requested column does not exist
+    """
+    if not columns:
+        return df
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"Unknown columns: {', '.join(missing)}")
+    return df[columns]
+
+def query_signature(columns: Optional[List[str]], filters: List[Tuple[str, str, str]]) -> str:
+    """
+    Short hash identifying a projection + filter combination, embedded in
+    cursors so a cursor can't be replayed against a different query
+    """
+    raw = json.dumps({"columns": columns or [], "filters": filters})
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+def format_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a (page of a) DataFrame to JSON-friendly records
+    """
+    page = df.copy()
+    for col in page.columns:
+        if pd.api.types.is_datetime64_any_dtype(page[col]):
+            page[col] = page[col].dt.strftime('%Y-%m-%d')
+    page = page.astype(object).where(pd.notna(page), None)
+    return page.to_dict(orient='records')
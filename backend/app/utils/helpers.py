@@ -1,4 +1,5 @@
 import uuid
+import base64
 import random
 import string
 from typing import Dict, Any, List, Optional, Union
@@ -105,4 +106,39 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     c = 2 * math.asin(math.sqrt(a))
     r = 6371  # Radius of earth in kilometers
     
-    return c * r
\ No newline at end of file
+    return c * r
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    Encode a pagination position as an opaque, URL-safe cursor token
+    
+    Args:
+        payload: JSON-serializable dict describing the position
+        
+    Returns:
+        Cursor token
+    """
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True, default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor token produced by encode_cursor
+    
+    Args:
+        cursor: Cursor token
+        
+    Returns:
+        Decoded position dict
+        
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor: payload must be an object")
+    return payload
@@ -0,0 +1,61 @@
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Optional
+
+from app.core.concurrency import VersionConflict
+
+async def update_returning(
+    db: AsyncSession,
+    model,
+    key_column,
+    key: Any,
+    changes: Dict[str, Any],
+    expected_version: Optional[int] = None
+) -> Optional[Any]:
+    """
+    Update one row by key with UPDATE ... RETURNING and get the updated
+    entity in the same round trip. Returns None when no row matched.
+    The caller commits.
+
+    For versioned models the version is bumped, and when expected_version is
+    given the update only applies at that version (WHERE version = :v).
+
+    Raises:
+        VersionConflict: If the row exists at a different version
+    """
+    versioned = hasattr(model, "version")
+
+    if not changes:
+        # Nothing to write, just load the row
+        result = await db.execute(select(model).where(key_column == key))
+        row = result.scalars().first()
+        if row is not None and versioned and expected_version is not None and row.version != expected_version:
+            raise VersionConflict(model.__name__, key, expected_version, row.version)
+        return row
+
+    stmt = update(model).where(key_column == key)
+    values = dict(changes)
+    if versioned:
+        values["version"] = model.version + 1
+        if expected_version is not None:
+            stmt = stmt.where(model.version == expected_version)
+
+    stmt = stmt.values(**values).returning(model)
+    result = await db.execute(stmt, execution_options={"synchronize_session": False, "populate_existing": True})
+    row = result.scalars().first()
+
+    if row is None and versioned and expected_version is not None:
+        # Tell a stale version apart from a missing row (only on the failure path)
+        current = await db.scalar(select(model.version).where(key_column == key))
+        if current is not None:
+            raise VersionConflict(model.__name__, key, expected_version, current)
+    return row
+
+async def delete_returning(db: AsyncSession, model, key_column, key: Any) -> Optional[Any]:
+    """
+    Delete one row by key with DELETE ... RETURNING. Returns the deleted
+    entity, or None when no row matched. The caller commits.
+    """
+    stmt = delete(model).where(key_column == key).returning(model)
+    result = await db.execute(stmt, execution_options={"synchronize_session": False})
+    return result.scalars().first()
@@ -0,0 +1,91 @@
+from sqlalchemy import DateTime, String, and_, or_, literal
+from sqlalchemy.sql import Select
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime
+import hashlib
+import json
+
+from app.utils.helpers import encode_cursor, decode_cursor
+
+def filter_signature(filters: Dict[str, Any]) -> str:
+    """
+    Short hash of a list query's filters, embedded in cursors so a cursor
+    can't be replayed against a different filter combination
+    """
+    raw = json.dumps(filters, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+def encode_keyset_cursor(row: Any, columns: Sequence, signature: str) -> str:
+    """
+    Build the cursor pointing just after a row, from its sort key values
+    """
+    values = []
+    for column in columns:
+        value = getattr(row, column.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    return encode_cursor({"k": values, "q": signature})
+
+def decode_keyset_cursor(cursor: str, columns: Sequence, signature: str) -> List[Any]:
+    """
+    Decode a cursor into the sort key values of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for other filters
+    """
+    position = decode_cursor(cursor)
+    values = position.get("k")
+    if position.get("q") != signature:
+        raise ValueError("Cursor does not match the requested filters")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor: wrong key")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if isinstance(column.type, DateTime) and value is not None:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor: bad timestamp")
+        decoded.append(value)
+    return decoded
+
+def _key_bind(column, value: Any, dialect_name: str):
+    """
+    Bind a sort key value for comparison with its column. SQLite stores
+    server-default timestamps as text without fractional seconds while
+    DateTime binds always carry them, so the value is compared as text in
+    the stored format to keep rows with the same timestamp on the right page.
+    """
+    if dialect_name == "sqlite" and isinstance(column.type, DateTime) and isinstance(value, datetime):
+        text_value = value.strftime("%Y-%m-%d %H:%M:%S")
+        if value.microsecond:
+            text_value += f".{value.microsecond:06d}"
+        return literal(text_value, String)
+    return value
+
+def keyset_page(
+    query: Select,
+    columns: Sequence,
+    after: Optional[List[Any]],
+    limit: int,
+    dialect_name: str,
+    descending: bool = False
+) -> Select:
+    """
+    Order a query by the sort key and seek past the previous page's last row,
+    so each page is an index range scan regardless of depth. The key must be
+    unique (end it with the primary key). descending walks the key newest
+    first (the same index, scanned backwards).
+    """
+    if after:
+        # (a, b) > (x, y) expanded as a > x OR (a = x AND b > y), which every dialect can use with a composite index
+        clauses = []
+        for i, column in enumerate(columns):
+            equal_prefix = [columns[j] == _key_bind(columns[j], after[j], dialect_name) for j in range(i)]
+            bound = _key_bind(column, after[i], dialect_name)
+            clauses.append(and_(*equal_prefix, column < bound if descending else column > bound))
+        query = query.where(or_(*clauses))
+
+    if descending:
+        return query.order_by(*[column.desc() for column in columns]).limit(limit)
+    return query.order_by(*columns).limit(limit)
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+from typing import Dict, Any, List, AsyncIterable, AsyncIterator, Iterable, Optional, Union
+
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+
+# Rows per emitted chunk for streamed responses
+STREAM_BATCH_SIZE = 1000
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+RecordBatches = Union[Iterable[List[Dict[str, Any]]], AsyncIterable[List[Dict[str, Any]]]]
+
+def as_async_batches(batches: RecordBatches) -> AsyncIterable[List[Dict[str, Any]]]:
+    """
+    Adapt a batch source to an async iterable. Synchronous sources (e.g. chunked
+    CSV reads) are iterated in the threadpool so they don't block the event loop.
+    """
+    if hasattr(batches, "__aiter__"):
+        return batches
+    return iterate_in_threadpool(iter(batches))
+
+async def ndjson_chunks(batches: RecordBatches) -> AsyncIterator[str]:
+    """
+    Serialize batches of records as newline-delimited JSON, one chunk per batch
+
+    Args:
+        batches: Iterable or async iterable of record batches
+
+    Returns:
+        Async iterator of NDJSON text chunks
+    """
+    async for batch in as_async_batches(batches):
+        if batch:
+            yield "".join(json.dumps(record, default=str) + "\n" for record in batch)
+
+async def csv_chunks(batches: RecordBatches, columns: Optional[List[str]] = None) -> AsyncIterator[str]:
+    """
+    Serialize batches of records as CSV, writing the header with the first batch
+
+    Args:
+        batches: Iterable or async iterable of record batches
+        columns: Optional column order (defaults to the keys of the first record)
+
+    Returns:
+        Async iterator of CSV text chunks
+    """
+    writer = None
+    buffer = io.StringIO()
+    async for batch in as_async_batches(batches):
+        if not batch:
+            continue
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=columns or list(batch[0].keys()), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+def streaming_records_response(
+    batches: RecordBatches,
+    response_format: str,
+    filename: str,
+    columns: Optional[List[str]] = None
+) -> StreamingResponse:
+    """
+    Build a streaming HTTP response that emits record batches as NDJSON or CSV
+
+    Args:
+        batches: Iterable or async iterable of record batches, consumed lazily while streaming
+        response_format: "ndjson" or "csv"
+        filename: Base name for the download (without extension)
+        columns: Optional CSV column order
+
+    Returns:
+        StreamingResponse
+    """
+    if response_format == "csv":
+        body = csv_chunks(batches, columns)
+    else:
+        body = ndjson_chunks(batches)
+
+    return StreamingResponse(
+        body,
+        media_type=STREAM_MEDIA_TYPES[response_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{response_format}"'}
+    )
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark the rake optimizer modes on seeded synthetic instances.
+
+For each size and mode (cost = optimize_rakes, flow = optimize_flow,
+heuristic = allocate_heuristic) it records input preparation, model build
+and solve times, peak memory and the objective. Every case runs in a fresh
+process so peak RSS (which includes the solver's native memory) belongs to
+that case alone; --tracemalloc also records the Python heap peak, at the
+cost of slower Python code.
+
+Results are written as JSON. With --baseline, they are compared to an
+earlier run and the script exits with status 1 on a regression (slower by
+more than --time-tolerance, or an objective worse by more than
+--objective-tolerance).
+
+Usage:
+    python backend_testing_files/bench_optimizer.py [--sizes 10,100,1000,10000,100000]
+        [--modes cost,flow,heuristic] [--output results.json] [--baseline old.json]
+"""
+
+import sys
+import os
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# Make the 'app' package importable when run from anywhere
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from optimizer_instances import generate_instance
+from app.ml.rail_network import RailNetwork
+from app.ml.rake_optimizer import optimize_rakes
+from app.ml.flow_optimizer import optimize_flow
+from app.ml.heuristic_allocator import allocate_heuristic, build_unit_costs
+
+MODES = ("cost", "flow", "heuristic")
+
+# Largest instance run per mode by default (the exact modes grow with orders x stockyards)
+DEFAULT_MAX_ORDERS = {"cost": 10_000, "flow": 10_000, "heuristic": 100_000}
+
+# Times below this are too noisy to flag as regressions
+NOISE_FLOOR_SECONDS = 0.05
+
+COST_PER_TONNE_KM = 1.2
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rake optimizer benchmark")
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000", help="Comma-separated order counts")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated solver modes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-orders", default="", help="Per-mode size limits, e.g. cost=20000,flow=5000")
+    parser.add_argument("--timeout", type=float, default=900, help="Seconds per case")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also record the Python heap peak (slower)")
+    parser.add_argument("--output", default="bench_optimizer_results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="Allowed slowdown (0.5 = 50%%)")
+    parser.add_argument("--objective-tolerance", type=float, default=0.01, help="Allowed objective increase (0.01 = 1%%)")
+    return parser.parse_args()
+
+def rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def prepare(mode: str, instance):
+    """
+    Inputs for a mode as the API builds them: (callable, prepare seconds)
+    """
+    materials, orders = instance.optimizer_inputs()
+    started = time.perf_counter()
+    if mode == "cost":
+        constraints = {"min_fulfillment_percentage": 100}
+        run = lambda: optimize_rakes(materials, orders, constraints)
+    elif mode == "flow":
+        network = RailNetwork.from_routes(instance.routes)
+        constraints = {"planning_days": 30, "cost_per_tonne_km": COST_PER_TONNE_KM}
+        run = lambda: optimize_flow(materials, orders, network, constraints)
+    else:
+        network = RailNetwork.from_routes(instance.routes)
+        def distance(origin, destination):
+            path = network.shortest_path(origin, destination)
+            return path["distance_km"] if path else None
+        unit_costs = build_unit_costs(materials, orders, distance, COST_PER_TONNE_KM)
+        constraints = {"min_fulfillment_percentage": 100}
+        run = lambda: allocate_heuristic(materials, orders, constraints, unit_costs)
+    return run, time.perf_counter() - started
+
+def run_case(mode: str, size: int, seed: int, trace: bool, queue):
+    """Child process: generate, prepare and solve one case, then report"""
+    try:
+        instance = generate_instance(size, seed)
+        record = {"mode": mode, **instance.size}
+        run, prepare_seconds = prepare(mode, instance)
+        record["rss_baseline_mb"] = round(rss_mb(), 1)
+
+        if trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        result = run()
+        total_seconds = time.perf_counter() - started
+        if trace:
+            record["python_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            tracemalloc.stop()
+
+        timings = result.get("timings", {})
+        record.update({
+            "status": result.get("status", "failed"),
+            "error": result.get("error"),
+            "prepare_seconds": round(prepare_seconds, 4),
+            "build_seconds": round(timings.get("build_seconds", 0), 4),
+            "solve_seconds": round(timings.get("solve_seconds", 0), 4),
+            "total_seconds": round(prepare_seconds + total_seconds, 4),
+            "rss_peak_mb": round(rss_mb(), 1),
+            "objective": result.get("total_cost"),
+            "allocated_tons": round(sum(item["quantity"] for item in result.get("optimized_plan", [])), 1),
+            "unfulfilled_tons": round(sum(item["quantity"] for item in result.get("unfulfilled", []) or []), 1),
+        })
+        if result.get("model_size"):
+            record["variables"] = result["model_size"]["variables"]
+        queue.put(record)
+    except Exception as e:
+        queue.put({"mode": mode, "orders": size, "status": "error", "error": str(e)})
+
+def run_isolated(mode: str, size: int, seed: int, trace: bool, timeout: float) -> dict:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=run_case, args=(mode, size, seed, trace, queue))
+    process.start()
+    try:
+        return queue.get(timeout=timeout)
+    except Exception:
+        process.terminate()
+        return {"mode": mode, "orders": size, "status": "timeout", "error": f"No result within {timeout:.0f}s"}
+    finally:
+        process.join(10)
+
+def compare(results, baseline_path: str, time_tolerance: float, objective_tolerance: float):
+    """Regressions against an earlier results file"""
+    with open(baseline_path) as f:
+        baseline = {(row["mode"], row["orders"]): row for row in json.load(f)["results"]}
+
+    regressions = []
+    for row in results:
+        before = baseline.get((row["mode"], row["orders"]))
+        if not before or before.get("status") != "success":
+            continue
+        label = f"{row['mode']} @ {row['orders']:,} orders"
+        if row.get("status") != "success":
+            regressions.append(f"{label}: {row.get('status')} (was success)")
+            continue
+        if before["total_seconds"] >= NOISE_FLOOR_SECONDS and row["total_seconds"] > before["total_seconds"] * (1 + time_tolerance):
+            regressions.append(f"{label}: {before['total_seconds']:.2f}s -> {row['total_seconds']:.2f}s")
+        if before.get("objective") and row.get("objective") is not None and row["objective"] > before["objective"] * (1 + objective_tolerance):
+            regressions.append(f"{label}: objective {before['objective']:,.0f} -> {row['objective']:,.0f}")
+    return regressions
+
+def main():
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    modes = [mode for mode in args.modes.split(",") if mode]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        print(f"❌ Unknown modes: {', '.join(unknown)}")
+        return False
+    max_orders = dict(DEFAULT_MAX_ORDERS)
+    for limit in filter(None, args.max_orders.split(",")):
+        mode, value = limit.split("=")
+        max_orders[mode] = int(value)
+
+    print("=" * 70)
+    print("Rake optimizer benchmark")
+    print("=" * 70)
+
+    try:
+        results = []
+        for size in sizes:
+            for mode in modes:
+                if size > max_orders.get(mode, 0):
+                    results.append({"mode": mode, "orders": size, "status": "skipped"})
+                    continue
+                print(f"⏱  {mode:<9} {size:>8,} orders...", end=" ", flush=True)
+                row = run_isolated(mode, size, args.seed, args.tracemalloc, args.timeout)
+                results.append(row)
+                if row.get("status") == "success":
+                    print(f"{row['total_seconds']:.2f}s, {row['rss_peak_mb']:.0f} MB, objective {row['objective']:,.0f}")
+                else:
+                    print(f"{row.get('status')}: {row.get('error')}")
+
+        output = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+
+        print("\n" + "=" * 70)
+        print(f"{'mode':<10} {'orders':>8} {'prepare s':>10} {'build s':>9} {'solve s':>9} {'peak MB':>8} {'objective':>16}")
+        for row in results:
+            if row.get("status") != "success":
+                print(f"{row['mode']:<10} {row['orders']:>8,} {row.get('status'):>10}")
+                continue
+            print(f"{row['mode']:<10} {row['orders']:>8,} {row['prepare_seconds']:>10.3f} {row['build_seconds']:>9.3f} "
+                  f"{row['solve_seconds']:>9.3f} {row['rss_peak_mb']:>8.0f} {row['objective']:>16,.0f}")
+        print("=" * 70)
+        print(f"📄 Results written to {args.output}")
+
+        if args.baseline:
+            regressions = compare(results, args.baseline, args.time_tolerance, args.objective_tolerance)
+            if regressions:
+                print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+                for regression in regressions:
+                    print(f"  - {regression}")
+                return False
+            print(f"\n✅ No regressions against {args.baseline}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Benchmark failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark the hot filter queries before and after the secondary indexes
+migration (0003_hot_filter_indexes).
+
+Builds a scratch database at revision 0002, loads synthetic orders, rakes
+and stockyards, prints each query's plan and timing, upgrades to 0003 and
+measures again.
+
+Usage:
+    python backend_testing_files/bench_query_plans.py [--url URL] [--rows N] [--repeat N]
+
+By default a temporary SQLite file is used. Pass --url to benchmark a
+scratch PostgreSQL database; its tables are dropped and recreated.
+"""
+
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+# Make the 'app' package importable when run from anywhere
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np
+import pandas as pd
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+from app.core.database import Base
+from app.models.order import Order
+from app.models.rake import Rake
+from app.models.inventory import Inventory
+from app.services.seed_service import bulk_load_frame
+
+STATUSES = ["pending", "in_progress", "Dispatched", "completed", "cancelled"]
+PRIORITIES = ["low", "normal", "high", "urgent"]
+RAKE_STATUSES = ["Available", "In Transit", "Loading", "Maintenance"]
+MATERIALS = ["HR Coil", "CR Coil", "Wire Rod", "Plate", "Billets", "Slab", "Pipe", "Rail"]
+
+# (label, SQL, parameters) for the filters the API runs
+QUERIES = [
+    ("orders by status", "SELECT * FROM orders WHERE status = :status LIMIT 100", {"status": "cancelled"}),
+    ("orders by status + priority", "SELECT * FROM orders WHERE status = :status AND priority = :priority LIMIT 100", {"status": "pending", "priority": "urgent"}),
+    ("orders by priority", "SELECT * FROM orders WHERE priority = :priority LIMIT 100", {"priority": "urgent"}),
+    ("count pending orders", "SELECT COUNT(*) FROM orders WHERE status = :status", {"status": "pending"}),
+    ("order for a rake", "SELECT * FROM orders WHERE rake_id = :rake_id LIMIT 1", {"rake_id": 4242}),
+    ("rakes by status", "SELECT * FROM rakes WHERE status = :status LIMIT 100", {"status": "Maintenance"}),
+    ("stockyards by material", "SELECT * FROM stockyards WHERE material = :material LIMIT 100", {"material": "Rail"}),
+]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare query plans before/after the hot filter indexes")
+    parser.add_argument("--url", help="Scratch database URL (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows per table")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+    return parser.parse_args()
+
+def alembic_config(url: str) -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+def skewed_choice(rng, values, size):
+    """Pick values with a long tail so selective filters exist (last value is rarest)"""
+    weights = np.array([2.0 ** -i for i in range(len(values))])
+    return rng.choice(values, size=size, p=weights / weights.sum())
+
+def build_frames(rows: int):
+    rng = np.random.default_rng(42)
+    rake_count = rows
+
+    rakes = pd.DataFrame({
+        "id": np.arange(1, rake_count + 1),
+        "rake_number": [f"BR-{i:07d}" for i in range(1, rake_count + 1)],
+        "origin_plant": "Bokaro",
+        "destination": rng.choice(["Kolkata", "Mumbai", "Durgapur", "Chennai"], size=rake_count),
+        "status": skewed_choice(rng, RAKE_STATUSES, rake_count),
+        "capacity_tons": 3800.0,
+        "total_wagons": 58,
+        "priority": rng.choice(PRIORITIES, size=rake_count),
+        "transit_progress": 0.0,
+    })
+
+    orders = pd.DataFrame({
+        "id": np.arange(1, rows + 1),
+        "customer_name": [f"Customer {i % 5000}" for i in range(rows)],
+        "material": rng.choice(MATERIALS, size=rows),
+        "quantity": rng.uniform(50, 2000, size=rows).round(2),
+        "unit": "tons",
+        "status": skewed_choice(rng, STATUSES, rows),
+        "priority": skewed_choice(rng, PRIORITIES, rows),
+        "origin_plant": "Bokaro",
+        "destination": rng.choice(["Kolkata", "Mumbai", "Durgapur", "Chennai"], size=rows),
+        "rake_id": rng.integers(1, rake_count + 1, size=rows),
+    })
+
+    stockyards = pd.DataFrame({
+        "stockyard_id": [f"SY-{i:07d}" for i in range(rows)],
+        "material": skewed_choice(rng, MATERIALS, rows),
+        "capacity": rng.uniform(1000, 10000, size=rows).round(1),
+        "location": "23.6345,86.1432",
+    })
+
+    return [(Rake.__table__, rakes), (Order.__table__, orders), (Inventory.__table__, stockyards)]
+
+def explain(connection, sql: str, params: dict) -> str:
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).fetchall()
+        return "; ".join(row[-1] for row in rows)
+    rows = connection.execute(text(f"EXPLAIN {sql}"), params).fetchall()
+    return " / ".join(row[0].strip() for row in rows)
+
+def measure(engine, repeat: int):
+    results = {}
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("ANALYZE"))
+        for label, sql, params in QUERIES:
+            plan = explain(connection, sql, params)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                connection.execute(text(sql), params).fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+            results[label] = (plan, float(np.median(timings)))
+    return results
+
+def main():
+    args = parse_args()
+
+    scratch_dir = None
+    url = args.url
+    if not url:
+        scratch_dir = tempfile.mkdtemp(prefix="bench_query_plans_")
+        url = f"sqlite:///{os.path.join(scratch_dir, 'bench.db')}"
+
+    print("=" * 70)
+    print("Query plan benchmark: hot filter indexes (0003)")
+    print("=" * 70)
+    print(f"Database: {url.split('@')[-1]}")
+    print(f"Rows per table: {args.rows:,}")
+
+    engine = create_engine(url)
+    config = alembic_config(url)
+
+    try:
+        # Start from a clean schema at the revision before the indexes
+        with engine.begin() as connection:
+            Base.metadata.drop_all(connection)
+            connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        command.upgrade(config, "0002")
+
+        print("\n📦 Loading synthetic data...")
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            for table, frame in build_frames(args.rows):
+                bulk_load_frame(connection, table, frame, chunk_size=50_000)
+                print(f"  ✓ {table.name}: {len(frame):,} rows")
+        print(f"  Loaded in {time.perf_counter() - start:.1f}s")
+
+        print("\n🔍 Measuring without secondary indexes...")
+        before = measure(engine, args.repeat)
+
+        print("🛠  Applying 0003_hot_filter_indexes...")
+        start = time.perf_counter()
+        command.upgrade(config, "0003")
+        print(f"  Indexes built in {time.perf_counter() - start:.1f}s")
+
+        # Reconnect so no connection reuses statements prepared before the indexes existed
+        engine.dispose()
+
+        print("🔍 Measuring with secondary indexes...")
+        after = measure(engine, args.repeat)
+
+        print("\n" + "=" * 70)
+        for label, _, _ in QUERIES:
+            plan_before, ms_before = before[label]
+            plan_after, ms_after = after[label]
+            speedup = ms_before / ms_after if ms_after > 0 else float("inf")
+            print(f"\n{label}: {ms_before:.2f} ms -> {ms_after:.2f} ms ({speedup:.1f}x)")
+            print(f"  before: {plan_before}")
+            print(f"  after:  {plan_after}")
+        print("\n" + "=" * 70)
+        return True
+
+    except Exception as e:
+        print(f"❌ Benchmark failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        engine.dispose()
+        if scratch_dir:
+            import shutil
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
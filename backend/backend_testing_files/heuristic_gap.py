@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Measure the heuristic allocator's optimality gap against the exact solver.
+
+Generates random instances (orders and stockyards placed on a plane, unit
+cost = stockyard cost + freight by distance), solves each with
+optimize_rakes (SCIP) and with the heuristic, and prints costs, gap and
+run times. Instances above --exact-limit orders are only run through the
+heuristic.
+
+Usage:
+    python backend_testing_files/heuristic_gap.py [--sizes 200,1000,5000,20000] [--exact-limit N] [--seed N]
+"""
+
+import sys
+import os
+import argparse
+import math
+import random
+import time
+
+# Make the 'app' package importable when run from anywhere
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.ml.rake_optimizer import optimize_rakes
+from app.ml.heuristic_allocator import allocate_heuristic
+
+MATERIALS = ["Coal", "Iron Ore", "Limestone", "HR Coil", "Billets"]
+PRIORITIES = ["urgent", "high", "normal", "low"]
+COST_PER_TONNE_KM = 1.2
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Heuristic allocator optimality gap")
+    parser.add_argument("--sizes", default="200,1000,5000,20000", help="Comma-separated order counts")
+    parser.add_argument("--exact-limit", type=int, default=5000, help="Largest instance solved exactly")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+def build_instance(order_count: int, seed: int):
+    """Orders and stockyards with ~20% spare stock per material, and pairwise unit costs"""
+    rng = random.Random(seed)
+    stockyard_count = max(10, order_count // 50)
+
+    orders = []
+    demand = {material: 0.0 for material in MATERIALS}
+    for k in range(order_count):
+        material = rng.choice(MATERIALS)
+        quantity = round(rng.uniform(50, 3000), 1)
+        demand[material] += quantity
+        orders.append({
+            "order_id": f"O{k}",
+            "material": material,
+            "quantity": quantity,
+            "destination": f"D{rng.randrange(100)}",
+            "priority": rng.choice(PRIORITIES)
+        })
+
+    materials = []
+    for k in range(stockyard_count):
+        material = MATERIALS[k % len(MATERIALS)]
+        materials.append({
+            "stockyard_id": f"SY{k}",
+            "material": material,
+            "capacity": 0.0,
+            "cost": round(rng.uniform(5, 25), 2),
+            "station": f"S{k}"
+        })
+    per_material = {material: [stock for stock in materials if stock["material"] == material] for material in MATERIALS}
+    for material, stocks in per_material.items():
+        for stock in stocks:
+            stock["capacity"] = round(demand[material] * 1.2 / len(stocks), 1)
+
+    # Stations and destinations on a 1500 x 1500 km plane
+    places = {}
+    def position(name):
+        if name not in places:
+            places[name] = (rng.uniform(0, 1500), rng.uniform(0, 1500))
+        return places[name]
+
+    unit_costs = {}
+    for i, order in enumerate(orders):
+        for j, stock in enumerate(materials):
+            if stock["material"] == order["material"]:
+                km = math.dist(position(stock["station"]), position(order["destination"]))
+                unit_costs[i, j] = stock["cost"] + COST_PER_TONNE_KM * km
+    return materials, orders, unit_costs
+
+def main():
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    constraints = {"min_fulfillment_percentage": 100}
+
+    print("=" * 70)
+    print("Heuristic allocator vs exact solver")
+    print("=" * 70)
+
+    try:
+        rows = []
+        for size in sizes:
+            materials, orders, unit_costs = build_instance(size, args.seed + size)
+            print(f"\n📦 {size:,} orders, {len(materials)} stockyards, {len(unit_costs):,} pairs")
+
+            start = time.perf_counter()
+            heuristic = allocate_heuristic(materials, orders, constraints, unit_costs)
+            heuristic_seconds = time.perf_counter() - start
+            stats = heuristic["heuristic"]
+            print(f"  ⚡ heuristic: {heuristic['total_cost']:,.0f} in {heuristic_seconds:.2f}s "
+                  f"(greedy {stats['greedy_cost']:,.0f} in {stats['greedy_seconds']:.2f}s, {stats['local_search_moves']} moves)")
+
+            exact_cost = None
+            exact_seconds = None
+            if size <= args.exact_limit:
+                start = time.perf_counter()
+                exact = optimize_rakes(materials, orders, constraints, unit_costs)
+                exact_seconds = time.perf_counter() - start
+                if exact.get("status") == "success":
+                    exact_cost = exact["total_cost"]
+                    print(f"  🎯 exact:     {exact_cost:,.0f} in {exact_seconds:.2f}s")
+                else:
+                    print(f"  ❌ exact solver failed: {exact.get('error')}")
+
+            gap = (heuristic["total_cost"] - exact_cost) / exact_cost * 100 if exact_cost else None
+            rows.append((size, heuristic_seconds, exact_seconds, gap))
+
+        print("\n" + "=" * 70)
+        print(f"{'orders':>8} {'heuristic s':>12} {'exact s':>10} {'gap %':>8}")
+        for size, heuristic_seconds, exact_seconds, gap in rows:
+            exact_text = f"{exact_seconds:.2f}" if exact_seconds is not None else "-"
+            gap_text = f"{gap:.3f}" if gap is not None else "-"
+            print(f"{size:>8,} {heuristic_seconds:>12.2f} {exact_text:>10} {gap_text:>8}")
+        print("=" * 70)
+        return True
+
+    except Exception as e:
+        print(f"❌ Benchmark failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
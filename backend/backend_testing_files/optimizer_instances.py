@@ -0,0 +1,152 @@
+"""
+Seeded synthetic instances for the rake optimizer benchmarks.
+
+Rows follow the statics/*.csv files (customer_orders, production_inventory,
+route_transport_info_updated) so an instance can also be written out and
+seeded; optimizer_inputs() gives the OptimizationRequest shape.
+
+Plants, junctions and destinations are placed on a 1800 x 1800 km plane.
+Every plant has a route to every destination through a junction (and an
+alternate through another), so the rail network has a few hundred corridors
+at the larger sizes. Stock is 20% above demand per commodity.
+"""
+
+import csv
+import math
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+COMMODITIES = ["Coal", "Iron Ore", "Limestone"]
+PRIORITIES = ["High", "Medium", "Low"]
+ZONES = ["SER", "ER", "CR", "ECR", "SECR"]
+PLANTS = ["Bokaro", "Bhilai", "Rourkela", "Durgapur", "Burnpur", "Salem"]
+START_DATE = date(2024, 1, 1)
+
+@dataclass
+class Instance:
+    seed: int
+    orders: List[Dict[str, Any]] = field(default_factory=list)
+    inventory: List[Dict[str, Any]] = field(default_factory=list)
+    routes: List[Dict[str, Any]] = field(default_factory=list)
+    stockyards: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def size(self) -> Dict[str, int]:
+        return {
+            "orders": len(self.orders),
+            "stockyards": len(self.stockyards),
+            "routes": len(self.routes),
+            "destinations": len(set(order["destination"] for order in self.orders)),
+        }
+
+    def optimizer_inputs(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(materials, orders) as OptimizationRequest items"""
+        orders = [
+            {
+                "order_id": order["order_id"],
+                "quantity": float(order["order_quantity_tonnes"]),
+                "material": order["commodity"],
+                "destination": order["destination"],
+                "priority": {"High": "high", "Medium": "normal", "Low": "low"}[order["priority"]],
+            }
+            for order in self.orders
+        ]
+        return [dict(stock) for stock in self.stockyards], orders
+
+    def write_csv(self, directory: str):
+        """Write the instance as statics-style CSV files"""
+        os.makedirs(directory, exist_ok=True)
+        for name, rows in (
+            ("customer_orders.csv", self.orders),
+            ("production_inventory.csv", self.inventory),
+            ("route_transport_info_updated.csv", self.routes),
+        ):
+            with open(os.path.join(directory, name), "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+                writer.writeheader()
+                writer.writerows(rows)
+
+def generate_instance(order_count: int, seed: int = 42) -> Instance:
+    """
+    Build an instance with order_count orders. Destinations, plants and
+    stockyards grow with the order count (3 to 200, 1 to 6 and 6 to 54).
+    """
+    rng = random.Random(seed * 1_000_003 + order_count)
+    instance = Instance(seed=seed)
+
+    plant_count = min(len(PLANTS), max(1, order_count // 5000 + 1))
+    destination_count = min(200, 3 + order_count // 250)
+    junction_count = max(2, destination_count // 8)
+    yards_per_plant_commodity = min(3, max(2, order_count // (1000 * plant_count)))
+
+    positions: Dict[str, Tuple[float, float]] = {}
+    plants = PLANTS[:plant_count]
+    junctions = [f"Junction {k}" for k in range(junction_count)]
+    destinations = [f"City {k}" for k in range(destination_count)]
+    for station in plants + junctions + destinations:
+        positions[station] = (rng.uniform(0, 1800), rng.uniform(0, 1800))
+
+    def km(a: str, b: str) -> float:
+        return math.dist(positions[a], positions[b]) * 1.15 + 10
+
+    # Routes: plant -> nearest junction to the destination -> destination
+    for plant in plants:
+        for destination in destinations:
+            by_detour = sorted(junctions, key=lambda j: km(plant, j) + km(j, destination))
+            via, alternate = by_detour[0], by_detour[1]
+            distance = km(plant, via) + km(via, destination)
+            instance.routes.append({
+                "origin": plant,
+                "destination": destination,
+                "distance_km": round(distance),
+                "transit_time_days": max(1, round(distance / 400)),
+                "preferred_route": f"{plant}-{via}-{destination}",
+                "alternate_route": f"{plant}-{alternate}-{destination}",
+                "track_capacity_wagons_per_day": rng.choice([40, 60, 80, 120, 150]),
+                "route_constraints": rng.choice(["", "", "Ghat section", "Single line"]),
+                "expected_delays_days": rng.choice([0, 0, 1, 2]),
+                "railway_zone": rng.choice(ZONES),
+            })
+
+    demand = {commodity: 0.0 for commodity in COMMODITIES}
+    for k in range(order_count):
+        commodity = rng.choice(COMMODITIES)
+        quantity = rng.randint(100, 3000)
+        demand[commodity] += quantity
+        dispatch = START_DATE + timedelta(days=rng.randrange(30))
+        instance.orders.append({
+            "order_id": f"ORD{k:06d}",
+            "customer_name": f"Cust {rng.randrange(max(1, order_count // 5))}",
+            "commodity": commodity,
+            "order_quantity_tonnes": quantity,
+            "destination": rng.choice(destinations),
+            "priority": rng.choice(PRIORITIES),
+            "order_status": "Pending",
+            "preferred_dispatch_date": dispatch.isoformat(),
+            "latest_delivery_date": (dispatch + timedelta(days=rng.randrange(5, 35))).isoformat(),
+        })
+
+    for commodity in COMMODITIES:
+        stock = round(demand[commodity] * 1.2)
+        instance.inventory.append({
+            "product": commodity,
+            "inventory_tonnes": stock,
+            "production_schedule_date": START_DATE.isoformat(),
+            "available_for_dispatch": stock,
+            "reorder_level_tonnes": 500,
+            "allocated_for_orders": 0,
+        })
+        yards = [(plant, n) for plant in plants for n in range(yards_per_plant_commodity)]
+        for plant, n in yards:
+            instance.stockyards.append({
+                "stockyard_id": f"SY-{plant[:3].upper()}-{commodity[:2].upper()}-{n:02d}",
+                "material": commodity,
+                "capacity": round(stock / len(yards), 1),
+                "cost": round(rng.uniform(5, 25), 2),
+                "station": plant,
+            })
+
+    return instance
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Seed the database from the CSV files in the statics folder.
+
+Independent tables (cost parameters, routes, inventory, rakes) are loaded
+concurrently over separate pooled connections; orders are loaded after the
+rakes they reference. Unchanged files are skipped and changed files are
+upserted on their natural keys, so the seeder is safe to re-run.
+
+Usage:
+    python backend_testing_files/seed_db.py [--statics DIR] [--workers N] [--tables a,b] [--force]
+"""
+
+import sys
+import os
+import argparse
+
+# Make the 'app' package importable when run from anywhere
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.core.migrations import check_schema_version
+from app.services.seed_service import SEED_TABLES, SEED_MAX_WORKERS, STATIC_PATH, seed_tables
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the SAIL DSS database from CSV files")
+    parser.add_argument("--statics", default=STATIC_PATH, help="Folder containing the CSV files")
+    parser.add_argument("--workers", type=int, default=SEED_MAX_WORKERS, help="Tables loaded concurrently")
+    parser.add_argument("--tables", help="Comma-separated subset of tables to seed")
+    parser.add_argument("--force", action="store_true", help="Re-seed files even if unchanged")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    specs = SEED_TABLES
+    if args.tables:
+        requested = [name.strip() for name in args.tables.split(",") if name.strip()]
+        unknown = set(requested) - {spec.name for spec in SEED_TABLES}
+        if unknown:
+            print(f"❌ Unknown tables: {', '.join(sorted(unknown))}")
+            return False
+        specs = [spec for spec in SEED_TABLES if spec.name in requested]
+
+    print("=" * 60)
+    print("SAIL DSS Database Seeding")
+    print("=" * 60)
+    print(f"Statics folder: {args.statics}")
+    print(f"Tables: {', '.join(spec.name for spec in specs)}")
+
+    # One pooled connection per worker
+    engine = create_engine(
+        settings.SQLALCHEMY_DATABASE_URI,
+        pool_size=max(1, args.workers),
+        max_overflow=0
+    )
+
+    try:
+        check_schema_version()
+
+        def on_done(name, stats):
+            if stats["status"] == "skipped":
+                print(f"  ↷ {name}: unchanged since last seed, skipped")
+            else:
+                print(f"  ✓ {name}: {stats['rows']} rows in {stats['seconds']:.2f}s ({stats['rows_per_second'] or 0:,.0f} rows/s)")
+
+        results = seed_tables(
+            engine,
+            specs=specs,
+            static_path=args.statics,
+            force=args.force,
+            max_workers=args.workers,
+            on_start=lambda name: print(f"🌱 Seeding {name}..."),
+            on_done=on_done
+        )
+
+        total_rows = sum(stats["rows"] for stats in results.values())
+        print("\n" + "=" * 60)
+        print(f"✅ Seeding complete: {total_rows} rows written across {len(results)} tables")
+        print("=" * 60)
+        return True
+
+    except Exception as e:
+        print(f"❌ Seeding failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        engine.dispose()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
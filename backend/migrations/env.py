@@ -0,0 +1,69 @@
+import sys
+import os
+from logging.config import fileConfig
+
+# Make the 'app' package importable when alembic runs from anywhere
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401 - registers all tables on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    # Keep the application's loggers when migrations run at startup
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+def get_url() -> str:
+    """
+    Database URL: an explicit sqlalchemy.url (e.g. set by tests or scripts)
+    wins over the application settings
+    """
+    return config.get_main_option("sqlalchemy.url") or settings.SQLALCHEMY_DATABASE_URI
+
+def run_migrations_offline():
+    """
+    Emit the migration SQL without connecting (alembic upgrade --sql)
+    """
+    url = get_url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite")
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """
+    Apply migrations over a single short-lived connection
+    """
+    connectable = config.attributes.get("connection")
+    if connectable is None:
+        connectable = create_engine(get_url(), poolclass=NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite can't ALTER most constraints in place; batch mode recreates the table
+            render_as_batch=connection.dialect.name == "sqlite"
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
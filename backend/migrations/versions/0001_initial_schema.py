@@ -0,0 +1,153 @@
+"""initial schema
+
+Tables as originally created by init_db()/create_all. Databases that were
+built that way should be stamped at this revision (alembic stamp 0001)
+before upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('cost_parameters',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('commodity', sa.String(), nullable=False),
+    sa.Column('priority', sa.String(), nullable=False),
+    sa.Column('cost_per_tonne_km', sa.Float(), nullable=False),
+    sa.Column('loading_cost_per_wagon', sa.Float(), nullable=False),
+    sa.Column('unloading_cost_per_wagon', sa.Float(), nullable=False),
+    sa.Column('penalty_per_day_delay', sa.Float(), nullable=False),
+    sa.Column('priority_multiplier', sa.Float(), nullable=False),
+    sa.Column('fuel_surcharge_per_wagon', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('inventory_items',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('plant_location', sa.String(), nullable=False),
+    sa.Column('product_name', sa.String(), nullable=False),
+    sa.Column('material_grade', sa.String(), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.Column('unit', sa.String(), nullable=True),
+    sa.Column('storage_location', sa.String(), nullable=False),
+    sa.Column('production_schedule_date', sa.String(), nullable=True),
+    sa.Column('next_production_date', sa.DateTime(), nullable=True),
+    sa.Column('production_rate', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_inventory_items_id', 'inventory_items', ['id'], unique=False)
+
+    op.create_table('optimization_results',
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('rake_id', sa.String(), nullable=True),
+    sa.Column('plan', sa.JSON(), nullable=True),
+    sa.Column('total_cost', sa.Float(), nullable=True),
+    sa.Column('iteration', sa.Integer(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('num_orders', sa.Integer(), nullable=True),
+    sa.Column('num_stockyards', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('error_message', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_optimization_results_task_id', 'optimization_results', ['task_id'], unique=False)
+
+    op.create_table('rakes',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('rake_number', sa.String(length=50), nullable=False),
+    sa.Column('origin_plant', sa.String(length=100), nullable=False),
+    sa.Column('destination', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('capacity_tons', sa.Float(), nullable=False),
+    sa.Column('total_wagons', sa.Integer(), nullable=False),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('current_location', sa.String(length=100), nullable=True),
+    sa.Column('departure_date', sa.String(), nullable=True),
+    sa.Column('expected_arrival_date', sa.String(), nullable=True),
+    sa.Column('last_maintenance_date', sa.String(), nullable=True),
+    sa.Column('transit_progress', sa.Float(), nullable=True),
+    sa.Column('departure_time', sa.DateTime(), nullable=True),
+    sa.Column('eta', sa.DateTime(), nullable=True),
+    sa.Column('arrival_time', sa.DateTime(), nullable=True),
+    sa.Column('freight_type', sa.String(length=100), nullable=True),
+    sa.Column('weight', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('rake_number')
+    )
+    op.create_index('ix_rakes_id', 'rakes', ['id'], unique=False)
+
+    op.create_table('route_transport_info',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('origin', sa.String(), nullable=False),
+    sa.Column('destination', sa.String(), nullable=False),
+    sa.Column('distance_km', sa.Float(), nullable=False),
+    sa.Column('transit_time_days', sa.Integer(), nullable=False),
+    sa.Column('preferred_route', sa.String(), nullable=False),
+    sa.Column('alternate_route', sa.String(), nullable=True),
+    sa.Column('track_capacity_wagons_per_day', sa.Integer(), nullable=False),
+    sa.Column('route_constraints', sa.String(), nullable=True),
+    sa.Column('expected_delays_days', sa.Integer(), nullable=True),
+    sa.Column('railway_zone', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('stockyards',
+    sa.Column('stockyard_id', sa.String(), nullable=False),
+    sa.Column('material', sa.String(), nullable=True),
+    sa.Column('capacity', sa.Float(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('stockyard_id')
+    )
+    op.create_index('ix_stockyards_stockyard_id', 'stockyards', ['stockyard_id'], unique=False)
+
+    op.create_table('orders',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('customer_name', sa.String(length=100), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=True),
+    sa.Column('material', sa.String(length=100), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.Column('unit', sa.String(length=20), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('origin_plant', sa.String(length=100), nullable=False),
+    sa.Column('destination', sa.String(length=100), nullable=False),
+    sa.Column('rate_per_ton', sa.Float(), nullable=True),
+    sa.Column('preferred_dispatch_date', sa.String(), nullable=True),
+    sa.Column('latest_delivery_date', sa.String(), nullable=True),
+    sa.Column('rake_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['rake_id'], ['rakes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_orders_id', 'orders', ['id'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_orders_id', table_name='orders')
+    op.drop_table('orders')
+    op.drop_index('ix_stockyards_stockyard_id', table_name='stockyards')
+    op.drop_table('stockyards')
+    op.drop_table('route_transport_info')
+    op.drop_index('ix_rakes_id', table_name='rakes')
+    op.drop_table('rakes')
+    op.drop_index('ix_optimization_results_task_id', table_name='optimization_results')
+    op.drop_table('optimization_results')
+    op.drop_index('ix_inventory_items_id', table_name='inventory_items')
+    op.drop_table('inventory_items')
+    op.drop_table('cost_parameters')
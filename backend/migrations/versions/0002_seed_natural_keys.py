@@ -0,0 +1,126 @@
+"""seed natural keys
+
+Order numbers, the unique natural-key indexes used by the seeder's upserts
+and the seed manifest table. The seeder used to create the indexes and the
+manifest on demand, so each step is skipped if it already exists, and the
+redundant index it created on rakes.rake_number is dropped.
+
+Databases seeded before this revision may hold duplicate rows (the old
+seeders inserted every CSV row on each run). Existing orders get the order
+number the seeder derives for CSVs without an order ID; orders are never
+deleted, so repeats of a derived number get a -2, -3, ... suffix (the
+seeder re-keys them to their CSV order IDs on the next seed). In the other
+tables, before each unique index is created, rows repeating a natural key
+are deleted, keeping the oldest (lowest id). The downgrade does not restore them.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import hashlib
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+NATURAL_KEYS = {
+    'orders': ['order_number'],
+    'inventory_items': ['plant_location', 'storage_location', 'product_name', 'material_grade'],
+    'cost_parameters': ['commodity', 'priority'],
+    'route_transport_info': ['origin', 'destination'],
+}
+
+BATCH_SIZE = 500
+
+orders = sa.table(
+    'orders',
+    sa.column('id', sa.Integer()),
+    sa.column('order_number', sa.String()),
+    sa.column('customer_name', sa.String()),
+    sa.column('material', sa.String()),
+    sa.column('destination', sa.String()),
+    sa.column('preferred_dispatch_date', sa.String()),
+)
+
+def _has_index(inspector, table, name):
+    return any(ix['name'] == name for ix in inspector.get_indexes(table))
+
+def _derived_order_number(row):
+    """Same identity as seed_service._derived_order_numbers"""
+    parts = [row.customer_name, row.material, row.destination, row.preferred_dispatch_date]
+    key = '|'.join('' if part is None else str(part).strip() for part in parts)
+    return 'ORD-' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def _backfill_order_numbers(bind):
+    """Give orders without an order number the seeder's derived one, suffixed if already taken"""
+    taken = set(bind.execute(
+        sa.select(orders.c.order_number).where(orders.c.order_number.like('ORD-%'))
+    ).scalars())
+    query = sa.select(orders).where(orders.c.order_number.is_(None)).order_by(orders.c.id).limit(BATCH_SIZE)
+    last = None
+    while True:
+        page = query if last is None else query.where(orders.c.id > last)
+        rows = bind.execute(page).all()
+        if not rows:
+            return
+        numbers = []
+        for row in rows:
+            base = number = _derived_order_number(row)
+            repeat = 1
+            while number in taken:
+                repeat += 1
+                number = f'{base}-{repeat}'
+            taken.add(number)
+            numbers.append({'row_id': row.id, 'number': number})
+        bind.execute(
+            orders.update().where(orders.c.id == sa.bindparam('row_id')).values(order_number=sa.bindparam('number')),
+            numbers
+        )
+        last = rows[-1].id
+
+def _delete_duplicates(table, columns):
+    """Delete rows repeating a (non-NULL) natural key, keeping the lowest id"""
+    target = sa.table(table, sa.column('id', sa.Integer()), *(sa.column(col) for col in columns))
+    keyed = sa.and_(*(target.c[col].is_not(None) for col in columns))
+    keep = sa.select(sa.func.min(target.c.id)).where(keyed).group_by(*(target.c[col] for col in columns))
+    op.execute(target.delete().where(keyed, target.c.id.not_in(keep)))
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if 'order_number' not in {col['name'] for col in inspector.get_columns('orders')}:
+        op.add_column('orders', sa.Column('order_number', sa.String(length=50), nullable=True))
+    _backfill_order_numbers(op.get_bind())
+
+    for table, columns in NATURAL_KEYS.items():
+        name = f'uq_{table}_natural_key'
+        if not _has_index(inspector, table, name):
+            if table != 'orders':
+                _delete_duplicates(table, columns)
+            op.create_index(name, table, columns, unique=True)
+
+    # Redundant with the UNIQUE constraint on rakes.rake_number
+    if _has_index(inspector, 'rakes', 'uq_rakes_natural_key'):
+        op.drop_index('uq_rakes_natural_key', table_name='rakes')
+
+    if not inspector.has_table('seed_manifest'):
+        op.create_table('seed_manifest',
+        sa.Column('file_name', sa.String(), nullable=False),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('seeded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('file_name')
+        )
+
+def downgrade():
+    op.drop_table('seed_manifest')
+    for table in reversed(list(NATURAL_KEYS)):
+        op.drop_index(f'uq_{table}_natural_key', table_name=table)
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('order_number')
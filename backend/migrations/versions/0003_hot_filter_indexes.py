@@ -0,0 +1,45 @@
+"""hot filter indexes
+
+Secondary indexes for the columns the API filters on:
+- orders (status, priority): status filters and status + priority filters
+- orders (priority): priority-only filters
+- orders (rake_id): order lookups for a rake (simulation, rake deletes)
+- rakes (status) and stockyards (material)
+
+Lookups on cost_parameters (commodity, priority) and route_transport_info
+(origin, destination) are already served by the unique natural-key
+indexes from 0002. On PostgreSQL the indexes are built CONCURRENTLY so
+the tables stay writable while they build.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_orders_status_priority', 'orders', ['status', 'priority']),
+    ('ix_orders_priority', 'orders', ['priority']),
+    ('ix_orders_rake_id', 'orders', ['rake_id']),
+    ('ix_rakes_status', 'rakes', ['status']),
+    ('ix_stockyards_material', 'stockyards', ['material']),
+]
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
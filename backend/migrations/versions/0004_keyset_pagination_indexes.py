@@ -0,0 +1,36 @@
+"""keyset pagination indexes
+
+Composite (created_at, id) indexes matching the sort key of the order and
+rake list endpoints, so each cursor page is a range scan from the previous
+page's last row instead of an OFFSET scan. Stockyard lists page on the
+primary key and need no extra index. Built CONCURRENTLY on PostgreSQL.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_orders_created_at_id', 'orders', ['created_at', 'id']),
+    ('ix_rakes_created_at_id', 'rakes', ['created_at', 'id']),
+]
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
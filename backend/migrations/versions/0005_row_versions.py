@@ -0,0 +1,33 @@
+"""row versions
+
+Adds a version counter to rakes and orders for optimistic concurrency
+control. Writers update with WHERE version = :expected and bump it, so a
+concurrent change is detected instead of silently overwritten. Existing
+rows start at 1. On PostgreSQL 11+ adding a NOT NULL column with a
+constant default does not rewrite the table.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+TABLES = ['rakes', 'orders']
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,36 @@
+"""optimization request hash
+
+Adds the request fingerprint to optimization_results so an identical
+optimization request can reuse the stored plan instead of re-solving.
+The index on (request_hash, timestamp) serves the "latest plan for this
+fingerprint" lookup; on PostgreSQL it is built CONCURRENTLY.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('optimization_results', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('request_hash', sa.String(length=64), nullable=True))
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_optimization_results_request_hash', 'optimization_results', ['request_hash', 'timestamp'],
+                        unique=False, postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_optimization_results_request_hash', table_name='optimization_results', postgresql_concurrently=True)
+
+    with op.batch_alter_table('optimization_results', schema=None) as batch_op:
+        batch_op.drop_column('request_hash')
@@ -0,0 +1,133 @@
+"""optimization allocations
+
+Moves plan allocations out of the optimization_results.plan JSON into the
+optimization_allocations table, so the history can be listed from summary
+columns without reading every plan blob, and old plans can be compacted to
+their summary row. Adds the mode, num_allocations and compacted_at summary
+columns and an index on (timestamp, task_id) for the newest-first history.
+
+Existing plans are moved in batches: their allocations are inserted and
+the plan JSON keeps only the solver extras. The downgrade puts them back.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+results = sa.table(
+    'optimization_results',
+    sa.column('task_id', sa.String()),
+    sa.column('plan', sa.JSON()),
+    sa.column('mode', sa.String()),
+    sa.column('num_allocations', sa.Integer()),
+)
+
+allocations = sa.table(
+    'optimization_allocations',
+    sa.column('id', sa.Integer()),
+    sa.column('task_id', sa.String()),
+    sa.column('order_id', sa.String()),
+    sa.column('from_stockyard', sa.String()),
+    sa.column('origin_station', sa.String()),
+    sa.column('destination', sa.String()),
+    sa.column('quantity', sa.Float()),
+)
+
+def _batches(bind, query):
+    """Rows of a task_id-ordered query, BATCH_SIZE at a time"""
+    last = None
+    while True:
+        page = query if last is None else query.where(results.c.task_id > last)
+        rows = bind.execute(page.order_by(results.c.task_id).limit(BATCH_SIZE)).all()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1].task_id
+
+def upgrade():
+    op.create_table('optimization_allocations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('order_id', sa.String(), nullable=False),
+    sa.Column('from_stockyard', sa.String(), nullable=False),
+    sa.Column('origin_station', sa.String(), nullable=True),
+    sa.Column('destination', sa.String(), nullable=True),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['optimization_results.task_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_optimization_allocations_task_id', 'optimization_allocations', ['task_id'], unique=False)
+
+    with op.batch_alter_table('optimization_results', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('num_allocations', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('mode', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('compacted_at', sa.DateTime(timezone=True), nullable=True))
+
+    bind = op.get_bind()
+    for rows in _batches(bind, sa.select(results.c.task_id, results.c.plan)):
+        for row in rows:
+            plan = dict(row.plan or {})
+            moved = plan.pop('optimized_plan', None) or []
+            if moved:
+                bind.execute(allocations.insert(), [
+                    {
+                        'task_id': row.task_id,
+                        'order_id': str(allocation['order_id']),
+                        'from_stockyard': str(allocation['from']),
+                        'origin_station': allocation.get('origin_station'),
+                        'destination': allocation.get('destination'),
+                        'quantity': allocation['quantity'],
+                    }
+                    for allocation in moved
+                ])
+            bind.execute(
+                results.update().where(results.c.task_id == row.task_id)
+                .values(plan=plan, mode=plan.get('mode', 'cost'), num_allocations=len(moved))
+            )
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_optimization_results_timestamp', 'optimization_results', ['timestamp', 'task_id'],
+                        unique=False, postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_optimization_results_timestamp', table_name='optimization_results', postgresql_concurrently=True)
+
+    bind = op.get_bind()
+    for rows in _batches(bind, sa.select(results.c.task_id, results.c.plan)):
+        for row in rows:
+            moved = bind.execute(
+                sa.select(allocations).where(allocations.c.task_id == row.task_id).order_by(allocations.c.id)
+            ).all()
+            plan = dict(row.plan or {})
+            plan['optimized_plan'] = [
+                {
+                    'order_id': allocation.order_id,
+                    'from': allocation.from_stockyard,
+                    'origin_station': allocation.origin_station,
+                    'destination': allocation.destination,
+                    'quantity': allocation.quantity,
+                }
+                for allocation in moved
+            ]
+            bind.execute(results.update().where(results.c.task_id == row.task_id).values(plan=plan))
+
+    with op.batch_alter_table('optimization_results', schema=None) as batch_op:
+        batch_op.drop_column('compacted_at')
+        batch_op.drop_column('mode')
+        batch_op.drop_column('num_allocations')
+
+    op.drop_index('ix_optimization_allocations_task_id', table_name='optimization_allocations')
+    op.drop_table('optimization_allocations')
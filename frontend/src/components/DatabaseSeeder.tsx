@@ -1,6 +1,7 @@
-import { useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { Button } from '@/components/ui/button';
 import { Card } from '@/components/ui/card';
+import { Progress } from '@/components/ui/progress';
 import api from '@/lib/api';
 import { Database, Loader2, CheckCircle, AlertCircle } from 'lucide-react';
 
@@ -10,28 +11,80 @@ interface SeedResult {
   data?: any;
 }
 
+interface SeedTableProgress {
+  status: string;
+  rows_total: number | null;
+  rows_loaded: number;
+}
+
+interface SeedJob {
+  job_id: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  tables: Record<string, SeedTableProgress>;
+  error: string | null;
+}
+
+// How often a running seeding job is polled
+const SEED_POLL_MS = 1000;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
 export default function DatabaseSeeder() {
   const [loading, setLoading] = useState(false);
   const [result, setResult] = useState<SeedResult | null>(null);
   const [stats, setStats] = useState<any>(null);
+  const [job, setJob] = useState<SeedJob | null>(null);
+  const mounted = useRef(true);
+
+  useEffect(() => {
+    mounted.current = true;
+    return () => {
+      mounted.current = false;
+    };
+  }, []);
 
   const handleSeedDatabase = async () => {
     setLoading(true);
     setResult(null);
+    setJob(null);
 
     try {
-      const response = await api.database.seedDatabase();
-      setResult({ success: true, message: 'Database seeded successfully!', data: response.data });
+      // Seeding runs as a background job: poll it until it finishes
+      let current: SeedJob = (await api.database.seedDatabase()).data;
+      setJob(current);
+      while (current.status === 'queued' || current.status === 'running') {
+        await sleep(SEED_POLL_MS);
+        if (!mounted.current) return;
+        current = (await api.database.getSeedStatus(current.job_id)).data;
+        setJob(current);
+      }
+
+      if (current.status === 'completed') {
+        const tables = Object.values(current.tables);
+        const skipped = tables.filter((table) => table.status === 'skipped').length;
+        setResult({
+          success: true,
+          message: `Database seeded successfully! ${tables.length - skipped} tables loaded, ${skipped} unchanged`,
+          data: current
+        });
+      } else {
+        setResult({ success: false, message: `Database seeding failed: ${current.error || 'unknown error'}`, data: current });
+      }
     } catch (error: any) {
+      if (!mounted.current) return;
       setResult({
         success: false,
         message: error.message || 'Failed to seed database'
       });
     } finally {
-      setLoading(false);
+      if (mounted.current) setLoading(false);
     }
   };
 
+  const seedTables = job ? Object.entries(job.tables) : [];
+  const rowsTotal = seedTables.reduce((sum, [, table]) => sum + (table.rows_total ?? 0), 0);
+  const rowsLoaded = seedTables.reduce((sum, [, table]) => sum + table.rows_loaded, 0);
+
   const handleGetStats = async () => {
     setLoading(true);
 
@@ -89,6 +142,24 @@ export default function DatabaseSeeder() {
           </Button>
         </div>
 
+        {job && (job.status === 'queued' || job.status === 'running') && (
+          <div className="bg-white dark:bg-gray-900 rounded-md p-3 border space-y-2">
+            <div className="flex justify-between text-sm font-medium text-blue-900 dark:text-blue-100">
+              <span>{job.status === 'queued' ? 'Seeding queued...' : 'Seeding database...'}</span>
+              <span>{rowsLoaded} / {rowsTotal || '?'} rows</span>
+            </div>
+            <Progress value={rowsTotal ? (rowsLoaded / rowsTotal) * 100 : 0} />
+            <div className="grid grid-cols-2 gap-2 text-sm">
+              {seedTables.map(([name, table]) => (
+                <div key={name}>
+                  <span className="font-medium">{name}:</span> {table.status}
+                  {table.rows_total !== null ? ` (${table.rows_loaded}/${table.rows_total})` : ''}
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
+
         {result && (
           <div className={`p-3 rounded-md flex items-center gap-2 ${
             result.success
@@ -215,6 +215,10 @@ class ApiClient {
       });
     },
 
+    getSeedStatus: async (jobId: string): Promise<ApiResponse<any>> => {
+      return this.request<any>(`/database/seed/${jobId}`);
+    },
+
     getStats: async (): Promise<ApiResponse<any>> => {
       return this.request<any>('/database/stats');
     },